@@ -0,0 +1,38 @@
+import random
+
+from app.allocation.records import Assignment
+
+
+def allocate(free_releases, candidates, policy, rng=None):
+    """
+        Распределяет свободные места между кандидатами по выбранной политике.
+
+        Чистая функция над снимками: не обращается ни к базе данных, ни к боту,
+        поэтому тестируется и замеряется отдельно от сервиса распределения.
+
+        Параметры:
+            free_releases: список FreeRelease в порядке выдачи (обычно по времени освобождения)
+            candidates: список Candidate - ожидающие запросы на дату
+            policy: политика выбора получателей (см. app.allocation.policies)
+            rng: источник случайности (random.Random); по умолчанию модуль random
+
+        Возвращает:
+            list: список Assignment - i-е место достается i-му выбранному кандидату
+
+        Особенности:
+            - Выдается min(len(free_releases), len(candidates)) мест за один вызов
+            - Один пользователь получает не больше одного места, даже если у него несколько запросов
+        """
+    if not free_releases or not candidates:
+        return []
+
+    rng = rng or random
+    unique_candidates = {}
+    for candidate in candidates:
+        unique_candidates.setdefault(candidate.user_id, candidate)
+
+    selected = policy.select(list(unique_candidates.values()), len(free_releases), rng)
+    return [
+        Assignment(release.release_id, release.spot_id, candidate.request_id, candidate.user_id)
+        for release, candidate in zip(free_releases, selected)
+    ]
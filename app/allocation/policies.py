@@ -0,0 +1,77 @@
+import heapq
+from datetime import date
+from enum import Enum
+
+
+class AllocationPolicyName(Enum):
+    LOWEST_RATING = "lowest_rating"
+    WEIGHTED_LOTTERY = "weighted_lottery"
+    ROUND_ROBIN = "round_robin"
+
+
+class LowestRatingFirstPolicy:
+    """
+    Места получают кандидаты с наименьшим рейтингом.
+
+    Уровни рейтинга проходятся от низшего к высшему, внутри уровня порядок случайный
+    (прежнее поведение распределения).
+    """
+    name = AllocationPolicyName.LOWEST_RATING
+    # Нужна ли кандидатам last_assigned_date: без нее get_candidates не читает историю назначений
+    needs_last_assigned_date = False
+
+    def select(self, candidates, count, rng):
+        return heapq.nsmallest(count, candidates, key=lambda candidate: (candidate.rating, rng.random()))
+
+
+class WeightedLotteryPolicy:
+    """
+    Взвешенная лотерея: шанс получить место тем выше, чем ниже рейтинг относительно минимального.
+
+    Вес кандидата 1 / (1 + rating - min_rating). Выборка без возвращения по ключу
+    random() ** (1 / weight) (Efraimidis-Spirakis) за один проход по кандидатам.
+    """
+    name = AllocationPolicyName.WEIGHTED_LOTTERY
+    needs_last_assigned_date = False
+
+    def select(self, candidates, count, rng):
+        if not candidates:
+            return []
+        min_rating = min(candidate.rating for candidate in candidates)
+
+        def lottery_key(candidate):
+            return rng.random() ** (1 + candidate.rating - min_rating)
+
+        return heapq.nlargest(count, candidates, key=lottery_key)
+
+
+class RoundRobinPolicy:
+    """
+    Очередь по давности: первыми места получают те, кто дольше всех не получал место.
+
+    Никогда не получавшие место идут первыми; при равной дате - меньший рейтинг, затем случайно.
+    """
+    name = AllocationPolicyName.ROUND_ROBIN
+    needs_last_assigned_date = True
+
+    def select(self, candidates, count, rng):
+        def round_robin_key(candidate):
+            return candidate.last_assigned_date or date.min, candidate.rating, rng.random()
+
+        return heapq.nsmallest(count, candidates, key=round_robin_key)
+
+
+POLICIES = {
+    AllocationPolicyName.LOWEST_RATING: LowestRatingFirstPolicy,
+    AllocationPolicyName.WEIGHTED_LOTTERY: WeightedLotteryPolicy,
+    AllocationPolicyName.ROUND_ROBIN: RoundRobinPolicy,
+}
+
+
+def get_policy(name):
+    """Возвращает политику распределения по имени (AllocationPolicyName или его строковое значение)"""
+    try:
+        return POLICIES[AllocationPolicyName(name)]()
+    except ValueError:
+        raise ValueError("Неизвестная политика распределения: {}. Доступны: {}".format(
+            name, ", ".join(policy.value for policy in AllocationPolicyName)))
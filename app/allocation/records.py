@@ -0,0 +1,45 @@
+from datetime import date
+from typing import Optional
+
+
+class FreeRelease:
+    """Снимок свободного места на дату распределения"""
+    __slots__ = ("release_id", "spot_id")
+
+    def __init__(self, release_id, spot_id: int):
+        self.release_id = release_id
+        self.spot_id = spot_id
+
+    def __repr__(self):
+        return f"FreeRelease(release_id={self.release_id!r}, spot_id={self.spot_id!r})"
+
+
+class Candidate:
+    """Снимок ожидающего запроса на место"""
+    __slots__ = ("request_id", "user_id", "rating", "tg_id", "last_assigned_date")
+
+    def __init__(self, request_id, user_id, rating: int, tg_id: int, last_assigned_date: Optional[date] = None):
+        self.request_id = request_id
+        self.user_id = user_id
+        self.rating = rating
+        self.tg_id = tg_id
+        self.last_assigned_date = last_assigned_date
+
+    def __repr__(self):
+        return (f"Candidate(request_id={self.request_id!r}, user_id={self.user_id!r}, rating={self.rating!r}, "
+                f"last_assigned_date={self.last_assigned_date!r})")
+
+
+class Assignment:
+    """Результат распределения: какое место достается какому запросу"""
+    __slots__ = ("release_id", "spot_id", "request_id", "user_id")
+
+    def __init__(self, release_id, spot_id: int, request_id, user_id):
+        self.release_id = release_id
+        self.spot_id = spot_id
+        self.request_id = request_id
+        self.user_id = user_id
+
+    def __repr__(self):
+        return (f"Assignment(release_id={self.release_id!r}, spot_id={self.spot_id!r}, "
+                f"request_id={self.request_id!r}, user_id={self.user_id!r})")
@@ -0,0 +1,21 @@
+from aiogram.types import ChatMemberUpdated
+
+from app.bot.config import GROUP_ID
+from app.bot.service.chat_access_required_service import invalidate_chat_access
+from app.bot.users.is_user_in_chat import remember_membership
+
+
+async def handle_chat_member(event: ChatMemberUpdated):
+    """
+    Обновляет кэш членства, когда пользователь вступает в группу парковки или покидает ее.
+
+    Telegram присылает chat_member только если бот - администратор группы.
+    """
+    if event.chat.id != GROUP_ID:
+        return
+    await remember_membership(event.new_chat_member.user.id, event.chat.id, event.new_chat_member.status)
+
+
+async def handle_my_chat_member(event: ChatMemberUpdated):
+    """Сбрасывает кэш доступа к чату, когда меняются права самого бота в нем"""
+    await invalidate_chat_access(event.chat.id)
@@ -1,6 +1,6 @@
 import logging
 
-from app.data.init_db import get_db_connection
+from app.bot.service.user_service import register_db_user
 from app.log_text import USER_REGISTRATION_ERROR
 
 
@@ -8,7 +8,8 @@ async def register_user(user):
     """
         Регистрирует нового пользователя в системе.
 
-        Проверяет существование пользователя в базе данных и при отсутствии создает новую запись.
+        Проверяет существование пользователя в кэше идентификаторов и при отсутствии создает
+        запись одним upsert, без отдельного SELECT.
 
         Параметры:
             user: объект пользователя Telegram с идентификатором
@@ -16,34 +17,15 @@ async def register_user(user):
         Возвращает:
             bool: True если пользователь зарегистрирован, False если уже существует или ошибка
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute(
-                'SELECT user_id FROM dont_touch.users WHERE tg_id = %s',
-                (user.id,)
-            )
-            existing_user = cur.fetchone()
-
-            if not existing_user:
-                cur.execute(
-                    'INSERT INTO dont_touch.users (user_id, tg_id) VALUES (gen_random_uuid(), %s)',
-                    (user.id,)
-                )
-                conn.commit()
-                logging.debug(f"New user registered: {user.id}")
-                return True
-            else:
-                logging.debug(f"User already exists: {user.id}")
-                return False
+        _, inserted = await register_db_user(user.id)
+
+        if inserted:
+            logging.debug(f"New user registered: {user.id}")
+        else:
+            logging.debug(f"User already exists: {user.id}")
+        return inserted
 
     except Exception as e:
         logging.error(USER_REGISTRATION_ERROR.format(user.id, e))
-        if conn:
-            conn.rollback()
         return False
-
-    finally:
-        if conn:
-            conn.close()
@@ -8,13 +8,13 @@ from aiogram.types import CallbackQuery
 
 from app.bot.constants.log_types import LogNotification
 from app.bot.notification.log_notification import send_log_notification
-from app.bot.service.distribution_service import distribute_parking_spots
+from app.bot.service.distribution_worker import request_distribution
 from app.bot.keyboard_markup import return_markup, back_markup, date_list_markup
+from app.bot.service.spots.spot_catalog import get_spot_catalog
 from app.bot.service.user_service import get_db_user_id
 from app.data.init_db import get_db_connection
 from app.bot.parking_states import ParkingStates
 from app.data.repository.parking_releases_repository import insert_spot_on_date, get_user_id_took_by_date_and_spot
-from app.data.repository.parking_spots_repository import get_spot_by_id
 from app.log_text import SPOT_CHECK_ERROR, SPOT_RELEASE_SAVE_ERROR, DB_USER_ID_GET_ERROR, DATABASE_ERROR
 
 
@@ -62,7 +62,7 @@ async def is_valid_spot_number(spot_number: str) -> bool:
     """
         Проверяет валидность номера парковочного места.
 
-        Выполняет проверку существования места в базе данных и корректности формата номера.
+        Проверяет корректность формата номера и наличие активного места в справочнике мест в памяти.
 
         Параметры:
             spot_number: строка с номером места для проверки
@@ -76,14 +76,7 @@ async def is_valid_spot_number(spot_number: str) -> bool:
         return False
 
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                spot = await get_spot_by_id(cur, spot_num)
-                return spot is not None
-
-    except psycopg2.Error as e:
-        logging.error(DATABASE_ERROR.format(e))
-        await send_log_notification(LogNotification.ERROR, DATABASE_ERROR.format(e))
+        return get_spot_catalog().is_active(spot_num)
     except Exception as e:
         logging.error(SPOT_CHECK_ERROR.format(spot_number, e))
         return False
@@ -127,7 +120,7 @@ async def process_spot_release(query: CallbackQuery, date_str: str, state: FSMCo
         return
 
     try:
-        with get_db_connection() as conn:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
                 spot_num = int(spot_number)
 
@@ -140,14 +133,14 @@ async def process_spot_release(query: CallbackQuery, date_str: str, state: FSMCo
 
                 result = await insert_spot_on_date(cur, db_user_id, spot_num, release_date)
 
-                conn.commit()
+                await conn.commit()
 
                 if result:
                     await query.message.edit_text(
                         f"✅ Отлично! Вы освободили место №{spot_num} на {release_date.strftime('%d.%m.%Y')}",
                         reply_markup=return_markup
                     )
-                    await distribute_parking_spots()
+                    request_distribution({release_date})
                 else:
                     await query.message.edit_text(
                         f"⚠️ Место №{spot_num} уже освобождено на {release_date.strftime('%d.%m.%Y')}",
@@ -7,7 +7,7 @@ from aiogram.types import CallbackQuery
 
 from app.bot.constants.log_types import LogNotification
 from app.bot.notification.log_notification import send_log_notification
-from app.bot.service.distribution_service import distribute_parking_spots
+from app.bot.service.distribution_worker import request_distribution
 from app.bot.keyboard_markup import return_markup, date_list_markup
 from app.bot.service.user_service import get_db_user_id
 from app.data.init_db import get_db_connection
@@ -46,7 +46,7 @@ async def process_spot_request(query: CallbackQuery, date_str, state: FSMContext
     request_date = date.fromisoformat(date_str)
 
     try:
-        with get_db_connection() as conn:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
                 db_user_id = await get_db_user_id(cur, tg_user_id)
 
@@ -65,14 +65,14 @@ async def process_spot_request(query: CallbackQuery, date_str, state: FSMContext
                     return []
 
                 result = await insert_request_on_date(cur, db_user_id, request_date)
-                conn.commit()
+                await conn.commit()
 
                 if result:
                     await query.message.edit_text(
                         f"✅ Отлично! Вы заняли место в очереди на парковочное место на {request_date.strftime('%d.%m.%Y')}",
                         reply_markup=return_markup
                     )
-                    await distribute_parking_spots()
+                    request_distribution({request_date})
                 else:
                     await query.message.edit_text(
                         f"⚠️ Вы уже заняли место в очереди на парковочное место на {request_date.strftime('%d.%m.%Y')}",
@@ -2,15 +2,38 @@ import logging
 
 from aiogram import types
 
+from app.bot.config import WEEKLY_STATISTICS_COMMAND_INTERVAL_SECONDS
 from app.bot.keyboard_markup import return_markup
-from app.bot.service.statistics_service import weekly_statistics_service
+from app.bot.notification.weeky_statistics_notification import format_weekly_statistics
+from app.bot.service.statistics_service import current_week, get_weekly_report
 from app.log_text import STATISTICS_CHECK_ERROR
+from app.utils.cache_util import InMemoryCache
+
+# chat_id чатов, в которые статистика недавно отправлялась по команде
+_recent_requests = InMemoryCache(max_size=1000, default_ttl=WEEKLY_STATISTICS_COMMAND_INTERVAL_SECONDS)
 
 
 async def weekly_statistics(message: types.Message):
+    """
+    Отвечает в чат недельной статистикой из кэша отчетов.
+
+    Команда не публикует новое сообщение в группе и не перезакрепляет его - это делает только
+    пятничная задача планировщика. В один чат отвечает не чаще раза в
+    WEEKLY_STATISTICS_COMMAND_INTERVAL_SECONDS секунд.
+    """
+    if await _recent_requests.get(message.chat.id):
+        await message.answer("⏳ Статистика за неделю уже отправлялась недавно, попробуйте позже.")
+        return
+    # Ключ ставится до ответа, чтобы параллельные команды не считали отчет дважды
+    await _recent_requests.set(message.chat.id, True)
+
     try:
-        await weekly_statistics_service()
+        monday_date, friday_date = current_week()
+        report = await get_weekly_report(monday_date, friday_date)
+        await message.answer(format_weekly_statistics(report, monday_date, friday_date))
     except Exception as e:
+        # Статистику не получили - не запрещаем повторить команду сразу
+        await _recent_requests.delete(message.chat.id)
         logging.error(STATISTICS_CHECK_ERROR.format(e))
         await message.answer(
             "❌ Произошла ошибка при получении статистики. Попробуйте позже.",
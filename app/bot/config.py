@@ -10,5 +10,23 @@ DELAY_MINUTES_CONFIRM_SPOT=int(os.environ.get("DELAY_MINUTES_CONFIRM_SPOT"))
 GROUP_ID = int(os.environ.get('GROUP_ID'))
 LOGS_CHANNEL_ID = int(os.environ.get('LOGS_CHANNEL_ID'))
 FEEDBACK_CHANNEL_ID = int(os.environ.get('FEEDBACK_CHANNEL_ID'))
+DISTRIBUTION_DEBOUNCE_SECONDS = float(os.environ.get('DISTRIBUTION_DEBOUNCE_SECONDS', 1))
+DISTRIBUTION_POLICY = os.environ.get('DISTRIBUTION_POLICY', 'lowest_rating')
+NOTIFICATION_CONCURRENCY = int(os.environ.get('NOTIFICATION_CONCURRENCY', 10))
+CONFIRMATION_SWEEP_SECONDS = int(os.environ.get('CONFIRMATION_SWEEP_SECONDS', 15))
+OUTBOUND_CONCURRENCY = int(os.environ.get('OUTBOUND_CONCURRENCY', 8))
+OUTBOUND_GLOBAL_RATE = float(os.environ.get('OUTBOUND_GLOBAL_RATE', 25))
+OUTBOUND_PRIVATE_CHAT_INTERVAL = float(os.environ.get('OUTBOUND_PRIVATE_CHAT_INTERVAL', 1))
+OUTBOUND_GROUP_CHAT_INTERVAL = float(os.environ.get('OUTBOUND_GROUP_CHAT_INTERVAL', 3))
+OUTBOUND_MAX_RETRIES = int(os.environ.get('OUTBOUND_MAX_RETRIES', 3))
+OUTBOUND_RESERVED_WORKERS = int(os.environ.get('OUTBOUND_RESERVED_WORKERS', 2))
+LOG_DIGEST_SECONDS = float(os.environ.get('LOG_DIGEST_SECONDS', 10))
+MENTION_CACHE_TTL_SECONDS = int(os.environ.get('MENTION_CACHE_TTL_SECONDS', 21600))
+MENTION_CACHE_MAX_SIZE = int(os.environ.get('MENTION_CACHE_MAX_SIZE', 5000))
+MEMBERSHIP_CACHE_POSITIVE_TTL_SECONDS = int(os.environ.get('MEMBERSHIP_CACHE_POSITIVE_TTL_SECONDS', 3600))
+MEMBERSHIP_CACHE_NEGATIVE_TTL_SECONDS = int(os.environ.get('MEMBERSHIP_CACHE_NEGATIVE_TTL_SECONDS', 60))
+SPOT_CATALOG_REFRESH_SECONDS = int(os.environ.get('SPOT_CATALOG_REFRESH_SECONDS', 600))
+WEEKLY_STATISTICS_COMMAND_INTERVAL_SECONDS = int(os.environ.get('WEEKLY_STATISTICS_COMMAND_INTERVAL_SECONDS', 300))
+BOOKINGS_CACHE_TTL_SECONDS = float(os.environ.get('BOOKINGS_CACHE_TTL_SECONDS', 30))
 
 bot = Bot(token=BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
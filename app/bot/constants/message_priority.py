@@ -0,0 +1,10 @@
+from enum import IntEnum
+
+
+class MessagePriority(IntEnum):
+    """Полосы исходящих сообщений: меньшее значение отправляется раньше"""
+    OFFER = 0
+    ASSIGNMENT = 1
+    REMINDER = 2
+    STATISTICS = 3
+    LOG = 4
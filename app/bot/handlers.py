@@ -1,6 +1,7 @@
 from aiogram.filters import Command
 
 from app.bot.callbacks.handle_callback import handle_callback
+from app.bot.callbacks.handle_chat_member import handle_chat_member, handle_my_chat_member
 from app.bot.callbacks.handle_feedback import handle_write_feedback
 from app.bot.callbacks.release_spot import handle_spot_number
 from app.bot.commands.feedback import feedback
@@ -19,4 +20,6 @@ def register_handlers(router):
     router.message.register(weekly_statistics, Command("weekly_statistics"))
     router.message.register(handle_spot_number, ParkingStates.waiting_for_spot_number)
     router.message.register(handle_write_feedback, ParkingStates.waiting_for_feedback)
-    router.callback_query.register(handle_callback)
\ No newline at end of file
+    router.callback_query.register(handle_callback)
+    router.chat_member.register(handle_chat_member)
+    router.my_chat_member.register(handle_my_chat_member)
\ No newline at end of file
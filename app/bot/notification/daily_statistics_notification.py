@@ -1,9 +1,10 @@
 import logging
 from datetime import datetime
 
-from app.bot.config import bot
 from app.bot.constants.log_types import LogNotification
+from app.bot.constants.message_priority import MessagePriority
 from app.bot.notification.log_notification import send_log_notification
+from app.bot.notification.outbound_queue import get_outbound_queue
 from app.bot.service.chat_access_required_service import chat_access_required
 from app.bot.service.unpin_pin_message_service import unpin_last_message, pin_last_message
 from app.log_text import USER_NOTIFICATION_ERROR
@@ -21,9 +22,10 @@ async def daily_statistics_notification(tg_chat_id: int, message: str, assignmen
         )
 
         # Отправляем новое сообщение
-        sent_message = await bot.send_message(
-            chat_id=tg_chat_id,
-            text=message_text
+        sent_message = await get_outbound_queue().send(
+            tg_chat_id,
+            message_text,
+            MessagePriority.STATISTICS
         )
 
         if is_pinned:
@@ -1,30 +1,159 @@
+import asyncio
 import logging
 from datetime import datetime
 
 from aiogram.enums import ParseMode
 
-from app.bot.config import LOGS_CHANNEL_ID, bot
+from app.bot.config import LOGS_CHANNEL_ID, LOG_DIGEST_SECONDS
 from app.bot.constants.emoji_status import get_log_emoji
 from app.bot.constants.log_types import LogNotification
+from app.bot.constants.message_priority import MessagePriority
+from app.bot.notification.outbound_queue import get_outbound_queue
+
+# Лимит Telegram на длину сообщения - 4096 символов, оставляем запас на разметку
+DIGEST_MESSAGE_LIMIT = 3800
+
+
+class _LogEntry:
+    __slots__ = ("log_type", "message", "count", "first_at", "last_at")
+
+    def __init__(self, log_type: LogNotification, message: str, now: datetime):
+        self.log_type = log_type
+        self.message = message
+        self.count = 1
+        self.first_at = now
+        self.last_at = now
+
+
+class LogDigestAggregator:
+    """
+    Собирает уведомления для канала логов в сводку.
+
+    События копятся window_seconds секунд с момента первого события в окне, одинаковые
+    (тип + текст) склеиваются со счетчиком, и по окончании окна в канал уходит одна сводка.
+    record() не ждет ни сети, ни очереди - его безопасно вызывать из любого except.
+    """
+
+    def __init__(self, window_seconds: float = 10.0):
+        self.window_seconds = window_seconds
+        self._entries = {}
+        self._has_entries = asyncio.Event()
+        self._task = None
+
+        self._recorded = 0
+        self._digests_sent = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Останавливает цикл и отправляет накопленные события последней сводкой"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._flush()
+
+    def record(self, log_type: LogNotification, message):
+        message = str(message)
+        key = (log_type, message)
+        now = datetime.now()
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = _LogEntry(log_type, message, now)
+        else:
+            entry.count += 1
+            entry.last_at = now
+        self._recorded += 1
+        self._has_entries.set()
+
+    def stats(self) -> dict:
+        """Возвращает количество принятых событий, отправленных сводок и ожидающих записей"""
+        return {
+            "recorded": self._recorded,
+            "digests_sent": self._digests_sent,
+            "pending_entries": len(self._entries),
+        }
+
+    async def _run(self):
+        while True:
+            await self._has_entries.wait()
+            await asyncio.sleep(self.window_seconds)
+            self._has_entries.clear()
+            try:
+                await self._flush()
+            except Exception as e:
+                logging.error(f"Error sending logs: {e}")
+
+    async def _flush(self):
+        if not self._entries:
+            return
+        entries, self._entries = list(self._entries.values()), {}
+
+        for message_text in await self._render(entries):
+            get_outbound_queue().send_nowait(
+                LOGS_CHANNEL_ID,
+                message_text,
+                MessagePriority.LOG,
+                parse_mode=ParseMode.MARKDOWN
+            )
+            self._digests_sent += 1
+
+    @staticmethod
+    async def _render(entries):
+        blocks = []
+        for entry in entries:
+            log_emoji = await get_log_emoji(entry.log_type)
+            if entry.count == 1:
+                header = f"{entry.first_at.strftime('%d.%m.%Y %H:%M:%S')}\n{log_emoji} type - {entry.log_type.name}"
+            else:
+                header = (f"{entry.first_at.strftime('%d.%m.%Y %H:%M:%S')} - {entry.last_at.strftime('%H:%M:%S')}\n"
+                          f"{log_emoji} type - {entry.log_type.name} ×{entry.count}")
+            message = entry.message[:DIGEST_MESSAGE_LIMIT - len(header) - 10]
+            blocks.append(f"{header}\n```{message}```")
+
+        messages = []
+        current = ""
+        for block in blocks:
+            if current and len(current) + len(block) + 2 > DIGEST_MESSAGE_LIMIT:
+                messages.append(current)
+                current = ""
+            current = f"{current}\n\n{block}" if current else block
+        if current:
+            messages.append(current)
+        return messages
+
+
+_aggregator = None
+
+
+def init_log_aggregator() -> LogDigestAggregator:
+    """Создает и запускает глобальный агрегатор уведомлений канала логов"""
+    global _aggregator
+    if _aggregator is None:
+        _aggregator = LogDigestAggregator(window_seconds=LOG_DIGEST_SECONDS)
+    _aggregator.start()
+    return _aggregator
+
+
+async def stop_log_aggregator():
+    """Отправляет последнюю сводку и останавливает глобальный агрегатор"""
+    global _aggregator
+    if _aggregator is not None:
+        await _aggregator.stop()
+        _aggregator = None
 
 
 async def send_log_notification(log_type: LogNotification, message):
+    """Ставит событие в сводку для канала логов; сама отправка идет фоном раз в LOG_DIGEST_SECONDS"""
     try:
-        log_emoji = await get_log_emoji(log_type)
-        datetime_now = datetime.now()
-        message_text = (
-            f"{datetime_now.strftime('%d.%m.%Y %H:%M:%S')}\n"
-            f"{log_emoji} type - {log_type.name}\n"
-            f"```"
-            f"{message}"
-            f"```"
-        )
-
-        await bot.send_message(
-            chat_id=LOGS_CHANNEL_ID,
-            text=message_text,
-            parse_mode=ParseMode.MARKDOWN
-        )
+        if _aggregator is None:
+            raise RuntimeError("Log aggregator not initialized. Call init_log_aggregator first.")
+        _aggregator.record(log_type, message)
         return True
     except Exception as e:
         logging.error(f"Error sending logs: {e}")
@@ -1,14 +1,15 @@
+from datetime import datetime, timedelta
+
 from app.bot.config import DELAY_MINUTES_CONFIRM_SPOT
 from app.data.models.spot_confirmation_dto import SpotConfirmationDTO
 from app.bot.users.get_user_full_mention import get_user_full_mention
-from app.schedule.scheduler_manager import schedule_spot_cancellation
 
 
 async def to_user_about_found_spot(spot_confirmation_data: SpotConfirmationDTO):
     user = await get_user_full_mention(spot_confirmation_data.tg_user_id)
     delay_minutes = DELAY_MINUTES_CONFIRM_SPOT
 
-    cancel_time = await schedule_spot_cancellation(spot_confirmation_data, delay_minutes=delay_minutes)
+    cancel_time = spot_confirmation_data.expires_at or datetime.now() + timedelta(minutes=delay_minutes)
 
     message_text = (
         f"Приветствую, {user}!\n\n"
@@ -1,23 +1,27 @@
 import logging
 
-from app.bot.config import bot
 from app.bot.constants.log_types import LogNotification
+from app.bot.constants.message_priority import MessagePriority
 from app.bot.keyboard_markup import return_markup, found_spot_markup
 from app.bot.notification.log_notification import send_log_notification
+from app.bot.notification.outbound_queue import get_outbound_queue
 from app.log_text import USER_NOTIFICATION_ERROR
 
 
-async def notify_user(tg_user_id: int, message_text, is_found_spot: bool = False):
-    """Отправляет уведомление пользователю"""
+async def notify_user(tg_user_id: int, message_text, is_found_spot: bool = False,
+                      priority: MessagePriority = MessagePriority.ASSIGNMENT):
+    """Отправляет уведомление пользователю; предложение места всегда идет в самой срочной полосе"""
     if is_found_spot:
         markup = found_spot_markup
+        priority = MessagePriority.OFFER
     else:
         markup = return_markup
 
     try:
-        await bot.send_message(
-            chat_id=tg_user_id,
-            text=message_text,
+        await get_outbound_queue().send(
+            tg_user_id,
+            message_text,
+            priority,
             reply_markup=markup
         )
         return True
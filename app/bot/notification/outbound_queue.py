@@ -0,0 +1,291 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+from aiogram.exceptions import TelegramRetryAfter
+
+from app.bot.config import bot, OUTBOUND_CONCURRENCY, OUTBOUND_GLOBAL_RATE, OUTBOUND_PRIVATE_CHAT_INTERVAL, \
+    OUTBOUND_GROUP_CHAT_INTERVAL, OUTBOUND_MAX_RETRIES, OUTBOUND_RESERVED_WORKERS
+from app.bot.constants.message_priority import MessagePriority
+from app.log_text import OUTBOUND_SEND_ERROR, OUTBOUND_RETRY_AFTER
+
+
+# Полосы, которые обслуживают зарезервированные воркеры: им никогда не приходится ждать массовых рассылок
+URGENT_PRIORITIES = (MessagePriority.OFFER, MessagePriority.ASSIGNMENT)
+
+
+class _OutboundMessage:
+    __slots__ = ("chat_id", "kwargs", "future", "priority", "enqueued_at", "attempts")
+
+    def __init__(self, chat_id, kwargs, future, priority):
+        self.chat_id = chat_id
+        self.kwargs = kwargs
+        self.future = future
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.attempts = 0
+
+
+class _LaneMetrics:
+    __slots__ = ("sent", "failed", "latencies", "max_latency")
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.latencies = deque(maxlen=1000)
+        self.max_latency = 0.0
+
+    def record(self, latency, success):
+        if success:
+            self.sent += 1
+        else:
+            self.failed += 1
+        self.latencies.append(latency)
+        self.max_latency = max(self.max_latency, latency)
+
+    def percentile(self, percent):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+
+class OutboundMessageQueue:
+    """
+    Общая очередь исходящих сообщений Telegram.
+
+    Все bot.send_message идут через пул воркеров с ограничением параллельности и соблюдают
+    лимиты Telegram: общий (global_rate сообщений в секунду на бота) и на чат (не чаще одного
+    сообщения в private_chat_interval секунд в личку и group_chat_interval - в группу).
+    На TelegramRetryAfter отправка приостанавливается на указанное сервером время и
+    повторяется, не больше max_retries раз.
+
+    Сообщения разложены по полосам MessagePriority: свободный воркер всегда берет сообщение
+    из самой приоритетной непустой полосы. reserved_workers воркеров берут только предложения
+    мест и уведомления о назначении, поэтому срочные сообщения не ждут, даже если остальные
+    воркеры заняты рассылкой напоминаний, статистики или логов.
+
+    Параметры:
+        concurrency: количество воркеров, одновременно отправляющих сообщения
+        global_rate: сообщений в секунду на весь бот
+        private_chat_interval: минимальный интервал между сообщениями в один личный чат
+        group_chat_interval: минимальный интервал между сообщениями в одну группу/канал
+        max_retries: сколько раз повторять отправку после TelegramRetryAfter
+        reserved_workers: сколько воркеров из concurrency обслуживают только срочные полосы
+    """
+
+    def __init__(self, sender, concurrency=8, global_rate=25.0, private_chat_interval=1.0,
+                 group_chat_interval=3.0, max_retries=3, reserved_workers=1):
+        self._sender = sender
+        self.concurrency = concurrency
+        self.global_rate = global_rate
+        self.private_chat_interval = private_chat_interval
+        self.group_chat_interval = group_chat_interval
+        self.max_retries = max_retries
+        self.reserved_workers = min(reserved_workers, concurrency - 1)
+
+        self._lanes = {priority: deque() for priority in MessagePriority}
+        self._lane_metrics = {priority: _LaneMetrics() for priority in MessagePriority}
+        self._has_messages = asyncio.Event()
+        self._unfinished = 0
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._workers = []
+        self._global_next_at = 0.0
+        self._paused_until = 0.0
+        self._chat_next_at = {}
+
+        self._sent = 0
+        self._failed = 0
+        self._retries = 0
+
+    def start(self):
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(URGENT_PRIORITIES if index < self.reserved_workers
+                                                 else tuple(MessagePriority)))
+                for index in range(self.concurrency)
+            ]
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """Дожидается отправки поставленных сообщений (не дольше drain_timeout) и останавливает воркеры"""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        # Не отправленные за drain_timeout сообщения отменяются, чтобы ожидающие не зависли
+        for lane in self._lanes.values():
+            while lane:
+                lane.popleft().future.cancel()
+        self._unfinished = 0
+        self._drained.set()
+
+    def send(self, chat_id: int, text: str, priority: MessagePriority = MessagePriority.ASSIGNMENT,
+             **kwargs) -> asyncio.Future:
+        """
+        Ставит сообщение в полосу priority.
+
+        Возвращает asyncio.Future, который завершится отправленным Message или исключением
+        Telegram. Результат можно дождаться (await) или проигнорировать.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._lanes[priority].append(_OutboundMessage(chat_id, dict(kwargs, text=text), future, priority))
+        self._unfinished += 1
+        self._drained.clear()
+        self._has_messages.set()
+        return future
+
+    def send_nowait(self, chat_id: int, text: str, priority: MessagePriority = MessagePriority.ASSIGNMENT,
+                    **kwargs) -> asyncio.Future:
+        """Отправляет сообщение в режиме "отправил и забыл": ошибки только логируются"""
+        future = self.send(chat_id, text, priority, **kwargs)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def stats(self) -> dict:
+        """
+        Возвращает счетчики очереди: глубину, отправленные, неудачные и повторные отправки,
+        а по каждой полосе - глубину и задержку от постановки в очередь до отправки (p50/p99/max)
+        """
+        return {
+            "queue_depth": self.queue_depth,
+            "sent": self._sent,
+            "failed": self._failed,
+            "retries": self._retries,
+            "lanes": {
+                priority.name: {
+                    "queue_depth": len(self._lanes[priority]),
+                    "sent": metrics.sent,
+                    "failed": metrics.failed,
+                    "latency_p50": metrics.percentile(50),
+                    "latency_p99": metrics.percentile(99),
+                    "latency_max": metrics.max_latency,
+                }
+                for priority, metrics in self._lane_metrics.items()
+            },
+        }
+
+    def _pop_message(self, priorities):
+        for priority in priorities:
+            lane = self._lanes[priority]
+            if lane:
+                return lane.popleft()
+        return None
+
+    async def _worker(self, priorities):
+        while True:
+            message = self._pop_message(priorities)
+            while message is None:
+                # Между проверкой полос и clear нет await, поэтому сигнал о новом сообщении не теряется
+                self._has_messages.clear()
+                await self._has_messages.wait()
+                message = self._pop_message(priorities)
+            try:
+                await self._deliver(message)
+            finally:
+                self._unfinished -= 1
+                if self._unfinished <= 0:
+                    self._drained.set()
+
+    async def _deliver(self, message):
+        while True:
+            await self._wait_for_slot(message.chat_id)
+            message.attempts += 1
+            try:
+                result = await self._sender(chat_id=message.chat_id, **message.kwargs)
+            except TelegramRetryAfter as e:
+                if message.attempts > self.max_retries:
+                    self._fail(message, e)
+                    return
+                self._retries += 1
+                logging.warning(OUTBOUND_RETRY_AFTER.format(message.chat_id, e.retry_after))
+                # Flood control Telegram действует на весь бот: приостанавливаем все воркеры
+                self._paused_until = max(self._paused_until, time.monotonic() + e.retry_after)
+                continue
+            except asyncio.CancelledError:
+                if not message.future.done():
+                    message.future.cancel()
+                raise
+            except Exception as e:
+                self._fail(message, e)
+                return
+
+            self._sent += 1
+            self._lane_metrics[message.priority].record(time.monotonic() - message.enqueued_at, True)
+            if not message.future.done():
+                message.future.set_result(result)
+            return
+
+    def _fail(self, message, error):
+        self._failed += 1
+        self._lane_metrics[message.priority].record(time.monotonic() - message.enqueued_at, False)
+        if not message.future.done():
+            message.future.set_exception(error)
+
+    async def _wait_for_slot(self, chat_id):
+        # Слот занимается только в момент готовности: проверка и запись идут без await между ними,
+        # поэтому воркеры не могут отправить в один чат чаще interval даже после паузы flood control
+        interval = self.group_chat_interval if chat_id < 0 else self.private_chat_interval
+        while True:
+            now = time.monotonic()
+            ready_at = max(self._chat_next_at.get(chat_id, 0.0), self._global_next_at, self._paused_until)
+            if ready_at <= now:
+                self._chat_next_at[chat_id] = now + interval
+                self._global_next_at = now + 1 / self.global_rate
+                break
+            await asyncio.sleep(ready_at - now)
+
+        if len(self._chat_next_at) > 10000:
+            self._chat_next_at = {chat: slot for chat, slot in self._chat_next_at.items() if slot > now}
+
+    @staticmethod
+    def _log_failure(future):
+        if not future.cancelled() and future.exception() is not None:
+            logging.error(OUTBOUND_SEND_ERROR.format(future.exception()))
+
+
+_queue = None
+
+
+def init_outbound_queue() -> OutboundMessageQueue:
+    """Создает и запускает глобальную очередь исходящих сообщений"""
+    global _queue
+    if _queue is None:
+        _queue = OutboundMessageQueue(
+            bot.send_message,
+            concurrency=OUTBOUND_CONCURRENCY,
+            global_rate=OUTBOUND_GLOBAL_RATE,
+            private_chat_interval=OUTBOUND_PRIVATE_CHAT_INTERVAL,
+            group_chat_interval=OUTBOUND_GROUP_CHAT_INTERVAL,
+            max_retries=OUTBOUND_MAX_RETRIES,
+            reserved_workers=OUTBOUND_RESERVED_WORKERS
+        )
+    _queue.start()
+    return _queue
+
+
+def get_outbound_queue() -> OutboundMessageQueue:
+    """Возвращает глобальную очередь исходящих сообщений"""
+    if _queue is None:
+        raise RuntimeError("Outbound queue not initialized. Call init_outbound_queue first.")
+    return _queue
+
+
+async def stop_outbound_queue():
+    """Останавливает глобальную очередь исходящих сообщений"""
+    global _queue
+    if _queue is not None:
+        await _queue.stop()
+        _queue = None
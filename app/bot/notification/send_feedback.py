@@ -4,10 +4,11 @@ from datetime import datetime
 from aiogram import types
 from aiogram.fsm.context import FSMContext
 
-from app.bot.config import FEEDBACK_CHANNEL_ID, bot
+from app.bot.config import FEEDBACK_CHANNEL_ID
 from app.bot.constants.log_types import LogNotification
 from app.bot.keyboard_markup import return_markup
 from app.bot.notification.log_notification import send_log_notification
+from app.bot.notification.outbound_queue import get_outbound_queue
 from app.bot.users.get_user_full_mention import get_user_full_mention
 from app.log_text import FEEDBACK_MESSAGE_PROCESSING_ERROR
 
@@ -35,9 +36,9 @@ async def send_feedback(message: types.Message, state: FSMContext):
             f"📅 Время: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         )
 
-        sent_message = await bot.send_message(
-            chat_id=FEEDBACK_CHANNEL_ID,
-            text=message_text
+        sent_message = await get_outbound_queue().send(
+            FEEDBACK_CHANNEL_ID,
+            message_text
         )
 
         if sent_message:
@@ -1,27 +1,34 @@
 import logging
 
-from app.bot.config import bot
 from app.bot.constants.log_types import LogNotification
+from app.bot.constants.message_priority import MessagePriority
 from app.bot.notification.log_notification import send_log_notification
+from app.bot.notification.outbound_queue import get_outbound_queue
 from app.bot.service.chat_access_required_service import chat_access_required
 from app.bot.service.unpin_pin_message_service import pin_last_message, unpin_last_message
 from app.log_text import WEEKLY_STATISTICS_SEND_ERROR, CHAT_ACCESS_ERROR
 
 
+def format_weekly_statistics(message: str, monday_date, friday_date) -> str:
+    """Оформляет текст недельной статистики заголовком с диапазоном дат"""
+    return (
+        f"👋<b>Всем привет!</b>\n"
+        f"<b>📊 Статистика за текущую неделю</b> <u>{monday_date.strftime('%d.%m.%Y')}-{friday_date.strftime('%d.%m.%Y')}</u>:\n"
+        f"{message}"
+    )
+
+
 @chat_access_required
 async def weekly_statistics_notification(tg_chat_id: int, message: str, monday_date, friday_date, is_pinned=False):
     """Отправляет уведомление о статистеке распределения мест за текущую неделю"""
     try:
-        message_text = (
-            f"👋<b>Всем привет!</b>\n"
-            f"<b>📊 Статистика за текущую неделю</b> <u>{monday_date.strftime('%d.%m.%Y')}-{friday_date.strftime('%d.%m.%Y')}</u>:\n"
-            f"{message}"
-        )
+        message_text = format_weekly_statistics(message, monday_date, friday_date)
 
         # Отправляем новое сообщение
-        sent_message = await bot.send_message(
-            chat_id=tg_chat_id,
-            text=message_text
+        sent_message = await get_outbound_queue().send(
+            tg_chat_id,
+            message_text,
+            MessagePriority.STATISTICS
         )
 
         if is_pinned:
@@ -0,0 +1,90 @@
+import time
+from datetime import date
+
+from app.bot.config import BOOKINGS_CACHE_TTL_SECONDS
+from app.bot.service.user_service import get_db_user_id
+from app.data.init_db import get_db_connection
+from app.data.models.releases.releases_enum import ParkingReleaseStatus
+from app.data.models.releases.revoke_releases_dto import RevokeRelease
+from app.data.models.requests.requests_enum import ParkingRequestStatus
+from app.data.models.requests.revoke_requests_dto import RevokeRequest
+from app.data.models.user_bookings_dto import UserBookings
+from app.data.repository.statistics_repository import get_user_bookings_snapshot
+
+# tg_id -> (момент устаревания, UserBookings)
+_bookings_cache = {}
+# Растет при каждом сбросе кэша: сводка, прочитанная во время сброса, не сохраняется
+_bookings_generation = 0
+
+
+def invalidate_user_bookings(tg_user_id=None):
+    """
+    Сбрасывает закэшированные сводки бронирований.
+
+    Параметры:
+        tg_user_id: пользователь, чья сводка устарела; None - сбросить все сводки
+    """
+    global _bookings_generation
+    _bookings_generation += 1
+    if tg_user_id is None:
+        _bookings_cache.clear()
+    else:
+        _bookings_cache.pop(tg_user_id, None)
+
+
+async def get_user_bookings(tg_user_id):
+    """
+    Возвращает сводку бронирований пользователя: счетчики запросов за всё время,
+    актуальные запросы и освобождения.
+
+    Параметры:
+        tg_user_id: идентификатор пользователя в Telegram
+
+    Возвращает:
+        UserBookings или None, если пользователь не зарегистрирован
+
+    Особенности:
+        - Сводка читается одним запросом (get_user_bookings_snapshot)
+        - Кэшируется на BOOKINGS_CACHE_TTL_SECONDS, чтобы переходы меню -> статистика -> отмена
+          не ходили в базу повторно; любое распределение мест сбрасывает кэш
+          (см. request_distribution)
+    """
+    cached = _bookings_cache.get(tg_user_id)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    generation = _bookings_generation
+    async with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            db_user_id = await get_db_user_id(cur, tg_user_id)
+            if not db_user_id:
+                return None
+            accepted, not_found, canceled, requests, releases = \
+                await get_user_bookings_snapshot(cur, db_user_id, date.today())
+
+    bookings = UserBookings(
+        accepted_count=accepted,
+        not_found_count=not_found,
+        canceled_count=canceled,
+        requests=[RevokeRequest(
+            request_id=row['id'],
+            request_date=date.fromisoformat(row['date']),
+            status=ParkingRequestStatus(row['status']),
+            spot_id=row['spot_id'],
+        ) for row in requests],
+        releases=[RevokeRelease(
+            release_id=row['id'],
+            release_date=date.fromisoformat(row['date']),
+            status=ParkingReleaseStatus(row['status']),
+            spot_id=row['spot_id'],
+        ) for row in releases],
+    )
+
+    if generation != _bookings_generation:
+        return bookings
+    if len(_bookings_cache) > 10000:
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in _bookings_cache.items() if expires_at <= now]:
+            del _bookings_cache[key]
+    _bookings_cache[tg_user_id] = (time.monotonic() + BOOKINGS_CACHE_TTL_SECONDS, bookings)
+    return bookings
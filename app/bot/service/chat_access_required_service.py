@@ -1,21 +1,51 @@
 import logging
 from functools import wraps
 
-from app.bot.config import bot
+from app.bot.config import bot, MEMBERSHIP_CACHE_POSITIVE_TTL_SECONDS, MEMBERSHIP_CACHE_NEGATIVE_TTL_SECONDS
 from app.bot.constants.log_types import LogNotification
 from app.bot.notification.log_notification import send_log_notification
 from app.log_text import CHAT_ACCESS_ERROR
+from app.utils.cache_util import InMemoryCache
+
+# chat_id -> пустая строка, если доступ есть, или текст ошибки, если доступа нет
+chat_access_cache = InMemoryCache()
+
+
+async def invalidate_chat_access(tg_chat_id: int):
+    """Сбрасывает закэшированный результат проверки доступа к чату"""
+    await chat_access_cache.delete(tg_chat_id)
+
+
+async def _check_chat_access(tg_chat_id: int):
+    cached = await chat_access_cache.get(tg_chat_id)
+    if cached is not None:
+        return cached or None
+
+    try:
+        await bot.get_chat(tg_chat_id)
+    except Exception as e:
+        await chat_access_cache.set(tg_chat_id, str(e), MEMBERSHIP_CACHE_NEGATIVE_TTL_SECONDS)
+        return str(e)
+    await chat_access_cache.set(tg_chat_id, "", MEMBERSHIP_CACHE_POSITIVE_TTL_SECONDS)
+    return None
 
 
 def chat_access_required(func):
-    """Декоратор для проверки доступа к чату перед выполнением функции"""
+    """
+    Декоратор для проверки доступа к чату перед выполнением функции
+
+    Результат проверки кэшируется (доступ - надолго, ошибка - ненадолго) и сбрасывается,
+    когда Telegram сообщает об изменении прав бота в чате.
+    """
     @wraps(func)
     async def wrapper(tg_chat_id: int, *args, **kwargs):
         try:
-            await bot.get_chat(tg_chat_id)
+            error = await _check_chat_access(tg_chat_id)
+            if error is not None:
+                raise RuntimeError(error)
             return await func(tg_chat_id, *args, **kwargs)
         except Exception as e:
             logging.error(CHAT_ACCESS_ERROR.format(tg_chat_id, e))
             await send_log_notification(LogNotification.ERROR, CHAT_ACCESS_ERROR.format(tg_chat_id, e))
             return False
-    return wrapper
\ No newline at end of file
+    return wrapper
@@ -1,9 +1,11 @@
+import asyncio
 import logging
-import random
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import partial
 
 import psycopg2
 
+from app.bot.config import DISTRIBUTION_POLICY, NOTIFICATION_CONCURRENCY, DELAY_MINUTES_CONFIRM_SPOT
 from app.bot.constants.log_types import LogNotification
 from app.data.models.spot_confirmation_dto import SpotConfirmationDTO
 from app.bot.notification.log_notification import send_log_notification
@@ -11,106 +13,168 @@ from app.bot.notification.messages.to_owner_message import to_owner_message
 from app.bot.notification.messages.to_user_about_assigned_spot import to_user_about_assigned_spot
 from app.bot.notification.messages.to_user_about_found_spot import to_user_about_found_spot
 from app.bot.notification.notify_user import notify_user
-from app.bot.service.requests.request_service import update_request_status
+from app.allocation.engine import allocate
+from app.allocation.policies import get_policy
+from app.allocation.records import Candidate, FreeRelease
 from app.data.init_db import get_db_connection
 from app.data.models.releases.parking_releases import ParkingReleaseStatus
 from app.data.models.requests.parking_requests import ParkingRequestStatus
-from app.data.repository.distribute_parking_spots_repository import  get_candidates, get_dates_with_availability
-from app.data.repository.parking_releases_repository import update_parking_releases, get_release_owner, get_free_spots
-from app.data.repository.spot_confirmations_repository import insert_row_of_spot_confirmation
-from app.data.repository.users_repository import increment_user_rating
-from app.log_text import PARKING_DISTRIBUTION_ERROR, DATABASE_ERROR
+from app.data.models.spot_assignment_dto import SpotAssignment
+from app.data.repository.distribute_parking_spots_repository import get_candidates, get_dates_with_availability, \
+    assign_spots_to_candidates, lock_distribution_date
+from app.data.repository.parking_releases_repository import get_free_spots
+from app.log_text import PARKING_DISTRIBUTION_ERROR, DATABASE_ERROR, DISTRIBUTION_NOTIFICATION_ERROR
 
+_allocation_policy = get_policy(DISTRIBUTION_POLICY)
 
-async def distribute_parking_spots():
+
+async def distribute_parking_spots(dates=None):
     """
         Распределяет свободные парковочные места среди пользователей в очереди.
 
-        Автоматически назначает доступные места пользователям с наименьшим рейтингом,
-        уведомляя обе стороны о результате распределения.
+        Автоматически назначает доступные места по политике DISTRIBUTION_POLICY (по умолчанию
+        пользователям с наименьшим рейтингом), уведомляя обе стороны о результате распределения.
+        Выбор получателей выполняет чистый движок app.allocation.engine.allocate, сервис только
+        загружает снимки из базы, применяет пары и рассылает уведомления.
+
+        Параметры:
+            dates: даты, затронутые действием пользователя - пересчитываются только они;
+                   None - полный проход по всем датам (режим планировщика)
 
         Возвращает:
             int: количество успешно распределенных мест
+
+        Особенности:
+            - Каждая дата распределяется в отдельной транзакции под advisory-блокировкой даты,
+              места и запросы захватываются через FOR UPDATE SKIP LOCKED. Параллельные запуски
+              (в том числе из разных экземпляров бота) делят даты между собой и не выдают
+              одно место дважды
+            - Все уведомления (получателям, владельцам, предложения WAITING) собираются и
+              отправляются после commit параллельно, не больше NOTIFICATION_CONCURRENCY сразу
         """
-    today_date = datetime.today().date()
-    today_9am = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
-    datetime_now = datetime.now()
+    distributed_count = 0
+    outgoing_notifications = []
     try:
-        with get_db_connection() as conn:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
-                dates_with_availability = await get_dates_with_availability(cur)
-
-                distributed_count = 0
-                release_notifications = []
+                dates_with_availability = await get_dates_with_availability(cur, dates)
+                await conn.commit()
 
                 for distribution_date in dates_with_availability:
-                    free_spots = await get_free_spots(cur, distribution_date)
+                    date_count, date_notifications = await _distribute_date(cur, distribution_date)
+                    await conn.commit()
+                    distributed_count += date_count
+                    outgoing_notifications.extend(date_notifications)
 
-                    if not free_spots:
-                        continue
+    except psycopg2.Error as e:
+        logging.error(DATABASE_ERROR.format(e))
+        await send_log_notification(LogNotification.ERROR, DATABASE_ERROR.format(e))
+    except Exception as e:
+        logging.error(PARKING_DISTRIBUTION_ERROR.format(e))
+        await send_log_notification(LogNotification.ERROR, PARKING_DISTRIBUTION_ERROR.format(e))
+    finally:
+        # Уведомления уходят только по закоммиченным датам и уже без открытой транзакции
+        await _send_notifications(outgoing_notifications)
 
-                    candidates = await get_candidates(cur, distribution_date, free_spots)
-                    if not candidates:
-                        continue
+    logging.debug(f"Distributed {distributed_count} parking spots")
+    return distributed_count
 
-                    min_rating = candidates[0][2]
-                    min_rating_candidates = [c for c in candidates if c[2] == min_rating]
-                    random.shuffle(min_rating_candidates)
-                    selected_candidates = min_rating_candidates[:len(free_spots)]
 
-                    for i, (request_id, user_id, current_rating, tg_id) in enumerate(selected_candidates):
-                        release_id, spot_id = free_spots[i]
+async def _send_notifications(notifications):
+    """
+        Отправляет собранные уведомления параллельно, не больше NOTIFICATION_CONCURRENCY одновременно.
 
-                        if (distribution_date == today_date) and (datetime_now > today_9am):
+        Параметры:
+            notifications: список корутинных функций без аргументов, каждая отправляет одно уведомление
+        """
+    semaphore = asyncio.Semaphore(NOTIFICATION_CONCURRENCY)
 
-                            await update_parking_releases(cur, user_id, release_id, ParkingReleaseStatus.WAITING)
-                            await update_request_status(cur, request_id,
-                                                                ParkingRequestStatus.WAITING_CONFIRMATION)
+    async def send(notification):
+        async with semaphore:
+            await notification()
 
-                            spot_confirmation_data = SpotConfirmationDTO(
-                                str(user_id), tg_id, spot_id, distribution_date, release_id, request_id
-                            )
-                            await insert_row_of_spot_confirmation(cur, user_id, release_id, request_id)
+    results = await asyncio.gather(*(send(notification) for notification in notifications), return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logging.error(DISTRIBUTION_NOTIFICATION_ERROR.format(result))
 
-                            message_text = await to_user_about_found_spot(spot_confirmation_data)
-                            await notify_user(tg_id, message_text, True)
 
-                        else:
-                            release_owner = await get_release_owner(cur, release_id)
+async def _notify_found_spot(spot_confirmation_data: SpotConfirmationDTO):
+    message_text = await to_user_about_found_spot(spot_confirmation_data)
+    await notify_user(spot_confirmation_data.tg_user_id, message_text, True)
 
-                            if release_owner:
-                                release_user_id, release_tg_id = release_owner
-                                release_notifications.append({
-                                    'tg_id': release_tg_id,
-                                    'spot_number': spot_id,
-                                    'date': distribution_date
-                                })
 
-                            await update_parking_releases(cur, user_id, release_id, ParkingReleaseStatus.ACCEPTED)
+async def _notify_assigned_spot(tg_id: int, spot_number: int, assignment_date):
+    message_text = await to_user_about_assigned_spot(tg_id, spot_number, assignment_date)
+    await notify_user(tg_id, message_text)
 
-                            await update_request_status(cur, request_id, ParkingRequestStatus.ACCEPTED)
 
-                            await increment_user_rating(cur, user_id)
+async def _notify_owner(tg_id: int, spot_number: int, assignment_date):
+    message_text = await to_owner_message(tg_id, spot_number, assignment_date)
+    await notify_user(tg_id, message_text)
 
-                            message_text = await to_user_about_assigned_spot(tg_id, spot_id, distribution_date)
-                            await notify_user(tg_id, message_text)
-                            distributed_count += 1
 
-                conn.commit()
-                for notification in release_notifications:
-                    message_text = await to_owner_message(
-                        notification['tg_id'],
-                        notification['spot_number'],
-                        notification['date']
-                    )
-                    await notify_user(notification['tg_id'], message_text)
-                logging.debug(f"Distributed {distributed_count} parking spots")
-                return distributed_count
+async def _distribute_date(cur, distribution_date):
+    """
+        Распределяет места на одну дату в текущей транзакции.
 
-    except psycopg2.Error as e:
-        logging.error(DATABASE_ERROR.format(e))
-        await send_log_notification(LogNotification.ERROR, DATABASE_ERROR.format(e))
-    except Exception as e:
-        logging.error(PARKING_DISTRIBUTION_ERROR.format(e))
-        await send_log_notification(LogNotification.ERROR, PARKING_DISTRIBUTION_ERROR.format(e))
-        return 0
+        Возвращает (количество мест, выданных со статусом ACCEPTED, список уведомлений).
+        Уведомления не отправляются здесь: вызывающий код отправляет их после commit,
+        чтобы транзакция и блокировки строк не держались на время запросов к Telegram.
+        """
+    today_9am = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+    datetime_now = datetime.now()
+    notifications = []
+
+    await lock_distribution_date(cur, distribution_date)
+
+    free_spots = await get_free_spots(cur, distribution_date)
+    if not free_spots:
+        return 0, notifications
+
+    candidates = await get_candidates(cur, distribution_date, _allocation_policy.needs_last_assigned_date)
+    if not candidates:
+        return 0, notifications
+
+    assignments = allocate(
+        [FreeRelease(*row) for row in free_spots],
+        [Candidate(*row) for row in candidates],
+        _allocation_policy
+    )
+    release_ids = [assignment.release_id for assignment in assignments]
+    request_ids = [assignment.request_id for assignment in assignments]
+
+    if (distribution_date == datetime_now.date()) and (datetime_now > today_9am):
+        expires_at = datetime_now + timedelta(minutes=DELAY_MINUTES_CONFIRM_SPOT)
+        results = await assign_spots_to_candidates(
+            cur, distribution_date, release_ids, request_ids,
+            release_status=ParkingReleaseStatus.WAITING,
+            request_status=ParkingRequestStatus.WAITING_CONFIRMATION,
+            increment_rating=False,
+            create_confirmations=True,
+            confirmation_expires_at=expires_at
+        )
+        for assignment in (SpotAssignment(*row) for row in results):
+            spot_confirmation_data = SpotConfirmationDTO(
+                str(assignment.user_id), assignment.tg_id, assignment.spot_id, distribution_date,
+                assignment.release_id, assignment.request_id, expires_at
+            )
+            notifications.append(partial(_notify_found_spot, spot_confirmation_data))
+        return 0, notifications
+
+    results = await assign_spots_to_candidates(
+        cur, distribution_date, release_ids, request_ids,
+        release_status=ParkingReleaseStatus.ACCEPTED,
+        request_status=ParkingRequestStatus.ACCEPTED,
+        increment_rating=True,
+        create_confirmations=False
+    )
+    distributed_count = 0
+    for assignment in (SpotAssignment(*row) for row in results):
+        if assignment.owner_tg_id:
+            notifications.append(partial(_notify_owner, assignment.owner_tg_id, assignment.spot_id,
+                                         distribution_date))
+        notifications.append(partial(_notify_assigned_spot, assignment.tg_id, assignment.spot_id,
+                                     distribution_date))
+        distributed_count += 1
+    return distributed_count, notifications
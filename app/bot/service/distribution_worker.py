@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import time
+
+from app.bot.config import DISTRIBUTION_DEBOUNCE_SECONDS
+from app.bot.constants.log_types import LogNotification
+from app.bot.notification.log_notification import send_log_notification
+from app.bot.service.bookings_service import invalidate_user_bookings
+from app.bot.service.distribution_service import distribute_parking_spots
+from app.bot.service.statistics_service import invalidate_weekly_reports
+from app.log_text import DISTRIBUTION_WORKER_ERROR
+
+
+class DistributionWorker:
+    """
+    Фоновый воркер распределения парковочных мест.
+
+    Обработчики не ждут распределения, а только отмечают затронутые даты как "грязные".
+    Воркер просыпается по первому такому сигналу, выжидает debounce_seconds, собирая все
+    сигналы, пришедшие за это время, и выполняет одно распределение на всю пачку:
+    только по грязным датам или полный проход, если хотя бы один сигнал его запросил.
+    """
+
+    def __init__(self, debounce_seconds: float = 1.0):
+        self.debounce_seconds = debounce_seconds
+        self._dirty_dates = set()
+        self._full_sweep = False
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+        self._triggers = 0
+        self._runs = 0
+        self._failed_runs = 0
+        self._last_run_duration = 0.0
+        self._max_run_duration = 0.0
+        self._total_run_duration = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, drain_timeout: float = 10.0):
+        """
+        Останавливает воркер, не теряя отмеченные даты.
+
+        Прерванный прогон возвращает свои даты в очередь; все, что осталось в очереди (в том числе
+        сигналы, ждавшие окончания debounce), распределяется последним прогоном не дольше drain_timeout.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        if self.queue_depth:
+            dates, full_sweep = self._take_pending()
+            try:
+                await asyncio.wait_for(self._run_once(dates, full_sweep), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logging.error(DISTRIBUTION_WORKER_ERROR.format(
+                    f"shutdown drain timed out, dates {sorted(dates)} (full sweep: {full_sweep}) not distributed"))
+
+    def trigger(self, dates=None):
+        """
+        Ставит распределение в очередь.
+
+        Параметры:
+            dates: даты, затронутые действием пользователя; None - полный проход по всем датам
+        """
+        self._triggers += 1
+        if dates is None:
+            self._full_sweep = True
+        else:
+            self._dirty_dates.update(dates)
+        self._wakeup.set()
+
+    @property
+    def queue_depth(self) -> int:
+        """Количество дат, ожидающих распределения (полный проход считается одной записью)"""
+        return len(self._dirty_dates) + (1 if self._full_sweep else 0)
+
+    def stats(self) -> dict:
+        """Возвращает метрики воркера: глубину очереди, количество и длительность прогонов"""
+        return {
+            "queue_depth": self.queue_depth,
+            "triggers": self._triggers,
+            "runs": self._runs,
+            "coalesced_triggers": self._triggers - self._runs,
+            "failed_runs": self._failed_runs,
+            "last_run_duration": self._last_run_duration,
+            "max_run_duration": self._max_run_duration,
+            "avg_run_duration": self._total_run_duration / self._runs if self._runs else 0.0,
+        }
+
+    def _take_pending(self):
+        dates, full_sweep = self._dirty_dates, self._full_sweep
+        self._dirty_dates, self._full_sweep = set(), False
+        return dates, full_sweep
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            # Окно для склейки сигналов: клики за это время обработаются одним прогоном
+            await asyncio.sleep(self.debounce_seconds)
+            self._wakeup.clear()
+            dates, full_sweep = self._take_pending()
+            try:
+                await self._run_once(dates, full_sweep)
+            except asyncio.CancelledError:
+                # Транзакция прерванного прогона откатилась: даты снова ждут распределения
+                self._dirty_dates |= dates
+                self._full_sweep = self._full_sweep or full_sweep
+                raise
+
+    async def _run_once(self, dates, full_sweep):
+        started_at = time.monotonic()
+        try:
+            distributed_count = await distribute_parking_spots(None if full_sweep else dates)
+            logging.debug(f"Distribution run for dates {sorted(dates)} (full sweep: {full_sweep}) "
+                          f"distributed {distributed_count} spots")
+        except Exception as e:
+            self._failed_runs += 1
+            logging.error(DISTRIBUTION_WORKER_ERROR.format(e))
+            await send_log_notification(LogNotification.ERROR, DISTRIBUTION_WORKER_ERROR.format(e))
+        finally:
+            # Прогон мог поменять статусы на этих датах - недельные отчеты по ним устарели
+            invalidate_weekly_reports(None if full_sweep else dates)
+            invalidate_user_bookings()
+            duration = time.monotonic() - started_at
+            self._runs += 1
+            self._last_run_duration = duration
+            self._max_run_duration = max(self._max_run_duration, duration)
+            self._total_run_duration += duration
+
+
+_worker = None
+
+
+def init_distribution_worker() -> DistributionWorker:
+    """Создает и запускает глобальный воркер распределения"""
+    global _worker
+    if _worker is None:
+        _worker = DistributionWorker(debounce_seconds=DISTRIBUTION_DEBOUNCE_SECONDS)
+    _worker.start()
+    return _worker
+
+
+def get_distribution_worker() -> DistributionWorker:
+    """Возвращает глобальный воркер распределения"""
+    if _worker is None:
+        raise RuntimeError("Distribution worker not initialized. Call init_distribution_worker first.")
+    return _worker
+
+
+async def stop_distribution_worker():
+    """Останавливает глобальный воркер распределения"""
+    global _worker
+    if _worker is not None:
+        await _worker.stop()
+        _worker = None
+
+
+def request_distribution(dates=None):
+    """
+    Ставит распределение мест в очередь фонового воркера и сразу возвращает управление.
+
+    Параметры:
+        dates: даты, затронутые действием; None - полный проход по всем датам
+    """
+    # Действие уже изменило чьи-то бронирования - сводки "Моей статистики" устарели
+    invalidate_user_bookings()
+    get_distribution_worker().trigger(dates)
+
+
+async def full_distribution_sweep():
+    """Задача планировщика: полный проход распределения по всем датам через воркер"""
+    request_distribution()
@@ -9,9 +9,9 @@ from app.bot.constants.log_types import LogNotification
 from app.bot.keyboard_markup import return_markup, revoke_releases_markup, confirmation_revoke_release_markup, \
     back_to_revoke_release_markup
 from app.bot.notification.log_notification import send_log_notification
-from app.bot.service.distribution_service import distribute_parking_spots
-from app.bot.service.release.release_service import get_user_releases_for_revoke, get_release_for_confirm_revoke, \
-    revoke_parking_release
+from app.bot.service.bookings_service import get_user_bookings
+from app.bot.service.distribution_worker import request_distribution
+from app.bot.service.release.release_service import get_release_for_confirm_revoke, revoke_parking_release
 from app.bot.service.user_service import get_db_user_id
 from app.data.init_db import get_db_connection
 from app.data.models.releases.releases_enum import ParkingReleaseStatus
@@ -24,29 +24,27 @@ async def show_revoke_release_keyboard(query: CallbackQuery, state: FSMContext):
     tg_user_id = query.from_user.id
 
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                db_user_id = await get_db_user_id(cur, tg_user_id)
-
-                if not db_user_id:
-                    logging.error(DB_USER_ID_GET_ERROR.format(tg_user_id))
-                    await send_log_notification(LogNotification.ERROR, DB_USER_ID_GET_ERROR.format(tg_user_id))
-                    return None
-
-                releases = await get_user_releases_for_revoke(cur, db_user_id)
-                if not releases:
-                    await query.message.edit_text(
-                        text="У вас нет освобожденных мест, которые никто не занял",
-                        reply_markup=return_markup
-                    )
-                    return None
-
-                message_text = f"Список мест, которые вы освободили от <u>{today.strftime('%d.%m.%Y')}</u>:"
-                markup = revoke_releases_markup(releases)
-                await query.message.edit_text(
-                    text=message_text,
-                    reply_markup=markup
-                )
+        bookings = await get_user_bookings(tg_user_id)
+
+        if bookings is None:
+            logging.error(DB_USER_ID_GET_ERROR.format(tg_user_id))
+            await send_log_notification(LogNotification.ERROR, DB_USER_ID_GET_ERROR.format(tg_user_id))
+            return None
+
+        releases = [release for release in bookings.releases if release.status == ParkingReleaseStatus.PENDING]
+        if not releases:
+            await query.message.edit_text(
+                text="У вас нет освобожденных мест, которые никто не занял",
+                reply_markup=return_markup
+            )
+            return None
+
+        message_text = f"Список мест, которые вы освободили от <u>{today.strftime('%d.%m.%Y')}</u>:"
+        markup = revoke_releases_markup(releases)
+        await query.message.edit_text(
+            text=message_text,
+            reply_markup=markup
+        )
 
     except psycopg2.Error as e:
         logging.error(DATABASE_ERROR.format(e))
@@ -61,7 +59,7 @@ async def confirmation_revoke_release(query: CallbackQuery, state: FSMContext, r
     tg_user_id = query.from_user.id
 
     try:
-        with get_db_connection() as conn:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
                 db_user_id = await get_db_user_id(cur, tg_user_id)
 
@@ -100,7 +98,7 @@ async def confirm_revoke_release(query: CallbackQuery, state: FSMContext, releas
     tg_user_id = query.from_user.id
 
     try:
-        with get_db_connection() as conn:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
                 db_user_id = await get_db_user_id(cur, tg_user_id)
 
@@ -118,8 +116,9 @@ async def confirm_revoke_release(query: CallbackQuery, state: FSMContext, releas
                     return None
 
                 await revoke_parking_release(cur, release.release_id, ParkingReleaseStatus.CANCELED)
+                await conn.commit()
 
-                await distribute_parking_spots()
+                request_distribution({release.release_date})
 
                 message_text = (f"Вы успешно отозвали место <b>№{release.spot_id} </b>"
                                 f"на дату <u>{release.release_date.strftime('%d.%m.%Y')}</u>\n\n"
@@ -9,10 +9,10 @@ from app.bot.constants.log_types import LogNotification
 from app.bot.keyboard_markup import return_markup, revoke_requests_markup, confirmation_revoke_requests_markup, \
     back_to_revoke_request_markup
 from app.bot.notification.log_notification import send_log_notification
-from app.bot.service.distribution_service import distribute_parking_spots
+from app.bot.service.bookings_service import get_user_bookings
+from app.bot.service.distribution_worker import request_distribution
 from app.bot.service.release.release_service import revoke_parking_release
-from app.bot.service.requests.request_service import get_user_requests_for_revoke, get_request_for_confirm_revoke, \
-    update_request_status
+from app.bot.service.requests.request_service import get_request_for_confirm_revoke, update_request_status
 from app.bot.service.user_service import get_db_user_id, decrement_user_rating_of_1
 from app.data.init_db import get_db_connection
 from app.data.models.releases.releases_enum import ParkingReleaseStatus
@@ -26,29 +26,27 @@ async def show_revoke_request_keyboard(query: CallbackQuery, state: FSMContext):
     tg_user_id = query.from_user.id
 
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                db_user_id = await get_db_user_id(cur, tg_user_id)
-
-                if not db_user_id:
-                    logging.error(DB_USER_ID_GET_ERROR.format(tg_user_id))
-                    await send_log_notification(LogNotification.ERROR, DB_USER_ID_GET_ERROR.format(tg_user_id))
-                    return None
-
-                requests = await get_user_requests_for_revoke(cur, db_user_id)
-                if not requests:
-                    await query.message.edit_text(
-                        text="Не найдено актуальных дат для отмены бронирования места",
-                        reply_markup=return_markup
-                    )
-                    return None
-
-                message_text = f"Список дат, на которые вы запрашивали места от <u>{today.strftime('%d.%m.%Y')}</u>:"
-                markup = revoke_requests_markup(requests)
-                await query.message.edit_text(
-                    text=message_text,
-                    reply_markup=markup
-                )
+        bookings = await get_user_bookings(tg_user_id)
+
+        if bookings is None:
+            logging.error(DB_USER_ID_GET_ERROR.format(tg_user_id))
+            await send_log_notification(LogNotification.ERROR, DB_USER_ID_GET_ERROR.format(tg_user_id))
+            return None
+
+        requests = bookings.requests
+        if not requests:
+            await query.message.edit_text(
+                text="Не найдено актуальных дат для отмены бронирования места",
+                reply_markup=return_markup
+            )
+            return None
+
+        message_text = f"Список дат, на которые вы запрашивали места от <u>{today.strftime('%d.%m.%Y')}</u>:"
+        markup = revoke_requests_markup(requests)
+        await query.message.edit_text(
+            text=message_text,
+            reply_markup=markup
+        )
 
     except psycopg2.Error as e:
         logging.error(DATABASE_ERROR.format(e))
@@ -63,7 +61,7 @@ async def confirmation_revoke_request(query: CallbackQuery, state: FSMContext, r
     tg_user_id = query.from_user.id
 
     try:
-        with get_db_connection() as conn:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
                 db_user_id = await get_db_user_id(cur, tg_user_id)
 
@@ -104,7 +102,7 @@ async def confirm_revoke_request(query: CallbackQuery, state: FSMContext, reques
     tg_user_id = query.from_user.id
 
     try:
-        with get_db_connection() as conn:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
                 db_user_id = await get_db_user_id(cur, tg_user_id)
 
@@ -132,9 +130,9 @@ async def confirm_revoke_request(query: CallbackQuery, state: FSMContext, reques
                                     f"на дату <u>{request.request_date.strftime('%d.%m.%Y')}</u>\n\n"
                                     f"ℹ️ <i>Это место будет предложено кому-нибудь другому</i>")
 
+                await conn.commit()
 
-                await distribute_parking_spots()
-
+                request_distribution({request.request_date})
 
                 await query.message.edit_text(
                     text=message_text,
@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime
 
 import psycopg2
 from aiogram.types import CallbackQuery
@@ -12,16 +13,16 @@ from app.data.init_db import get_db_connection
 from app.data.repository.spot_confirmations_repository import find_spot_confirmations_by_user, \
     deactivate_spot_confirmations_by_user
 from app.log_text import SPOT_CANCEL_ERROR, DB_USER_ID_GET_ERROR, DATABASE_ERROR
-from app.schedule.schedule_utils import cancel_scheduled_cancellation
-from app.bot.service.distribution_service import distribute_parking_spots
+from app.bot.service.distribution_worker import request_distribution
 from app.bot.service.spots.process_confirmation_spot_service import process_spot_cancel
 
 async def cancel_spot(query: CallbackQuery):
     """Обрабатывает отмену занятия места"""
     tg_user_id = query.from_user.id
+    affected_dates = None
 
     try:
-        with get_db_connection() as conn:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
                 db_user_id = await get_db_user_id(cur, tg_user_id)
 
@@ -30,36 +31,38 @@ async def cancel_spot(query: CallbackQuery):
                     await send_log_notification(LogNotification.ERROR, DB_USER_ID_GET_ERROR.format(tg_user_id))
                     return None
 
-                result = await find_spot_confirmations_by_user(cur, db_user_id)
-                print(result)
+                result = await find_spot_confirmations_by_user(cur, db_user_id, datetime.now())
+                if not result:
+                    await query.message.edit_text("❌ Данные о месте устарели")
+                    return
+
                 spot_confirmations = SpotConfirmationDTO(db_user_id=result[0],
                                                          tg_user_id=result[1],
                                                          spot_number=result[2],
                                                          assignment_date=result[3],
                                                          release_id=result[4],
                                                          request_id=result[5])
-                if not spot_confirmations:
-                    await query.message.edit_text("❌ Данные о месте устарели")
-                    return
-
-                await cancel_scheduled_cancellation(spot_confirmations)
-
-                success = await process_spot_cancel(spot_confirmations)
+                affected_dates = {spot_confirmations.assignment_date}
 
-                if success:
-                    await query.message.edit_text(
-                        f"ℹ️ Вы успешно отказались от места №{spot_confirmations.spot_number} "
-                        f"на {spot_confirmations.assignment_date.strftime('%d.%m.%Y')}\n"
-                        "️️⚠️ Я больше не буду предлагать вам места на эту дату",
-                        reply_markup=return_markup
-                    )
-                else:
-                    await query.message.edit_text(
-                        "❌ Не удалось занять место. Возможно, оно уже занято.",
-                        reply_markup=return_markup
-                    )
+                # Поиск, смена статусов и деактивация предложения - одна транзакция в одном соединении
+                success = await process_spot_cancel(cur, spot_confirmations)
+                if not success:
+                    # Частичные изменения откатываем, предложение все равно закрываем
+                    await conn.rollback()
+                    await deactivate_spot_confirmations_by_user(cur, db_user_id)
 
-                await deactivate_spot_confirmations_by_user(cur, db_user_id)
+        if success:
+            await query.message.edit_text(
+                f"ℹ️ Вы успешно отказались от места №{spot_confirmations.spot_number} "
+                f"на {spot_confirmations.assignment_date.strftime('%d.%m.%Y')}\n"
+                "️️⚠️ Я больше не буду предлагать вам места на эту дату",
+                reply_markup=return_markup
+            )
+        else:
+            await query.message.edit_text(
+                "❌ Не удалось занять место. Возможно, оно уже занято.",
+                reply_markup=return_markup
+            )
     except psycopg2.Error as e:
         logging.error(DATABASE_ERROR.format(e))
         await send_log_notification(LogNotification.ERROR, DATABASE_ERROR.format(e))
@@ -71,4 +74,6 @@ async def cancel_spot(query: CallbackQuery):
             reply_markup=return_markup
         )
     finally:
-        await distribute_parking_spots()
\ No newline at end of file
+        # Без затронутой даты ничего не записано: полный проход остается за плановым full_distribution_sweep
+        if affected_dates is not None:
+            request_distribution(affected_dates)
\ No newline at end of file
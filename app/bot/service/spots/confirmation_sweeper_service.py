@@ -0,0 +1,60 @@
+import logging
+from datetime import datetime
+
+import psycopg2
+
+from app.bot.config import DELAY_MINUTES_CONFIRM_SPOT
+from app.bot.constants.log_types import LogNotification
+from app.bot.notification.log_notification import send_log_notification
+from app.bot.notification.messages.to_user_about_time_confirmation_spent import to_user_about_time_confirmation_spent
+from app.bot.notification.notify_user import notify_user
+from app.bot.service.distribution_worker import request_distribution
+from app.data.init_db import get_db_connection
+from app.data.models.spot_confirmation_dto import SpotConfirmationDTO
+from app.data.repository.spot_confirmations_repository import expire_overdue_spot_confirmations, \
+    fill_missing_spot_confirmation_deadlines
+from app.log_text import CONFIRMATION_SWEEP_ERROR, DATABASE_ERROR
+
+
+async def sweep_expired_confirmations(fill_missing_deadlines: bool = False):
+    """
+    Отменяет все неподтвержденные вовремя предложения мест.
+
+    Вместо отдельной задачи планировщика на каждое предложение один периодический проход
+    отменяет все просроченные записи spot_confirmations (срок - expires_at) одним запросом,
+    уведомляет пользователей и ставит затронутые даты на распределение одним сигналом.
+    Срок хранится в базе, поэтому после перезапуска бота ничего не теряется: первый проход
+    при старте отменяет все, что просрочилось за время простоя.
+
+    Параметры:
+        fill_missing_deadlines: сначала проставить срок предложениям, выданным до миграции 006
+            (created_at + DELAY_MINUTES_CONFIRM_SPOT); нужно только в проходе при старте
+
+    Возвращает:
+        int: количество отмененных предложений
+    """
+    try:
+        async with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                if fill_missing_deadlines:
+                    await fill_missing_spot_confirmation_deadlines(cur, DELAY_MINUTES_CONFIRM_SPOT)
+                expired_rows = await expire_overdue_spot_confirmations(cur, datetime.now())
+
+        expired = [SpotConfirmationDTO(*row) for row in expired_rows]
+        if expired:
+            request_distribution({confirmation_data.assignment_date for confirmation_data in expired})
+        for confirmation_data in expired:
+            message_text = await to_user_about_time_confirmation_spent(confirmation_data)
+            await notify_user(confirmation_data.tg_user_id, message_text)
+
+        if expired:
+            logging.debug(f"Expired {len(expired)} spot confirmations")
+        return len(expired)
+
+    except psycopg2.Error as e:
+        logging.error(DATABASE_ERROR.format(e))
+        await send_log_notification(LogNotification.ERROR, DATABASE_ERROR.format(e))
+    except Exception as e:
+        logging.error(CONFIRMATION_SWEEP_ERROR.format(e))
+        await send_log_notification(LogNotification.ERROR, CONFIRMATION_SWEEP_ERROR.format(e))
+    return 0
@@ -16,28 +16,48 @@ from app.data.repository.users_repository import increment_user_rating
 from app.log_text import SPOT_CONFIRMATION_PROCESSING_ERROR, SPOT_CANCEL_PROCESSING_ERROR, DATABASE_ERROR
 
 
-async def process_spot_confirmation(confirmation_data) -> bool:
-    """Обрабатывает подтверждение места"""
-    spot_number = confirmation_data.spot_number
-    assignment_date = confirmation_data.assignment_date
+async def process_spot_confirmation(cur, confirmation_data) -> bool:
+    """
+    Обрабатывает подтверждение места в транзакции вызывающего кода.
+
+    Курсор передает обработчик нажатия: поиск предложения, смена статусов и деактивация
+    предложения идут в одном соединении и одной транзакции. Commit - за вызывающим кодом,
+    владельцу места после commit пишет notify_release_owner.
+    """
     request_id = confirmation_data.request_id
     release_id = confirmation_data.release_id
     db_user_id = confirmation_data.db_user_id
 
     try:
-        with get_db_connection() as conn:
+        await update_parking_releases(cur, db_user_id, release_id, ParkingReleaseStatus.ACCEPTED)
+        await update_request_status(cur, request_id, ParkingRequestStatus.ACCEPTED)
+        await increment_user_rating(cur, db_user_id)
+        await deactivate_spot_confirmations_by_user(cur, db_user_id)
+        return True
+
+    except psycopg2.Error as e:
+        logging.error(DATABASE_ERROR.format(e))
+        await send_log_notification(LogNotification.ERROR, DATABASE_ERROR.format(e))
+        return False
+    except Exception as e:
+        logging.error(SPOT_CONFIRMATION_PROCESSING_ERROR.format(e))
+        await send_log_notification(LogNotification.ERROR, SPOT_CONFIRMATION_PROCESSING_ERROR.format(e))
+        return False
+
+
+async def notify_release_owner(confirmation_data):
+    """Сообщает владельцу, что его освобожденное место заняли; вызывать после commit подтверждения"""
+    try:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
-                await update_parking_releases(cur, db_user_id, release_id, ParkingReleaseStatus.ACCEPTED)
-                await update_request_status(cur, request_id, ParkingRequestStatus.ACCEPTED)
-                await increment_user_rating(cur, db_user_id)
+                release_owner = await get_release_owner(cur, confirmation_data.release_id)
 
-                release_owner = await get_release_owner(cur, release_id)
-                if release_owner:
-                    release_user_id, release_tg_id = release_owner
-                    message_text = await to_owner_message(release_tg_id, spot_number, assignment_date)
-                    await notify_user(release_tg_id, message_text)
-                conn.commit()
-                return True
+        # Упоминание может потребовать свое соединение: уведомляем владельца, вернув текущее в пул
+        if release_owner:
+            release_user_id, release_tg_id = release_owner
+            message_text = await to_owner_message(release_tg_id, confirmation_data.spot_number,
+                                                  confirmation_data.assignment_date)
+            await notify_user(release_tg_id, message_text)
 
     except psycopg2.Error as e:
         logging.error(DATABASE_ERROR.format(e))
@@ -45,23 +65,19 @@ async def process_spot_confirmation(confirmation_data) -> bool:
     except Exception as e:
         logging.error(SPOT_CONFIRMATION_PROCESSING_ERROR.format(e))
         await send_log_notification(LogNotification.ERROR, SPOT_CONFIRMATION_PROCESSING_ERROR.format(e))
-        return False
 
 
-async def process_spot_cancel(confirmation_data) -> bool:
-    """Обрабатывает отмену места"""
+async def process_spot_cancel(cur, confirmation_data) -> bool:
+    """Обрабатывает отказ от места в транзакции вызывающего кода (см. process_spot_confirmation)"""
     request_id = confirmation_data.request_id
     release_id = confirmation_data.release_id
     db_user_id = confirmation_data.db_user_id
 
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                await update_parking_releases(cur, db_user_id, release_id, ParkingReleaseStatus.PENDING)
-                await update_request_status(cur, request_id, ParkingRequestStatus.CANCELED)
-                await deactivate_spot_confirmations_by_user(cur, db_user_id)
-                conn.commit()
-                return True
+        await update_parking_releases(cur, db_user_id, release_id, ParkingReleaseStatus.PENDING)
+        await update_request_status(cur, request_id, ParkingRequestStatus.CANCELED)
+        await deactivate_spot_confirmations_by_user(cur, db_user_id)
+        return True
 
     except psycopg2.Error as e:
         logging.error(DATABASE_ERROR.format(e))
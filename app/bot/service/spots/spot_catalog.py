@@ -0,0 +1,65 @@
+import logging
+
+from app.data.init_db import get_db_connection
+from app.data.repository.parking_spots_repository import get_all_spots
+from app.log_text import SPOT_CATALOG_REFRESH_ERROR
+
+
+class SpotCatalog:
+    """
+    Справочник парковочных мест в памяти: номер места -> этаж и признак активности.
+
+    Загружается одним запросом при старте и периодически перечитывается планировщиком.
+    Проверка номера места превращается в поиск по множеству без обращения к базе.
+    """
+
+    def __init__(self):
+        self._floors = {}
+        self._active_spot_ids = frozenset()
+
+    async def refresh(self):
+        """Перечитывает справочник из базы и подменяет его целиком"""
+        async with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                rows = await get_all_spots(cur)
+        self._floors = {spot_id: floor_number for spot_id, floor_number, _ in rows}
+        self._active_spot_ids = frozenset(spot_id for spot_id, _, is_active in rows if is_active)
+        return len(rows)
+
+    @property
+    def active_spot_ids(self) -> frozenset:
+        return self._active_spot_ids
+
+    def is_active(self, spot_id: int) -> bool:
+        return spot_id in self._active_spot_ids
+
+    def floor(self, spot_id: int):
+        """Возвращает этаж места или None, если такого места нет"""
+        return self._floors.get(spot_id)
+
+
+_catalog = None
+
+
+async def init_spot_catalog() -> SpotCatalog:
+    """Создает глобальный справочник мест и загружает его из базы"""
+    global _catalog
+    if _catalog is None:
+        _catalog = SpotCatalog()
+    await _catalog.refresh()
+    return _catalog
+
+
+def get_spot_catalog() -> SpotCatalog:
+    """Возвращает глобальный справочник мест"""
+    if _catalog is None:
+        raise RuntimeError("Spot catalog not initialized. Call init_spot_catalog first.")
+    return _catalog
+
+
+async def refresh_spot_catalog():
+    """Задача планировщика: перечитывает справочник мест, при ошибке оставляет прежний"""
+    try:
+        await get_spot_catalog().refresh()
+    except Exception as e:
+        logging.error(SPOT_CATALOG_REFRESH_ERROR.format(e))
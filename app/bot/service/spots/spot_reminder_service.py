@@ -1,39 +1,72 @@
+import asyncio
 import logging
 from datetime import date, timedelta
 
 import psycopg2
+from aiogram.exceptions import TelegramForbiddenError
 
+from app.bot.config import NOTIFICATION_CONCURRENCY
 from app.bot.constants.log_types import LogNotification
+from app.bot.constants.message_priority import MessagePriority
+from app.bot.keyboard_markup import return_markup
 from app.bot.notification.log_notification import send_log_notification
 from app.bot.notification.messages.to_remind_user_of_spot import to_remind_user_of_spot
-from app.bot.notification.notify_user import notify_user
+from app.bot.notification.outbound_queue import get_outbound_queue
 from app.data.init_db import get_db_connection
 from app.data.models.parking_reminder_dto import ParkingReminder
 from app.data.repository.parking_releases_repository import get_tomorrow_accepted_spot
-from app.log_text import SPOT_REMINDER_ERROR, DATABASE_ERROR
+from app.log_text import SPOT_REMINDER_ERROR, DATABASE_ERROR, SPOT_REMINDER_SUMMARY, SPOT_REMINDER_SEND_ERROR
 
 
 async def spot_reminder():
     """
         Асинхронная функция для отправки напоминаний пользователям о парковочных местах на завтра.
+
+        Соединение с базой возвращается в пул сразу после выборки получателей, напоминания
+        рассылаются параллельно (не больше NOTIFICATION_CONCURRENCY одновременно), а итог
+        (отправлено / бот заблокирован / ошибка) пишется одной записью в лог.
     """
     try:
         tomorrow = date.today() + timedelta(days=1)
-        with get_db_connection() as conn:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
                 results = await get_tomorrow_accepted_spot(cur, tomorrow)
 
-                current_spots_releases = [ParkingReminder(spot_id=row[0], user_tg_id=row[1])
-                                          for row in results]
+        current_spots_releases = [ParkingReminder(spot_id=row[0], user_tg_id=row[1])
+                                  for row in results]
+        if not current_spots_releases:
+            return
+
+        semaphore = asyncio.Semaphore(NOTIFICATION_CONCURRENCY)
+        outcomes = await asyncio.gather(*(_send_reminder(spot, semaphore) for spot in current_spots_releases))
 
-                if len(current_spots_releases) > 0:
-                    for spot in current_spots_releases:
-                        message_text = await to_remind_user_of_spot(spot.spot_id)
-                        await notify_user(spot.user_tg_id, message_text)
+        summary = SPOT_REMINDER_SUMMARY.format(tomorrow.strftime('%d.%m.%Y'), outcomes.count("sent"),
+                                               outcomes.count("blocked"), outcomes.count("failed"))
+        logging.warning(summary)
+        await send_log_notification(LogNotification.INFO, summary)
 
     except psycopg2.Error as e:
         logging.error(DATABASE_ERROR.format(e))
         await send_log_notification(LogNotification.ERROR, DATABASE_ERROR.format(e))
     except Exception as e:
         logging.error(SPOT_REMINDER_ERROR.format(e))
-        await send_log_notification(LogNotification.ERROR, SPOT_REMINDER_ERROR.format(e))
\ No newline at end of file
+        await send_log_notification(LogNotification.ERROR, SPOT_REMINDER_ERROR.format(e))
+
+
+async def _send_reminder(spot: ParkingReminder, semaphore: asyncio.Semaphore) -> str:
+    """Отправляет одно напоминание и возвращает исход: sent, blocked или failed"""
+    async with semaphore:
+        message_text = await to_remind_user_of_spot(spot.spot_id)
+        try:
+            await get_outbound_queue().send(
+                spot.user_tg_id,
+                message_text,
+                MessagePriority.REMINDER,
+                reply_markup=return_markup
+            )
+            return "sent"
+        except TelegramForbiddenError:
+            return "blocked"
+        except Exception as e:
+            logging.error(SPOT_REMINDER_SEND_ERROR.format(spot.user_tg_id, e))
+            return "failed"
@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime
 
 import psycopg2
 from aiogram.types import CallbackQuery
@@ -12,17 +13,18 @@ from app.data.init_db import get_db_connection
 from app.data.repository.spot_confirmations_repository import find_spot_confirmations_by_user, \
     deactivate_spot_confirmations_by_user
 from app.log_text import SPOT_TAKING_ERROR, DB_USER_ID_GET_ERROR, DATABASE_ERROR
-from app.schedule.schedule_utils import cancel_scheduled_cancellation
-from app.bot.service.distribution_service import distribute_parking_spots
-from app.bot.service.spots.process_confirmation_spot_service import process_spot_confirmation
+from app.bot.service.distribution_worker import request_distribution
+from app.bot.service.spots.process_confirmation_spot_service import process_spot_confirmation, \
+    notify_release_owner
 
 
 async def take_spot(query: CallbackQuery):
     """Подтверждает занятие парковочного места пользователем."""
     tg_user_id = query.from_user.id
+    affected_dates = None
 
     try:
-        with get_db_connection() as conn:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
                 db_user_id = await get_db_user_id(cur, tg_user_id)
 
@@ -31,7 +33,12 @@ async def take_spot(query: CallbackQuery):
                     await send_log_notification(LogNotification.ERROR, DB_USER_ID_GET_ERROR.format(tg_user_id))
                     return None
                 
-                result = await find_spot_confirmations_by_user(cur, db_user_id)
+                result = await find_spot_confirmations_by_user(cur, db_user_id, datetime.now())
+                if not result:
+                    logging.warning(f"❌ No confirmation data found for user {tg_user_id}")
+                    await query.message.edit_text("❌ Данные о месте устарели.")
+                    return
+
                 spot_confirmations = SpotConfirmationDTO(db_user_id=result[0],
                                                          tg_user_id=result[1],
                                                          spot_number=result[2],
@@ -39,38 +46,33 @@ async def take_spot(query: CallbackQuery):
                                                          release_id=result[4],
                                                          request_id=result[5])
 
-                if not spot_confirmations:
-                    logging.warning(f"❌ No confirmation data found for user {tg_user_id}")
-                    await query.message.edit_text("❌ Данные о месте устарели.")
-                    return
-
-                logging.debug(
-                    f"Attempting to cancel scheduled auto-cancellation for "
-                    f"spot №{spot_confirmations.spot_number}, user {tg_user_id}"
-                )
-                await cancel_scheduled_cancellation(spot_confirmations)
+                affected_dates = {spot_confirmations.assignment_date}
 
                 logging.debug(
                     f"Processing confirmation for user {tg_user_id}, spot №{spot_confirmations.spot_number}"
                 )
-                success = await process_spot_confirmation(spot_confirmations)
-
-                if success:
-                    await query.message.edit_text(
-                        f"✅ Вы успешно заняли место №{spot_confirmations.spot_number} "
-                        f"на {spot_confirmations.assignment_date.strftime('%d.%m.%Y')}",
-                        reply_markup=return_markup
-                    )
-                else:
-                    logging.warning(f"Spot #{spot_confirmations.spot_number} already taken (user {tg_user_id})")
-                    await send_log_notification(LogNotification.WARN,
-                                                f"Spot #{spot_confirmations.spot_number} already taken (user {tg_user_id})")
-                    await query.message.edit_text(
-                        "❌ Не удалось занять место. Возможно, оно уже занято.",
-                        reply_markup=return_markup
-                    )
+                # Поиск, смена статусов и деактивация предложения - одна транзакция в одном соединении
+                success = await process_spot_confirmation(cur, spot_confirmations)
+                if not success:
+                    # Частичные изменения откатываем, предложение все равно закрываем
+                    await conn.rollback()
+                    await deactivate_spot_confirmations_by_user(cur, db_user_id)
 
-                await deactivate_spot_confirmations_by_user(cur, db_user_id)
+        if success:
+            await query.message.edit_text(
+                f"✅ Вы успешно заняли место №{spot_confirmations.spot_number} "
+                f"на {spot_confirmations.assignment_date.strftime('%d.%m.%Y')}",
+                reply_markup=return_markup
+            )
+            await notify_release_owner(spot_confirmations)
+        else:
+            logging.warning(f"Spot #{spot_confirmations.spot_number} already taken (user {tg_user_id})")
+            await send_log_notification(LogNotification.WARN,
+                                        f"Spot #{spot_confirmations.spot_number} already taken (user {tg_user_id})")
+            await query.message.edit_text(
+                "❌ Не удалось занять место. Возможно, оно уже занято.",
+                reply_markup=return_markup
+            )
     except psycopg2.Error as e:
         logging.error(DATABASE_ERROR.format(e))
         await send_log_notification(LogNotification.ERROR, DATABASE_ERROR.format(e))
@@ -83,5 +85,7 @@ async def take_spot(query: CallbackQuery):
         )
 
     finally:
-        logging.debug(f"Triggering distribution after user {tg_user_id} action")
-        await distribute_parking_spots()
+        # Без затронутой даты ничего не записано: полный проход остается за плановым full_distribution_sweep
+        if affected_dates is not None:
+            logging.debug(f"Triggering distribution after user {tg_user_id} action")
+            request_distribution(affected_dates)
@@ -1,5 +1,5 @@
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 import psycopg2
 from aiogram.types import CallbackQuery
@@ -12,20 +12,20 @@ from app.bot.notification.daily_statistics_notification import daily_statistics_
 from app.bot.notification.log_notification import send_log_notification
 from app.bot.notification.send_user_statistics import send_user_statistics
 from app.bot.notification.weeky_statistics_notification import weekly_statistics_notification
-from app.bot.service.user_service import get_db_user_id
-from app.bot.users.get_user_full_mention import get_user_full_mention
+from app.bot.service.bookings_service import get_user_bookings
+from app.bot.users.get_user_full_mention import resolve_user_mentions
 from app.data.init_db import get_db_connection
-from app.data.models.releases.parking_releases import ParkingReleaseStatus, ParkingRelease
-from app.data.models.requests.parking_requests import ParkingRequestStatus, ParkingRequest
 from app.data.models.parking_transfers_dto import ParkingTransfer
-from app.data.repository.parking_releases_repository import free_parking_releases_by_date, \
-    parking_releases_by_week, current_spots_releases_by_user
-from app.data.repository.parking_requests_repository import parking_requests_by_week, \
-    all_parking_requests_by_status_and_user, current_spots_request_by_user
-from app.data.repository.statistics_repository import get_parking_transfers_by_date, get_parking_transfers_by_week
+from app.data.repository.statistics_repository import get_parking_transfers_by_date, get_parking_transfers_by_week, \
+    refresh_daily_parking_stats, get_parking_stats_totals
 from app.log_text import USER_STATISTICS_ERROR, WEEKLY_STATISTICS_SERVICE_ERROR, DAILY_STATISTICS_SERVICE_ERROR, \
     DB_USER_ID_GET_ERROR, DATABASE_ERROR
 
+# (понедельник, пятница) -> текст недельной статистики
+weekly_report_cache = {}
+# Растет при каждом сбросе кэша: отчет, собранный во время сброса, не сохраняется
+_weekly_report_generation = 0
+
 
 async def daily_statistics_service(plus_day=0):
     """
@@ -33,35 +33,39 @@ async def daily_statistics_service(plus_day=0):
     """
     try:
         day = datetime.today() + timedelta(days=plus_day)
-        with get_db_connection() as conn:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
-                free_parking_releases = await free_parking_releases_by_date(cur, day.date())
-                free_spots = len(free_parking_releases)
+                await refresh_daily_parking_stats(cur, day.date(), day.date())
+                free_spots, *_ = await get_parking_stats_totals(cur, day.date(), day.date())
 
                 results = await get_parking_transfers_by_date(cur, day.date())
                 transfers = [ParkingTransfer(spot_id=row[0], recipient_tg_id=row[1], owner_tg_id=row[2])
                              for row in results]
 
-                message_text = f"\nСвободных мест всего: <b>{free_spots}</b>\n"
-                if len(transfers) > 0:
-                    message_text += "\n<b>Трансферы мест:</b>\n"
-                    for transfer in transfers:
-                        emoji = get_random_car_emoji()
-                        recipient = await get_user_full_mention(transfer.recipient_tg_id)
-                        owner = await get_user_full_mention(transfer.owner_tg_id)
-                        spot = transfer.spot_id
-                        message_text += f"{emoji} {owner} отдал место <b>№{spot}</b> -> {recipient}\n\n"
-
-                    await daily_statistics_notification(tg_chat_id=GROUP_ID, message=message_text,
-                                                        assignment_date=day.date(), is_pinned=True)
-                    await daily_statistics_notification(tg_chat_id=LOGS_CHANNEL_ID, message=message_text,
-                                                        assignment_date=day.date())
-                else:
-                    message_text += "👀Трансферов мест пока не было..."
-                    await daily_statistics_notification(tg_chat_id=GROUP_ID, message=message_text,
-                                                        assignment_date=day.date(), is_pinned=True)
-                    await daily_statistics_notification(tg_chat_id=LOGS_CHANNEL_ID, message=message_text,
-                                                        assignment_date=day.date())
+        message_text = f"\nСвободных мест всего: <b>{free_spots}</b>\n"
+        if len(transfers) > 0:
+            message_text += "\n<b>Трансферы мест:</b>\n"
+            mentions = await resolve_user_mentions(
+                [transfer.recipient_tg_id for transfer in transfers] +
+                [transfer.owner_tg_id for transfer in transfers]
+            )
+            for transfer in transfers:
+                emoji = get_random_car_emoji()
+                recipient = mentions[transfer.recipient_tg_id]
+                owner = mentions[transfer.owner_tg_id]
+                spot = transfer.spot_id
+                message_text += f"{emoji} {owner} отдал место <b>№{spot}</b> -> {recipient}\n\n"
+
+            await daily_statistics_notification(tg_chat_id=GROUP_ID, message=message_text,
+                                                assignment_date=day.date(), is_pinned=True)
+            await daily_statistics_notification(tg_chat_id=LOGS_CHANNEL_ID, message=message_text,
+                                                assignment_date=day.date())
+        else:
+            message_text += "👀Трансферов мест пока не было..."
+            await daily_statistics_notification(tg_chat_id=GROUP_ID, message=message_text,
+                                                assignment_date=day.date(), is_pinned=True)
+            await daily_statistics_notification(tg_chat_id=LOGS_CHANNEL_ID, message=message_text,
+                                                assignment_date=day.date())
     except psycopg2.Error as e:
         logging.error(DATABASE_ERROR.format(e))
         await send_log_notification(LogNotification.ERROR, DATABASE_ERROR.format(e))
@@ -70,56 +74,94 @@ async def daily_statistics_service(plus_day=0):
         await send_log_notification(LogNotification.ERROR, DAILY_STATISTICS_SERVICE_ERROR.format(e))
 
 
-async def weekly_statistics_service():
-    """
-        Асинхронная служба для формирования и отправки еженедельной статистики по парковочным местам.
+def current_week():
+    """Возвращает (понедельник, пятница) текущей недели"""
+    today = date.today()
+    monday_date = today - timedelta(days=today.weekday())
+    return monday_date, monday_date + timedelta(days=4)
+
+
+def invalidate_weekly_reports(dates=None):
     """
-    try:
-        today = datetime.now()
-        monday_date = today - timedelta(days=today.weekday())
-        friday_date = monday_date + timedelta(days=4)
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                accepted_parking_releases = await parking_releases_by_week(cur, ParkingReleaseStatus.ACCEPTED.name,
-                                                                           monday_date.date(), friday_date.date())
-                accepted_spots_count = len(accepted_parking_releases)
+    Сбрасывает закэшированные недельные отчеты.
 
-                not_found_parking_requests = await parking_requests_by_week(cur, ParkingRequestStatus.NOT_FOUND.name,
-                                                                            monday_date.date(), friday_date.date())
-                not_found_spots_count = len(not_found_parking_requests)
+    Параметры:
+        dates: даты, статусы на которые изменились; None - сбросить все отчеты, кроме недель,
+               уже зафиксированных ночным проходом
+    """
+    global _weekly_report_generation
+    _weekly_report_generation += 1
+    if dates is None:
+        finalized_before = date.today() - timedelta(days=1)
+        for key in [key for key in weekly_report_cache if key[1] >= finalized_before]:
+            del weekly_report_cache[key]
+        return
+    for changed_date in dates:
+        monday_date = changed_date - timedelta(days=changed_date.weekday())
+        weekly_report_cache.pop((monday_date, monday_date + timedelta(days=4)), None)
+
+
+async def get_weekly_report(monday_date, friday_date) -> str:
+    """
+    Возвращает текст недельной статистики, при необходимости формируя его.
 
-                canceled_parking_requests = await parking_requests_by_week(cur, ParkingRequestStatus.CANCELED.name,
-                                                                           monday_date.date(), friday_date.date())
-                canceled_spots_count = len(canceled_parking_requests)
+    Отчет кэшируется по (понедельник, пятница) до изменения статусов на этой неделе
+    (см. invalidate_weekly_reports). Недели, зафиксированные ночным проходом, больше не меняются,
+    поэтому их отчеты живут в кэше бессрочно.
+    """
+    key = (monday_date, friday_date)
+    message_text = weekly_report_cache.get(key)
+    if message_text is not None:
+        return message_text
+
+    generation = _weekly_report_generation
+    async with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            # Зафиксированные ночным проходом дни не пересчитываются - неделя читается из 5 строк сводки
+            await refresh_daily_parking_stats(cur, monday_date, friday_date)
+            _, accepted_spots_count, not_found_spots_count, canceled_spots_count, _ = \
+                await get_parking_stats_totals(cur, monday_date, friday_date)
+
+            results = await get_parking_transfers_by_week(cur, monday_date, friday_date)
+            transfers = [ParkingTransfer(spot_id=row[0], recipient_tg_id=row[1], owner_tg_id=row[2])
+                         for row in results]
+
+    message_text = (f"\n✅ Реализовано мест всего: <b>{accepted_spots_count}</b>\n"
+                    f"🤷‍♂️ Не найдено мест по запросу: <b>{not_found_spots_count}</b>\n"
+                    f"❌ Отклонено мест: <b>{canceled_spots_count}</b>\n")
+    if len(transfers) > 0:
+        message_text += "\n<b>Трансферы мест:</b>\n"
+        mentions = await resolve_user_mentions(
+            [transfer.recipient_tg_id for transfer in transfers] +
+            [transfer.owner_tg_id for transfer in transfers]
+        )
+        for transfer in transfers:
+            emoji = get_random_car_emoji()
+            recipient = mentions[transfer.recipient_tg_id]
+            owner = mentions[transfer.owner_tg_id]
+            spot = transfer.spot_id
+            message_text += f"{emoji} {owner} отдал место <b>№{spot}</b> -> {recipient}\n\n"
+    else:
+        message_text += "👀Трансферов мест пока не было..."
+
+    if generation == _weekly_report_generation:
+        weekly_report_cache[key] = message_text
+    return message_text
 
-                results = await get_parking_transfers_by_week(cur, monday_date.date(), friday_date.date())
-                transfers = [ParkingTransfer(spot_id=row[0], recipient_tg_id=row[1], owner_tg_id=row[2])
-                             for row in results]
 
-                message_text = (f"\n✅ Реализовано мест всего: <b>{accepted_spots_count}</b>\n"
-                                f"🤷‍♂️ Не найдено мест по запросу: <b>{not_found_spots_count}</b>\n"
-                                f"❌ Отклонено мест: <b>{canceled_spots_count}</b>\n")
-                if len(transfers) > 0:
-                    message_text += "\n<b>Трансферы мест:</b>\n"
-                    for transfer in transfers:
-                        emoji = get_random_car_emoji()
-                        recipient = await get_user_full_mention(transfer.recipient_tg_id)
-                        owner = await get_user_full_mention(transfer.owner_tg_id)
-                        spot = transfer.spot_id
-                        message_text += f"{emoji} {owner} отдал место <b>№{spot}</b> -> {recipient}\n\n"
-
-                    await weekly_statistics_notification(tg_chat_id=GROUP_ID, message=message_text,
-                                                         monday_date=monday_date.date(), friday_date=friday_date.date(),
-                                                         is_pinned=True)
-                    await weekly_statistics_notification(tg_chat_id=LOGS_CHANNEL_ID, message=message_text,
-                                                         monday_date=monday_date.date(), friday_date=friday_date.date())
-                else:
-                    message_text += "👀Трансферов мест пока не было..."
-                    await weekly_statistics_notification(tg_chat_id=GROUP_ID, message=message_text,
-                                                         monday_date=monday_date.date(), friday_date=friday_date.date(),
-                                                         is_pinned=True)
-                    await weekly_statistics_notification(tg_chat_id=LOGS_CHANNEL_ID, message=message_text,
-                                                         monday_date=monday_date.date(), friday_date=friday_date.date())
+async def weekly_statistics_service():
+    """
+        Асинхронная служба для формирования и отправки еженедельной статистики по парковочным местам.
+    """
+    try:
+        monday_date, friday_date = current_week()
+        message_text = await get_weekly_report(monday_date, friday_date)
+
+        await weekly_statistics_notification(tg_chat_id=GROUP_ID, message=message_text,
+                                             monday_date=monday_date, friday_date=friday_date,
+                                             is_pinned=True)
+        await weekly_statistics_notification(tg_chat_id=LOGS_CHANNEL_ID, message=message_text,
+                                             monday_date=monday_date, friday_date=friday_date)
     except psycopg2.Error as e:
         logging.error(DATABASE_ERROR.format(e))
         await send_log_notification(LogNotification.ERROR, DATABASE_ERROR.format(e))
@@ -133,65 +175,39 @@ async def my_statistics(query: CallbackQuery):
         Асинхронная служба для формирования и отправки статистики пользователю по парковочным местам.
     """
     try:
-        today = datetime.now()
         tg_user_id = query.from_user.id
 
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                db_user_id = await get_db_user_id(cur, tg_user_id)
-
-                if not db_user_id:
-                    logging.error(DB_USER_ID_GET_ERROR.format(tg_user_id))
-                    await send_log_notification(LogNotification.ERROR, DB_USER_ID_GET_ERROR.format(tg_user_id))
-                    return None
-
-                not_found_spots = await all_parking_requests_by_status_and_user(cur, ParkingRequestStatus.NOT_FOUND.name,
-                                                                                db_user_id)
-                not_found_spots_count = len(not_found_spots)
-
-                canceled_parking_requests = await all_parking_requests_by_status_and_user(cur,
-                                                                                          ParkingRequestStatus.CANCELED.name,
-                                                                                          db_user_id)
-                canceled_spots_count = len(canceled_parking_requests)
-
-                accepted_parking_requests = await all_parking_requests_by_status_and_user(cur,
-                                                                                          ParkingRequestStatus.ACCEPTED.name,
-                                                                                          db_user_id)
-                accepted_spots_count = len(accepted_parking_requests)
-
-                results = await current_spots_request_by_user(cur, db_user_id, today.date())
-                current_spots_request = [ParkingRequest(status=row[0], request_date=row[1])
-                                         for row in results]
-
-                results = await current_spots_releases_by_user(cur, db_user_id, today.date())
-                current_spots_releases = [ParkingRelease(spot_id=row[0], status=row[1], release_date=row[2])
-                                          for row in results]
-
-                message_text = (f"<b>Ваша статистика за всё время:</b>\n"
-                                f"┌ ✅ Успешные бронирования: <b>{accepted_spots_count}</b>\n"
-                                f"├ 🤷 Не нашлось мест по запросу: <b>{not_found_spots_count}</b>\n"
-                                f"└ ❌ Отменённые запросы: <b>{canceled_spots_count}</b>\n")
-
-                if len(current_spots_request) > 0:
-                    message_text += "\n<b>Ваши актуальные запросы на парковочные места:</b>\n"
-                    for current_spot in current_spots_request:
-                        emoji_status = await get_request_emoji_status(current_spot.status)
-                        message_text += (f"📅 Дата: {current_spot.request_date.strftime('%d.%m.%Y')}\n"
-                                         f"{emoji_status} Статус: {current_spot.status.display_name}\n\n")
-                else:
-                    message_text += "\nУ вас пока что нет актуальных запросов на парковочные места\n"
-
-                if len(current_spots_releases) > 0:
-                    message_text += "\n<b>Ваши актуальные освобожденные парковочные места:</b>\n"
-                    for current_spot in current_spots_releases:
-                        emoji_status = await get_release_emoji_status(current_spot.status)
-                        message_text += (f"📅 Дата: {current_spot.release_date.strftime('%d.%m.%Y')}\n"
-                                         f"📍 Место: №{current_spot.spot_id}\n"
-                                         f"{emoji_status} Статус: {current_spot.status.display_name}\n\n")
-                else:
-                    message_text += "\nУ вас пока что нет актуальных освобожденных парковочных мест\n"
-
-                await send_user_statistics(query, message_text)
+        bookings = await get_user_bookings(tg_user_id)
+        if bookings is None:
+            logging.error(DB_USER_ID_GET_ERROR.format(tg_user_id))
+            await send_log_notification(LogNotification.ERROR, DB_USER_ID_GET_ERROR.format(tg_user_id))
+            return None
+
+        message_text = (f"<b>Ваша статистика за всё время:</b>\n"
+                        f"┌ ✅ Успешные бронирования: <b>{bookings.accepted_count}</b>\n"
+                        f"├ 🤷 Не нашлось мест по запросу: <b>{bookings.not_found_count}</b>\n"
+                        f"└ ❌ Отменённые запросы: <b>{bookings.canceled_count}</b>\n")
+
+        if len(bookings.requests) > 0:
+            message_text += "\n<b>Ваши актуальные запросы на парковочные места:</b>\n"
+            for current_spot in reversed(bookings.requests):
+                emoji_status = await get_request_emoji_status(current_spot.status)
+                message_text += (f"📅 Дата: {current_spot.request_date.strftime('%d.%m.%Y')}\n"
+                                 f"{emoji_status} Статус: {current_spot.status.display_name}\n\n")
+        else:
+            message_text += "\nУ вас пока что нет актуальных запросов на парковочные места\n"
+
+        if len(bookings.releases) > 0:
+            message_text += "\n<b>Ваши актуальные освобожденные парковочные места:</b>\n"
+            for current_spot in reversed(bookings.releases):
+                emoji_status = await get_release_emoji_status(current_spot.status)
+                message_text += (f"📅 Дата: {current_spot.release_date.strftime('%d.%m.%Y')}\n"
+                                 f"📍 Место: №{current_spot.spot_id}\n"
+                                 f"{emoji_status} Статус: {current_spot.status.display_name}\n\n")
+        else:
+            message_text += "\nУ вас пока что нет актуальных освобожденных парковочных мест\n"
+
+        await send_user_statistics(query, message_text)
     except psycopg2.Error as e:
         logging.error(DATABASE_ERROR.format(e))
         await send_log_notification(LogNotification.ERROR, DATABASE_ERROR.format(e))
@@ -1,16 +1,54 @@
-from app.data.repository.users_repository import get_user_id_by_tg_id, decrement_user_rating
+from app.data.init_db import get_db_connection
+from app.data.repository.users_repository import get_user_id_by_tg_id, decrement_user_rating, get_all_user_ids, \
+    upsert_user_by_tg_id
+from app.utils.cache_util import InMemoryCache
+
+# tg_id -> user_id; соответствие не меняется, поэтому записи живут без TTL
+identity_cache = InMemoryCache()
+
+
+async def warm_identity_cache():
+    """Загружает соответствие tg_id -> user_id всех пользователей одним запросом"""
+    async with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            rows = await get_all_user_ids(cur)
+    await identity_cache.set_many({tg_id: user_id for tg_id, user_id in rows})
+    return len(rows)
 
 
 async def get_db_user_id(cur, tg_user_id):
+    user_id = await identity_cache.get(tg_user_id)
+    if user_id is not None:
+        return user_id
+
     user_record = await get_user_id_by_tg_id(cur, tg_user_id)
 
     if not user_record:
         return None
 
+    await identity_cache.set(tg_user_id, user_record[0])
     return user_record[0]
 
+
+async def register_db_user(tg_user_id):
+    """
+    Возвращает (user_id, inserted): идентификатор пользователя и признак того, что он только что создан.
+    Известных пользователей отдает из кэша без обращения к базе, остальных регистрирует одним upsert.
+    """
+    user_id = await identity_cache.get(tg_user_id)
+    if user_id is not None:
+        return user_id, False
+
+    async with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            user_id, inserted = await upsert_user_by_tg_id(cur, tg_user_id)
+    # Кэшируем только после коммита, чтобы не запомнить идентификатор откатившейся вставки
+    await identity_cache.set(tg_user_id, user_id)
+    return user_id, inserted
+
+
 async def decrement_user_rating_of_1(cur, db_user_id):
     result = await decrement_user_rating(cur, db_user_id)
     if not result:
         return False
-    return result[0] is not None
\ No newline at end of file
+    return result[0] is not None
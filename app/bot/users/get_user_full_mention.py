@@ -1,33 +1,104 @@
+import asyncio
 import logging
+from datetime import datetime, timedelta
 
-from app.bot.config import bot
+from app.bot.config import bot, MENTION_CACHE_TTL_SECONDS, MENTION_CACHE_MAX_SIZE, NOTIFICATION_CONCURRENCY
+from app.data.init_db import get_db_connection
+from app.data.repository.users_repository import get_user_names_by_tg_ids, update_user_names
 from app.log_text import USER_MENTION_ERROR
+from app.utils.cache_util import InMemoryCache
+
+mention_cache = InMemoryCache(max_size=MENTION_CACHE_MAX_SIZE, default_ttl=MENTION_CACHE_TTL_SECONDS)
+
+
+def _format_mention(user_id: int, first_name, last_name, username) -> str:
+    display_name = " ".join(name for name in (first_name, last_name) if name)
+
+    if display_name:
+        return f"<a href='tg://user?id={user_id}'>{display_name}</a>"
+
+    if username:
+        return f"<a href='tg://user?id={user_id}'>@{username}</a>"
+
+    return f"<a href='tg://user?id={user_id}'>пользователь #{user_id}</a>"
 
 
 async def get_user_full_mention(user_id: int) -> str:
     """
     Возвращает полное обращение с упоминанием (для кликабельных ссылок)
+
+    Идет тем же путем, что и resolve_user_mentions: кэш, сохраненные в users имена, Telegram.
+    Полученное из Telegram имя сохраняется в users, поэтому после рестарта не начинаем с нуля.
+    Вызывать вне блока get_db_connection: при промахе кэша берется свое соединение.
     """
     try:
-        user = await bot.get_chat(user_id)
+        return (await resolve_user_mentions((user_id,)))[user_id]
+    except Exception as e:
+        logging.error(USER_MENTION_ERROR.format(user_id, e))
+        return f"пользователь #{user_id}"
 
-        display_name = ""
-        if user.first_name:
-            display_name = user.first_name
-        if user.last_name:
-            if display_name:
-                display_name += f" {user.last_name}"
-            else:
-                display_name = user.last_name
 
-        if display_name:
-            return f"<a href='tg://user?id={user_id}'>{display_name}</a>"
+async def resolve_user_mentions(user_ids) -> dict:
+    """
+    Возвращает упоминания для набора пользователей Telegram одним пакетом.
 
-        if user.username:
-            return f"<a href='tg://user?id={user_id}'>@{user.username}</a>"
+    Параметры:
+        user_ids: идентификаторы пользователей в Telegram (повторы допускаются)
 
-        return f"<a href='tg://user?id={user_id}'>пользователь #{user_id}</a>"
+    Возвращает:
+        dict: tg_id -> упоминание
 
-    except Exception as e:
-        logging.error(USER_MENTION_ERROR.format(user_id, e))
-        return f"пользователь #{user_id}"
\ No newline at end of file
+    Логика:
+        - Сначала берет упоминания из кэша
+        - Промахи ищет в users одним запросом (имена, сохраненные не раньше TTL кэша)
+        - Оставшихся запрашивает у Telegram параллельно, не больше NOTIFICATION_CONCURRENCY одновременно
+        - Полученные из Telegram имена сохраняет в users одним запросом, чтобы после рестарта не начинать с нуля
+
+    Особенности:
+        - Ошибка получения одного пользователя не мешает остальным: для него вернется "пользователь #id",
+          такое упоминание не кэшируется
+    """
+    user_ids = set(user_ids)
+    mentions = await mention_cache.get_many(user_ids)
+    missing = user_ids - mentions.keys()
+    if not missing:
+        return mentions
+
+    updated_after = datetime.now() - timedelta(seconds=MENTION_CACHE_TTL_SECONDS)
+    async with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            stored = await get_user_names_by_tg_ids(cur, missing, updated_after)
+    stored_mentions = {row[0]: _format_mention(*row) for row in stored}
+    await mention_cache.set_many(stored_mentions)
+    mentions.update(stored_mentions)
+    missing -= stored_mentions.keys()
+    if not missing:
+        return mentions
+
+    semaphore = asyncio.Semaphore(NOTIFICATION_CONCURRENCY)
+
+    async def fetch(user_id):
+        async with semaphore:
+            try:
+                return user_id, await bot.get_chat(user_id)
+            except Exception as e:
+                logging.error(USER_MENTION_ERROR.format(user_id, e))
+                return user_id, None
+
+    fetched = [(user_id, chat) for user_id, chat in await asyncio.gather(*(fetch(user_id) for user_id in missing))
+               if chat is not None]
+    fetched_mentions = {user_id: _format_mention(user_id, chat.first_name, chat.last_name, chat.username)
+                        for user_id, chat in fetched}
+    await mention_cache.set_many(fetched_mentions)
+    mentions.update(fetched_mentions)
+    mentions.update({user_id: f"пользователь #{user_id}" for user_id in missing - fetched_mentions.keys()})
+
+    if fetched:
+        async with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                await update_user_names(cur,
+                                        [user_id for user_id, _ in fetched],
+                                        [chat.first_name for _, chat in fetched],
+                                        [chat.last_name for _, chat in fetched],
+                                        [chat.username for _, chat in fetched])
+    return mentions
@@ -1,24 +1,52 @@
+import logging
+
 from aiogram.enums import ChatMemberStatus
 
-from app.bot.config import bot
+from app.bot.config import bot, MEMBERSHIP_CACHE_POSITIVE_TTL_SECONDS, MEMBERSHIP_CACHE_NEGATIVE_TTL_SECONDS
+from app.log_text import CHAT_MEMBER_CHECK_ERROR
+from app.utils.cache_util import InMemoryCache
+
+VALID_MEMBER_STATUSES = (
+    ChatMemberStatus.MEMBER,
+    ChatMemberStatus.ADMINISTRATOR,
+    ChatMemberStatus.CREATOR
+)
+
+membership_cache = InMemoryCache(max_size=10000)
+
+
+async def remember_membership(user_tg_id: int, group_id: int, status) -> bool:
+    """
+    Запоминает членство пользователя в группе по его статусу.
+
+    Участник кэшируется на MEMBERSHIP_CACHE_POSITIVE_TTL_SECONDS, не участник - на
+    MEMBERSHIP_CACHE_NEGATIVE_TTL_SECONDS, чтобы только что вступивший пользователь
+    не ждал долго, даже если обновление chat_member до бота не дошло.
+    """
+    is_member = status in VALID_MEMBER_STATUSES
+    ttl = MEMBERSHIP_CACHE_POSITIVE_TTL_SECONDS if is_member else MEMBERSHIP_CACHE_NEGATIVE_TTL_SECONDS
+    await membership_cache.set((group_id, user_tg_id), is_member, ttl)
+    return is_member
 
 
 async def is_user_in_chat(user_tg_id: int, group_id: int) -> bool:
     """
     Проверяет, является ли пользователь участником канала/группы
+
+    Результат берется из кэша, который обновляется обработчиком chat_member;
+    к Telegram обращаемся только при промахе.
     """
+    is_member = await membership_cache.get((group_id, user_tg_id))
+    if is_member is not None:
+        return is_member
+
     try:
         member = await bot.get_chat_member(
             chat_id=group_id,
             user_id=user_tg_id
         )
-        valid_statuses = [
-            ChatMemberStatus.MEMBER,
-            ChatMemberStatus.ADMINISTRATOR,
-            ChatMemberStatus.CREATOR
-        ]
-        return member.status in valid_statuses
+        return await remember_membership(user_tg_id, group_id, member.status)
 
     except Exception as e:
-        print(f"Ошибка при проверке участника: {e}")
-        return False
\ No newline at end of file
+        logging.error(CHAT_MEMBER_CHECK_ERROR.format(user_tg_id, group_id, e))
+        return False
@@ -9,4 +9,18 @@ DATABASE_CONFIG = {
     "port": int(os.environ.get("DB_PORT")),
     "user": os.environ.get("DB_USER"),
     "password": os.environ.get("DB_PASSWORD"),
-}
\ No newline at end of file
+}
+
+DB_POOL_CONFIG = {
+    "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+    "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+    # Соединения, простаивающие дольше max_idle секунд, закрываются (сверх min_size)
+    "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", 300)),
+    # Соединения старше max_lifetime секунд пересоздаются
+    "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", 3600)),
+    # Перед выдачей соединения, простаивавшего дольше этого времени, выполняется SELECT 1
+    "health_check_after": float(os.environ.get("DB_POOL_HEALTH_CHECK_AFTER", 30)),
+    "acquire_timeout": float(os.environ.get("DB_POOL_ACQUIRE_TIMEOUT", 10)),
+    # thread - запросы psycopg2 выполняются в пуле потоков, inline - прямо в event loop
+    "execution_mode": os.environ.get("DB_EXECUTION_MODE", "thread"),
+}
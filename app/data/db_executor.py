@@ -0,0 +1,94 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from functools import partial
+
+
+class DbExecutionMode(Enum):
+    THREAD = "thread"
+    INLINE = "inline"
+
+
+class DatabaseExecutor:
+    """
+    Выполняет блокирующие вызовы psycopg2.
+
+    В режиме THREAD вызовы уходят в ограниченный пул потоков, и event loop продолжает обслуживать
+    другие апдейты, пока идет запрос. Режим INLINE выполняет вызовы прямо в event loop
+    (прежнее поведение, оставлено для сравнения в бенчмарках).
+
+    round_trips считает все вызовы к серверу (подключения, запросы, commit/rollback).
+    """
+
+    def __init__(self, mode: DbExecutionMode = DbExecutionMode.THREAD, max_workers: int = 10):
+        self.mode = mode
+        self.round_trips = 0
+        self._thread_pool = None
+        if mode == DbExecutionMode.THREAD:
+            self._thread_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+
+    async def run(self, func, *args, **kwargs):
+        self.round_trips += 1
+        if self._thread_pool is None:
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._thread_pool, partial(func, *args, **kwargs))
+
+    def shutdown(self):
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False)
+
+
+class AsyncCursor:
+    """
+    Асинхронная обертка над курсором psycopg2 с интерфейсом async-драйвера:
+    await cur.execute(...), await cur.fetchone(), await cur.fetchall().
+    """
+
+    def __init__(self, cursor, executor: DatabaseExecutor):
+        self._cursor = cursor
+        self._executor = executor
+
+    async def execute(self, query, params=None):
+        await self._executor.run(self._cursor.execute, query, params)
+
+    async def fetchone(self):
+        # Клиентский курсор psycopg2 получает весь результат в execute, выборка идет из памяти
+        return self._cursor.fetchone()
+
+    async def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncConnection:
+    """Асинхронная обертка над соединением psycopg2, выдаваемая пулом"""
+
+    def __init__(self, conn, executor: DatabaseExecutor):
+        self._conn = conn
+        self._executor = executor
+
+    def cursor(self) -> AsyncCursor:
+        return AsyncCursor(self._conn.cursor(), self._executor)
+
+    async def commit(self):
+        await self._executor.run(self._conn.commit)
+
+    async def rollback(self):
+        await self._executor.run(self._conn.rollback)
+
+    @property
+    def closed(self):
+        return self._conn.closed
@@ -0,0 +1,333 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+import psycopg2
+from psycopg2 import extensions
+
+from app.data.db_config import DB_POOL_CONFIG
+from app.data.db_executor import AsyncConnection, DatabaseExecutor, DbExecutionMode
+from app.data.migrations import get_connection
+from app.log_text import DB_POOL_HEALTH_CHECK_FAILED, DB_POOL_RECYCLE_ERROR
+
+
+class PoolTimeoutError(Exception):
+    """Не удалось получить соединение из пула за acquire_timeout секунд"""
+
+
+class _PoolEntry:
+    __slots__ = ("conn", "created_at", "last_used_at")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+
+class AsyncConnectionPool:
+    """
+    Пул соединений с PostgreSQL, общий для всего процесса.
+
+    Ожидание свободного соединения не блокирует event loop: корутины ждут на asyncio.Condition.
+    Сетевые вызовы psycopg2 (подключение, запросы, commit) выполняются через DatabaseExecutor,
+    в режиме THREAD - в ограниченном пуле потоков размером max_size.
+
+    Параметры:
+        min_size: количество соединений, которые держатся открытыми постоянно
+        max_size: максимальное количество одновременно открытых соединений
+        max_idle: через сколько секунд простоя закрывается соединение сверх min_size
+        max_lifetime: через сколько секунд соединение пересоздается
+        health_check_after: после скольких секунд простоя соединение проверяется через SELECT 1
+        acquire_timeout: сколько секунд ждать свободное соединение до PoolTimeoutError
+        execution_mode: где выполнять блокирующие вызовы psycopg2 (DbExecutionMode)
+    """
+
+    def __init__(self, min_size=2, max_size=10, max_idle=300.0, max_lifetime=3600.0,
+                 health_check_after=30.0, acquire_timeout=10.0,
+                 execution_mode: DbExecutionMode = DbExecutionMode.THREAD):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Некорректные размеры пула: min_size={}, max_size={}".format(min_size, max_size))
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.acquire_timeout = acquire_timeout
+        self._executor = DatabaseExecutor(DbExecutionMode(execution_mode), max_workers=max_size)
+
+        self._idle = deque()
+        self._in_use = {}
+        self._size = 0
+        self._condition = asyncio.Condition()
+        self._recycler_task = None
+        self._closed = True
+
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._connections_created = 0
+        self._connections_closed = 0
+        self._health_check_failures = 0
+
+    async def open(self):
+        """Открывает min_size соединений и запускает фоновую переработку простаивающих соединений"""
+        if not self._closed:
+            return
+        self._closed = False
+        for _ in range(self.min_size):
+            self._size += 1
+            try:
+                entry = await self._create_entry()
+            except Exception:
+                self._size -= 1
+                raise
+            self._idle.append(entry)
+        self._recycler_task = asyncio.create_task(self._recycle_loop())
+
+    async def close(self):
+        """Закрывает все свободные соединения; занятые закрываются при возврате в пул"""
+        self._closed = True
+        if self._recycler_task:
+            self._recycler_task.cancel()
+            try:
+                await self._recycler_task
+            except asyncio.CancelledError:
+                pass
+            self._recycler_task = None
+
+        async with self._condition:
+            while self._idle:
+                self._close_entry(self._idle.popleft())
+            self._condition.notify_all()
+        self._executor.shutdown()
+
+    @asynccontextmanager
+    async def connection(self):
+        """
+        Выдает соединение из пула на время блока async with.
+
+        Повторяет семантику `with psycopg2_connection`: при успешном выходе из блока транзакция
+        фиксируется, при исключении откатывается. После этого соединение возвращается в пул.
+        """
+        entry = await self._acquire()
+        try:
+            yield AsyncConnection(entry.conn, self._executor)
+        except BaseException:
+            await self._rollback_quietly(entry)
+            raise
+        else:
+            try:
+                await self._executor.run(entry.conn.commit)
+            except BaseException:
+                await self._rollback_quietly(entry)
+                raise
+        finally:
+            await self._release(entry)
+
+    def stats(self) -> dict:
+        """Возвращает счетчики пула: размер, выдачи соединений, время ожидания и обращения к серверу"""
+        return {
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": len(self._in_use),
+            "checkouts": self._checkouts,
+            "waits": self._waits,
+            "wait_time_total": self._wait_time_total,
+            "wait_time_max": self._wait_time_max,
+            "wait_time_avg": self._wait_time_total / self._checkouts if self._checkouts else 0.0,
+            "timeouts": self._timeouts,
+            "connections_created": self._connections_created,
+            "connections_closed": self._connections_closed,
+            "health_check_failures": self._health_check_failures,
+            "round_trips": self._executor.round_trips,
+        }
+
+    async def _acquire(self):
+        started_at = time.monotonic()
+        deadline = started_at + self.acquire_timeout
+        waited = False
+
+        while True:
+            entry, waited_now = await self._reserve(deadline)
+            waited = waited or waited_now
+
+            if entry is None:
+                try:
+                    entry = await self._create_entry()
+                except BaseException:
+                    async with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+                break
+
+            # Проверка соединения идет вне блокировки, чтобы не задерживать остальных
+            if await self._is_usable(entry):
+                break
+            async with self._condition:
+                self._close_entry(entry)
+                self._condition.notify()
+
+        wait_time = time.monotonic() - started_at
+        self._checkouts += 1
+        self._wait_time_total += wait_time
+        self._wait_time_max = max(self._wait_time_max, wait_time)
+        if waited:
+            self._waits += 1
+
+        self._in_use[id(entry)] = entry
+        return entry
+
+    async def _reserve(self, deadline):
+        """
+        Забирает свободное соединение или резервирует место под новое.
+
+        Возвращает (entry, waited): entry равен None, если нужно открыть новое соединение.
+        """
+        waited = False
+        async with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+
+                if self._idle:
+                    return self._idle.pop(), waited
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, waited
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        "Timed out after {}s waiting for a database connection".format(self.acquire_timeout)
+                    )
+                waited = True
+                try:
+                    await asyncio.wait_for(self._condition.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _release(self, entry):
+        async with self._condition:
+            self._in_use.pop(id(entry), None)
+            entry.last_used_at = time.monotonic()
+
+            if self._closed or entry.conn.closed or self._is_expired(entry):
+                self._close_entry(entry)
+            else:
+                self._idle.append(entry)
+            self._condition.notify()
+
+    async def _create_entry(self):
+        conn = await self._executor.run(get_connection)
+        self._connections_created += 1
+        return _PoolEntry(conn)
+
+    async def _is_usable(self, entry) -> bool:
+        if entry.conn.closed or self._is_expired(entry):
+            return False
+        if time.monotonic() - entry.last_used_at < self.health_check_after:
+            return True
+        try:
+            await self._executor.run(self._ping, entry.conn)
+            return True
+        except psycopg2.Error as e:
+            self._health_check_failures += 1
+            logging.warning(DB_POOL_HEALTH_CHECK_FAILED.format(e))
+            return False
+
+    def _is_expired(self, entry) -> bool:
+        return time.monotonic() - entry.created_at > self.max_lifetime
+
+    def _close_entry(self, entry):
+        self._size -= 1
+        self._connections_closed += 1
+        try:
+            entry.conn.close()
+        except psycopg2.Error:
+            pass
+
+    @staticmethod
+    def _ping(conn):
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+
+    async def _rollback_quietly(self, entry):
+        if entry.conn.closed:
+            return
+        try:
+            if entry.conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                await self._executor.run(entry.conn.rollback)
+        except psycopg2.Error:
+            entry.conn.close()
+
+    async def _recycle_loop(self):
+        interval = max(1.0, min(self.max_idle, self.max_lifetime) / 2)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._recycle()
+            except Exception as e:
+                logging.error(DB_POOL_RECYCLE_ERROR.format(e))
+
+    async def _recycle(self):
+        """Закрывает просроченные и лишние простаивающие соединения, добирает пул до min_size"""
+        now = time.monotonic()
+        async with self._condition:
+            kept = deque()
+            while self._idle:
+                entry = self._idle.popleft()
+                idle_too_long = now - entry.last_used_at > self.max_idle and self._size > self.min_size
+                if entry.conn.closed or self._is_expired(entry) or idle_too_long:
+                    self._close_entry(entry)
+                else:
+                    kept.append(entry)
+            self._idle = kept
+            missing = self.min_size - self._size
+            self._size += max(missing, 0)
+
+        for created in range(max(missing, 0)):
+            try:
+                entry = await self._create_entry()
+            except Exception:
+                async with self._condition:
+                    self._size -= missing - created
+                raise
+            async with self._condition:
+                self._idle.append(entry)
+                self._condition.notify()
+
+
+_pool = None
+
+
+async def init_db_pool() -> AsyncConnectionPool:
+    """Создает и открывает глобальный пул соединений"""
+    global _pool
+    if _pool is None:
+        _pool = AsyncConnectionPool(**DB_POOL_CONFIG)
+    await _pool.open()
+    return _pool
+
+
+def get_db_pool() -> AsyncConnectionPool:
+    """Возвращает глобальный пул соединений"""
+    if _pool is None:
+        raise RuntimeError("Database pool not initialized. Call init_db_pool first.")
+    return _pool
+
+
+async def close_db_pool():
+    """Закрывает глобальный пул соединений"""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -5,5 +5,6 @@ def init_database():
     runner.run_migrations()
 
 def get_db_connection():
-    from app.data.migrations import get_connection
-    return get_connection()
\ No newline at end of file
+    """Возвращает async context manager с соединением из общего пула"""
+    from app.data.db_pool import get_db_pool
+    return get_db_pool().connection()
@@ -0,0 +1,9 @@
+ALTER TABLE dont_touch.spot_confirmations
+    ADD COLUMN IF NOT EXISTS expires_at TIMESTAMP;
+
+-- Срок уже выданных предложений проставляет первый проход при старте бота
+-- (fill_missing_spot_confirmation_deadlines): задержка DELAY_MINUTES_CONFIRM_SPOT известна только в конфиге
+
+CREATE INDEX IF NOT EXISTS idx_spot_confirmations_active_expires_at
+    ON dont_touch.spot_confirmations (expires_at)
+    WHERE is_active = TRUE;
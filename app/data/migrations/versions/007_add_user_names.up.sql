@@ -0,0 +1,5 @@
+ALTER TABLE dont_touch.users
+    ADD COLUMN IF NOT EXISTS first_name VARCHAR(255),
+    ADD COLUMN IF NOT EXISTS last_name VARCHAR(255),
+    ADD COLUMN IF NOT EXISTS username VARCHAR(255),
+    ADD COLUMN IF NOT EXISTS names_updated_at TIMESTAMP;
@@ -0,0 +1,37 @@
+-- Сводка по дням: строки пересчитываются для изменяемых дат при чтении статистики,
+-- а прошедшие даты фиксируются ночным проходом (is_final) и больше не пересчитываются
+CREATE TABLE IF NOT EXISTS dont_touch.daily_parking_stats
+(
+    stat_date                     DATE    NOT NULL PRIMARY KEY,
+    releases_pending              INTEGER NOT NULL DEFAULT 0,
+    releases_waiting              INTEGER NOT NULL DEFAULT 0,
+    releases_accepted             INTEGER NOT NULL DEFAULT 0,
+    releases_canceled             INTEGER NOT NULL DEFAULT 0,
+    releases_not_found            INTEGER NOT NULL DEFAULT 0,
+    requests_pending              INTEGER NOT NULL DEFAULT 0,
+    requests_waiting_confirmation INTEGER NOT NULL DEFAULT 0,
+    requests_accepted             INTEGER NOT NULL DEFAULT 0,
+    requests_canceled             INTEGER NOT NULL DEFAULT 0,
+    requests_not_found            INTEGER NOT NULL DEFAULT 0,
+    transfers                     INTEGER NOT NULL DEFAULT 0,
+    -- этаж -> количество занятых (ACCEPTED) мест
+    floor_occupancy               JSONB   NOT NULL DEFAULT '{}'::jsonb,
+    is_final                      BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at                    TIMESTAMP        DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Счетчики запросов пользователя за всё время по датам раньше counted_through;
+-- запросы начиная с counted_through досчитываются при чтении
+CREATE TABLE IF NOT EXISTS dont_touch.user_parking_stats
+(
+    user_id            UUID    NOT NULL PRIMARY KEY,
+    requests_accepted  INTEGER NOT NULL DEFAULT 0,
+    requests_not_found INTEGER NOT NULL DEFAULT 0,
+    requests_canceled  INTEGER NOT NULL DEFAULT 0,
+    counted_through    DATE    NOT NULL,
+    updated_at         TIMESTAMP        DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_user_parking_stats_user_id
+        FOREIGN KEY (user_id)
+            REFERENCES dont_touch.users
+            ON DELETE CASCADE
+);
@@ -0,0 +1,35 @@
+-- Дубликаты: те же столбцы уже покрыты уникальными индексами
+DROP INDEX IF EXISTS dont_touch.idx_parking_releases_spot_date;   -- uniq_spot_id_releases_date
+DROP INDEX IF EXISTS dont_touch.idx_parking_requests_user_date;   -- uniq_user_id_request_date
+DROP INDEX IF EXISTS dont_touch.idx_users_tg_id;                  -- UNIQUE (tg_id)
+
+-- Статус без даты почти не отсекает строки; заменяется частичными индексами ниже
+DROP INDEX IF EXISTS dont_touch.idx_parking_requests_status;
+
+-- Свободные места на дату: get_free_spots, get_dates_with_availability
+CREATE INDEX IF NOT EXISTS idx_parking_releases_pending_date
+    ON dont_touch.parking_releases (release_date)
+    WHERE status = 'PENDING';
+
+-- Освобождения пользователя начиная с даты: сводка бронирований, кандидаты распределения
+CREATE INDEX IF NOT EXISTS idx_parking_releases_user_date
+    ON dont_touch.parking_releases (user_id, release_date);
+
+-- Место, которое получил пользователь на дату: user_id_took = ? AND release_date = ?
+CREATE INDEX IF NOT EXISTS idx_parking_releases_took_date
+    ON dont_touch.parking_releases (user_id_took, release_date)
+    WHERE user_id_took IS NOT NULL;
+
+-- Ожидающие запросы на дату: get_candidates, get_dates_with_availability
+CREATE INDEX IF NOT EXISTS idx_parking_requests_pending_date
+    ON dont_touch.parking_requests (request_date)
+    WHERE status = 'PENDING';
+
+-- Запросы по дате без пользователя: сводки статистики
+CREATE INDEX IF NOT EXISTS idx_parking_requests_date
+    ON dont_touch.parking_requests (request_date);
+
+-- Активные предложения пользователя
+CREATE INDEX IF NOT EXISTS idx_spot_confirmations_active_user
+    ON dont_touch.spot_confirmations (user_id)
+    WHERE is_active = TRUE;
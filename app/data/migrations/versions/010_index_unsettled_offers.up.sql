@@ -0,0 +1,9 @@
+-- Ночной проход ищет прошедшие даты с неподтвержденными предложениями (get_first_unsettled_date):
+-- такие строки живут минуты, поэтому частичные индексы почти пустые
+CREATE INDEX IF NOT EXISTS idx_parking_releases_waiting_date
+    ON dont_touch.parking_releases (release_date)
+    WHERE status = 'WAITING';
+
+CREATE INDEX IF NOT EXISTS idx_parking_requests_waiting_confirmation_date
+    ON dont_touch.parking_requests (request_date)
+    WHERE status = 'WAITING_CONFIRMATION';
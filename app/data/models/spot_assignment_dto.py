@@ -0,0 +1,10 @@
+from typing import NamedTuple
+
+
+class SpotAssignment(NamedTuple):
+    release_id: str
+    spot_id: int
+    request_id: str
+    user_id: str
+    tg_id: int
+    owner_tg_id: int
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime
 from typing import Optional
 
 
@@ -12,6 +12,7 @@ class SpotConfirmationDTO:
     assignment_date: date = None
     release_id: Optional[str] = None
     request_id: Optional[str] = None
+    expires_at: Optional[datetime] = None
 
     def __post_init__(self):
         """Валидация данных после инициализации"""
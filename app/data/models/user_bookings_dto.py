@@ -0,0 +1,14 @@
+from dataclasses import dataclass, field
+from typing import List
+
+from app.data.models.releases.revoke_releases_dto import RevokeRelease
+from app.data.models.requests.revoke_requests_dto import RevokeRequest
+
+
+@dataclass
+class UserBookings:
+    accepted_count: int
+    not_found_count: int
+    canceled_count: int
+    requests: List[RevokeRequest] = field(default_factory=list)
+    releases: List[RevokeRelease] = field(default_factory=list)
@@ -1,4 +1,28 @@
-async def get_dates_with_availability(cur):
+from app.data.models.releases.releases_enum import ParkingReleaseStatus
+from app.data.models.requests.requests_enum import ParkingRequestStatus
+
+
+async def lock_distribution_date(cur, distribution_date):
+    """
+        Берет транзакционную advisory-блокировку распределения на указанную дату.
+
+        Параметры:
+            cur: курсор базы данных для выполнения SQL-запросов
+            distribution_date: дата, на которую распределяются места
+
+        Особенности:
+            - Ключ блокировки - пара (hashtext('parking_distribution'), номер дня), поэтому
+              распределения на разные даты идут параллельно, а на одну дату - по очереди
+            - Блокировка снимается автоматически при commit/rollback транзакции
+            - Работает и между несколькими экземплярами бота на одной базе
+            - Асинхронная функция, требует await при вызове
+        """
+    await cur.execute('''
+                SELECT pg_advisory_xact_lock(hashtext('parking_distribution'), %s::date - DATE '2000-01-01')
+                ''', (distribution_date,))
+
+
+async def get_dates_with_availability(cur, dates=None):
     """
         Получает список дат, на которые есть доступные парковочные места и ожидающие запросы.
 
@@ -8,6 +32,7 @@ async def get_dates_with_availability(cur):
 
         Параметры:
             cur: курсор базы данных для выполнения SQL-запросов
+            dates: даты, которыми ограничить поиск; None - все даты
 
         Возвращает:
             list: список объектов datetime.date - даты, когда возможна автоматическая
@@ -18,6 +43,8 @@ async def get_dates_with_availability(cur):
               (места свободны)
             - Подзапрос EXISTS проверяет, что на эти же даты есть запросы со статусом 'PENDING'
             - DISTINCT гарантирует уникальность дат в результате
+            - Если переданы dates, проверяются только они (pr.release_date = ANY(...)),
+              и запрос не просматривает освобождения на остальные даты
 
         Особенности:
             - Функция используется для поиска дат, когда система может автоматически
@@ -25,20 +52,25 @@ async def get_dates_with_availability(cur):
             - Возвращает только даты, где есть и предложение (свободные места), и спрос (запросы)
             - Асинхронная функция, требует await при вызове
         """
-    cur.execute('''
+    if dates is not None and not dates:
+        return []
+
+    await cur.execute('''
                 SELECT DISTINCT pr.release_date
                 FROM dont_touch.parking_releases pr
                 WHERE pr.status = 'PENDING'
+                  AND (%(dates)s::date[] IS NULL OR pr.release_date = ANY (%(dates)s::date[]))
                   AND EXISTS (SELECT 1
                               FROM dont_touch.parking_requests prq
                               WHERE prq.request_date = pr.release_date
                                 AND prq.status = 'PENDING')
-                ''')
+                ORDER BY pr.release_date
+                ''', {'dates': sorted(dates) if dates is not None else None})
 
-    return [row[0] for row in cur.fetchall()]
+    return [row[0] for row in await cur.fetchall()]
 
 
-async def get_candidates(cur, distribution_date, free_spots):
+async def get_candidates(cur, distribution_date, with_last_assigned_date=False):
     """
         Получает список кандидатов для распределения свободных мест на указанную дату.
 
@@ -48,7 +80,7 @@ async def get_candidates(cur, distribution_date, free_spots):
         Параметры:
             cur: курсор базы данных для выполнения SQL-запросов
             distribution_date: дата, на которую распределяются места
-            free_spots: список свободных мест (используется для определения лимита кандидатов)
+            with_last_assigned_date: нужна ли last_assigned_date (policy.needs_last_assigned_date)
 
         Возвращает:
             list: список словарей, где каждый словарь содержит:
@@ -56,22 +88,38 @@ async def get_candidates(cur, distribution_date, free_spots):
                 - 'user_id': UUID пользователя
                 - 'rating': рейтинг пользователя (числовое значение)
                 - 'tg_id': идентификатор пользователя в Telegram
+                - 'last_assigned_date': последняя дата, на которую пользователь получил место
+                  (None, если не получал или with_last_assigned_date=False) - используется политикой round-robin
 
         Логика:
             - Выбирает pending-запросы на указанную дату
             - Присоединяет данные пользователей для получения рейтинга и tg_id
             - Сортирует по рейтингу в порядке возрастания (низший рейтинг первый)
-            - Ограничивает количество кандидатов количеством свободных мест
 
         Особенности:
             - ORDER BY u.rating ASC - приоритет отдается пользователям с НИЗШИМ рейтингом
               (вероятно, система справедливого распределения, где меньше получившие)
-            - LIMIT %s - количество кандидатов равно количеству свободных мест
+            - Возвращаются все ожидающие запросы без LIMIT: если пользователей с минимальным
+              рейтингом меньше, чем свободных мест, остаток достается следующим уровням рейтинга
+              в том же прогоне
             - Статус 'PENDING' - рассматриваются только активные, необработанные запросы
+            - История ACCEPTED-запросов кандидата читается только при with_last_assigned_date:
+              при литерале false планировщик сворачивает CASE в NULL и подзапрос не выполняется
+            - FOR UPDATE OF prq SKIP LOCKED - запросы, захваченные параллельной транзакцией
+              (например, отменяемые прямо сейчас), в распределении не участвуют
             - Асинхронная функция, требует await при вызове
         """
-    cur.execute('''
-                SELECT prq.id as request_id, prq.user_id, u.rating, u.tg_id
+    await cur.execute('''
+                SELECT prq.id as request_id,
+                       prq.user_id,
+                       u.rating,
+                       u.tg_id,
+                       CASE
+                           WHEN %s THEN (SELECT max(accepted.request_date)
+                                         FROM dont_touch.parking_requests accepted
+                                         WHERE accepted.user_id = prq.user_id
+                                           AND accepted.status = 'ACCEPTED')
+                           END AS last_assigned_date
                 FROM dont_touch.parking_requests prq
                          JOIN dont_touch.users u ON prq.user_id = u.user_id
                 WHERE prq.request_date = %s
@@ -82,7 +130,112 @@ async def get_candidates(cur, distribution_date, free_spots):
                                     AND prl.release_date = %s
                                     AND prl.status = 'PENDING')
                 ORDER BY u.rating ASC
-                LIMIT %s
-                ''', (distribution_date, distribution_date, len(free_spots)))
+                FOR UPDATE OF prq SKIP LOCKED
+                ''', (with_last_assigned_date, distribution_date, distribution_date))
+
+    return await cur.fetchall()
+
+
+async def assign_spots_to_candidates(cur, distribution_date, release_ids, request_ids,
+                                     release_status: ParkingReleaseStatus,
+                                     request_status: ParkingRequestStatus, increment_rating: bool,
+                                     create_confirmations: bool, confirmation_expires_at=None):
+    """
+        Распределяет свободные места на указанную дату между кандидатами одним SQL-запросом.
+
+        Применяет готовые пары "место - запрос", рассчитанные движком распределения, и одним
+        запросом обновляет статусы мест и запросов, рейтинги пользователей и при необходимости
+        создает записи подтверждения.
+
+        Параметры:
+            cur: курсор базы данных для выполнения SQL-запросов
+            distribution_date: дата, на которую распределяются места
+            release_ids: список UUID освобождений, захваченных get_free_spots
+            request_ids: список UUID запросов той же длины: release_ids[i] достается request_ids[i]
+            release_status: новый статус назначенных мест (ACCEPTED или WAITING)
+            request_status: новый статус удовлетворенных запросов (ACCEPTED или WAITING_CONFIRMATION)
+            increment_rating: увеличивать ли рейтинг получателям
+            create_confirmations: создавать ли записи в spot_confirmations
+            confirmation_expires_at: срок ответа на предложение, сохраняется в spot_confirmations.expires_at
+
+        Возвращает:
+            list: список кортежей SpotAssignment-формата, где каждый кортеж содержит:
+                - release_id: идентификатор освобожденного места
+                - spot_id: номер парковочного места
+                - request_id: идентификатор удовлетворенного запроса
+                - user_id: UUID получателя
+                - tg_id: Telegram ID получателя
+                - owner_tg_id: Telegram ID владельца места (None, если владелец не найден)
+
+        Логика:
+            - pairs: unnest двух массивов задает явные пары; пара применяется, только если
+              и место, и запрос все еще в статусе 'PENDING'
+            - UPDATE ... FROM pairs обновляет все строки за один проход
+
+        Особенности:
+            - Заменяет цепочку update_parking_releases / update_request_status /
+              increment_user_rating / get_release_owner на каждое назначение
+            - Пары, где место или запрос успели сменить статус, пропускаются; место останется
+              'PENDING' до следующего прогона
+            - Асинхронная функция, требует await при вызове
+        """
+    await cur.execute('''
+                WITH pairs AS (SELECT pr.id          AS release_id,
+                                      pr.spot_id,
+                                      pr.user_id     AS owner_id,
+                                      prq.id         AS request_id,
+                                      prq.user_id,
+                                      p.position
+                               FROM unnest(%(release_ids)s::uuid[], %(request_ids)s::uuid[])
+                                        WITH ORDINALITY AS p(release_id, request_id, position)
+                                        JOIN dont_touch.parking_releases pr ON pr.id = p.release_id
+                                        JOIN dont_touch.parking_requests prq ON prq.id = p.request_id
+                               WHERE pr.release_date = %(distribution_date)s
+                                 AND pr.status = 'PENDING'
+                                 AND prq.request_date = %(distribution_date)s
+                                 AND prq.status = 'PENDING'),
+                     updated_releases AS (
+                         UPDATE dont_touch.parking_releases pr
+                             SET user_id_took = pairs.user_id,
+                                 status = %(release_status)s
+                             FROM pairs
+                             WHERE pr.id = pairs.release_id),
+                     updated_requests AS (
+                         UPDATE dont_touch.parking_requests prq
+                             SET status = %(request_status)s,
+                                 processed_at = CURRENT_TIMESTAMP
+                             FROM pairs
+                             WHERE prq.id = pairs.request_id),
+                     updated_ratings AS (
+                         UPDATE dont_touch.users u
+                             SET rating = u.rating + 1
+                             FROM pairs
+                             WHERE u.user_id = pairs.user_id
+                                 AND %(increment_rating)s),
+                     inserted_confirmations AS (
+                         INSERT INTO dont_touch.spot_confirmations (user_id, release_id, request_id, expires_at)
+                             SELECT pairs.user_id, pairs.release_id, pairs.request_id, %(confirmation_expires_at)s
+                             FROM pairs
+                             WHERE %(create_confirmations)s)
+                SELECT pairs.release_id,
+                       pairs.spot_id,
+                       pairs.request_id,
+                       pairs.user_id,
+                       recipient.tg_id,
+                       owner.tg_id
+                FROM pairs
+                         JOIN dont_touch.users recipient ON recipient.user_id = pairs.user_id
+                         LEFT JOIN dont_touch.users owner ON owner.user_id = pairs.owner_id
+                ORDER BY pairs.position
+                ''', {
+        'distribution_date': distribution_date,
+        'release_ids': [str(release_id) for release_id in release_ids],
+        'request_ids': [str(request_id) for request_id in request_ids],
+        'release_status': release_status.name,
+        'request_status': request_status.name,
+        'increment_rating': increment_rating,
+        'create_confirmations': create_confirmations,
+        'confirmation_expires_at': confirmation_expires_at,
+    })
 
-    return cur.fetchall()
+    return await cur.fetchall()
@@ -28,14 +28,14 @@ async def get_user_spot_by_date(cur, request_date, db_user_id):
         - Используется для проверки прав доступа или статуса бронирования
         - Асинхронная функция, требует await при вызове
     """
-    cur.execute('''
+    await cur.execute('''
                 SELECT 1
                 FROM dont_touch.parking_releases
                 WHERE release_date = %s
                   AND user_id_took = %s
                   AND status = 'ACCEPTED'
                 ''', (request_date, db_user_id))
-    return cur.fetchone()
+    return await cur.fetchone()
 
 
 async def get_spot_id_by_user_id_and_request_date(cur, db_user_id, request_date):
@@ -67,7 +67,7 @@ async def get_spot_id_by_user_id_and_request_date(cur, db_user_id, request_date)
             - Явное преобразование db_user_id в string (str(db_user_id))
             - Асинхронная функция, требует await при вызове
         """
-    cur.execute('''
+    await cur.execute('''
                 SELECT spot_id
                 FROM dont_touch.parking_releases
                 WHERE release_date = %s
@@ -76,7 +76,7 @@ async def get_spot_id_by_user_id_and_request_date(cur, db_user_id, request_date)
                 ORDER BY created_at ASC
                 ''', (request_date, str(db_user_id),))
 
-    return cur.fetchone()
+    return await cur.fetchone()
 
 
 async def insert_spot_on_date(cur, db_user_id, spot_num, release_date):
@@ -107,7 +107,7 @@ async def insert_spot_on_date(cur, db_user_id, spot_num, release_date):
         - Функция асинхронная, требует await при вызове
         - Не заполняет поле user_id_took (получатель места), только user_id (инициатор)
     """
-    cur.execute('''
+    await cur.execute('''
                 INSERT INTO dont_touch.parking_releases
                     (id, user_id, spot_id, release_date)
                 VALUES (gen_random_uuid(), %s, %s, %s)
@@ -115,7 +115,7 @@ async def insert_spot_on_date(cur, db_user_id, spot_num, release_date):
                 RETURNING id
                 ''', (db_user_id, spot_num, release_date))
 
-    return cur.fetchone()
+    return await cur.fetchone()
 
 
 async def get_user_id_took_by_date_and_spot(cur, db_user_id, spot_number, release_date):
@@ -147,7 +147,7 @@ async def get_user_id_took_by_date_and_spot(cur, db_user_id, spot_number, releas
         - user_id_took будет NULL если место освобождено, но еще никем не занято
         - Асинхронная функция, требует await при вызове
     """
-    cur.execute('''
+    await cur.execute('''
                 SELECT pr.user_id_took
                 FROM dont_touch.parking_releases pr
                 WHERE pr.release_date = %s
@@ -156,99 +156,7 @@ async def get_user_id_took_by_date_and_spot(cur, db_user_id, spot_number, releas
                   AND pr.status = 'ACCEPTED'
                 ''', (release_date, db_user_id, spot_number))
 
-    return cur.fetchone()
-
-
-async def free_parking_releases_by_date(cur, date):
-    """
-        Получает список свободных парковочных мест на указанную дату.
-
-        Выполняет поиск всех освобожденных мест, которые еще не были заняты пользователями.
-
-        Параметры:
-            cur: курсор базы данных
-            date: дата для поиска свободных мест
-
-        Возвращает:
-            list: список всех свободных парковочных мест на указанную дату
-        """
-    cur.execute('''
-                SELECT *
-                FROM dont_touch.parking_releases pr
-                WHERE pr.status = 'PENDING'
-                  AND pr.release_date = %s
-                ''', (date,))
-
-    return cur.fetchall()
-
-
-async def parking_releases_by_week(cur, status, monday_date, friday_date):
-    """
-    Асинхронно получает записи о возврате парковочных мест за указанную неделю по заданному статусу.
-
-    Выполняет поиск всех записей в таблице parking_releases, соответствующих
-    указанному статусу и периоду времени между понедельником и пятницей.
-
-    Параметры:
-        cur: курсор базы данных для выполнения SQL-запросов
-        status: статус записей о возврате для фильтрации (например, 'ACCEPTED', 'NOT_FOUND')
-        monday_date: дата понедельника (начало периода, включительно)
-        friday_date: дата пятницы (конец периода, включительно)
-
-    Возвращает:
-        list: список кортежей со всеми полями записей о возвратах, удовлетворяющих условиям
-
-    Особенности:
-        - Возвращает все поля таблицы parking_releases (*)
-        - Фильтрация происходит по статусу и диапазону дат (включительно)
-        - Используется для получения статистики возвратов за конкретную неделю
-        - Функция асинхронная, требует await при вызове
-    """
-    cur.execute('''
-                SELECT *
-                FROM dont_touch.parking_releases pr
-                WHERE pr.status = %s
-                  AND pr.release_date >= %s
-                  AND pr.release_date <= %s
-                ''', (status, monday_date, friday_date))
-
-    return cur.fetchall()
-
-
-async def current_spots_releases_by_user(cur, user_id, release_date):
-    """
-    Асинхронно получает актуальные освобожденные парковочные места пользователя.
-
-    Выполняет поиск активных и ожидающих запросов на освобождение парковочных мест
-    для указанного пользователя, начиная с заданной даты.
-
-    Параметры:
-        cur: курсор базы данных для выполнения SQL-запросов
-        user_id: UUID идентификатор пользователя в базе данных
-        release_date: минимальная дата освобождения для фильтрации (включительно)
-
-    Возвращает:
-        list: список кортежей с данными освобожденных мест, где каждый кортеж содержит:
-            - spot_id: идентификатор парковочного места
-            - status: статус освобождения ('ACCEPTED', 'PENDING' или 'WAITING')
-            - release_date: дата освобождения места
-
-    Особенности:
-        - Фильтрует записи со статусами 'ACCEPTED', 'PENDING' и 'WAITING'
-        - Результаты сортируются по дате освобождения в порядке убывания (сначала новые)
-        - Используется для отображения актуальных освобожденных мест в статистике пользователя
-        - Функция асинхронная, требует await при вызове
-    """
-    cur.execute('''
-                SELECT pr.spot_id, pr.status, pr.release_date
-                FROM dont_touch.parking_releases pr
-                WHERE pr.user_id = %s
-                  AND pr.release_date >= %s
-                  AND (pr.status = 'ACCEPTED' OR pr.status = 'PENDING' OR pr.status = 'WAITING')
-                ORDER BY release_date DESC
-                ''', (user_id, release_date,))
-
-    return cur.fetchall()
+    return await cur.fetchone()
 
 
 async def get_tomorrow_accepted_spot(cur, date):
@@ -274,7 +182,7 @@ async def get_tomorrow_accepted_spot(cur, date):
         - Используется для уведомлений пользователей о предстоящем освобождении мест
         - Функция асинхронная, требует await при вызове
     """
-    cur.execute("""
+    await cur.execute("""
                 SELECT pr.spot_id, u.tg_id
                 FROM dont_touch.parking_releases pr
                          JOIN dont_touch.users u ON pr.user_id_took = u.user_id
@@ -282,7 +190,7 @@ async def get_tomorrow_accepted_spot(cur, date):
                   AND pr.release_date = %s
                 """, (date,))
 
-    return cur.fetchall()
+    return await cur.fetchall()
 
 
 async def update_revoke_parking_release(cur, release_id, current_status: ParkingReleaseStatus):
@@ -308,7 +216,7 @@ async def update_revoke_parking_release(cur, release_id, current_status: Parking
             - Используется в процессе отзыва заявки на освобождение места
             - Функция асинхронная, требует await при вызове
     """
-    cur.execute('''
+    await cur.execute('''
                 UPDATE dont_touch.parking_releases
                 SET user_id_took = NULL,
                     status       = %s
@@ -316,46 +224,6 @@ async def update_revoke_parking_release(cur, release_id, current_status: Parking
                 ''', (current_status.name, release_id))
 
 
-async def find_user_releases_for_revoke(cur, db_user_id, date):
-    """
-        Асинхронно находит запросы на освобождение мест пользователя для возможного отзыва.
-
-        Выполняет поиск ожидающих запросов на освобождение парковочных мест,
-        начиная с указанной даты.
-
-        Параметры:
-            cur: курсор базы данных для выполнения SQL-запросов
-            db_user_id: UUID идентификатор пользователя в базе данных
-            date: дата, начиная с которой осуществляется поиск запросов (включительно)
-
-        Возвращает:
-            list: список кортежей с данными запросов на освобождение, где каждый кортеж содержит:
-                - id: идентификатор запроса на освобождение
-                - release_date: дата освобождения места
-                - status: статус запроса (всегда 'PENDING')
-                - spot_id: идентификатор освобождаемого места парковки
-
-        Особенности:
-            - Ищет только записи со статусом 'PENDING'
-            - Результаты сортируются по дате освобождения в возрастающем порядке
-            - Используется для функциональности отзыва запросов на освобождение мест
-            - Функция асинхронная, требует await при вызове
-    """
-    cur.execute('''
-                SELECT prel.id,
-                       prel.release_date,
-                       prel.status,
-                       prel.spot_id
-                FROM dont_touch.parking_releases prel
-                WHERE prel.user_id = %s
-                  AND prel.release_date >= %s
-                  AND prel.status = 'PENDING'
-                ORDER BY prel.release_date
-                ''', (db_user_id, date,))
-
-    return cur.fetchall()
-
-
 async def find_release_for_confirm_revoke(cur, db_user_id, release_id):
     """
         Асинхронно находит запрос на освобождение места для подтверждения отзыва.
@@ -382,7 +250,7 @@ async def find_release_for_confirm_revoke(cur, db_user_id, release_id):
             - Используется для подтверждения отзыва запроса на освобождение места
             - Функция асинхронная, требует await при вызове
     """
-    cur.execute('''
+    await cur.execute('''
                 SELECT prel.id,
                        prel.release_date,
                        prel.status,
@@ -393,7 +261,7 @@ async def find_release_for_confirm_revoke(cur, db_user_id, release_id):
                 LIMIT 1
                 ''', (db_user_id, release_id,))
 
-    return cur.fetchone()
+    return await cur.fetchone()
 
 
 async def update_parking_releases(cur, user_id, release_id, current_status: ParkingReleaseStatus):
@@ -417,7 +285,7 @@ async def update_parking_releases(cur, user_id, release_id, current_status: Park
         - После выполнения место перестает быть свободным (user_id_took IS NULL → user_id_took = user_id)
         - Асинхронная функция, требует await при вызове
     """
-    cur.execute('''
+    await cur.execute('''
                 UPDATE dont_touch.parking_releases
                 SET user_id_took = %s,
                     status       = %s
@@ -452,14 +320,14 @@ async def get_release_owner(cur, release_id):
            - Асинхронная функция, требует await при вызове
            - Полезно для систем уведомлений и аудита действий
        """
-    cur.execute('''
+    await cur.execute('''
                 SELECT pr.user_id, u.tg_id
                 FROM dont_touch.parking_releases pr
                          JOIN dont_touch.users u ON pr.user_id = u.user_id
                 WHERE pr.id = %s
                 ''', (release_id,))
 
-    return cur.fetchone()
+    return await cur.fetchone()
 
 
 async def get_free_spots(cur, distribution_date):
@@ -488,14 +356,17 @@ async def get_free_spots(cur, distribution_date):
             - Возвращает именно свободные места (никем не занятые)
             - ORDER BY created_at ASC обеспечивает fair distribution - первыми
               распределяются места, которые были освобождены раньше
+            - FOR UPDATE SKIP LOCKED захватывает строки до конца транзакции: места, уже
+              захваченные параллельным распределением, пропускаются, а не выдаются дважды
             - Асинхронная функция, требует await при вызове
             - Используется в процессах автоматического распределения мест
         """
-    cur.execute('''
+    await cur.execute('''
                 SELECT id, spot_id
                 FROM dont_touch.parking_releases
                 WHERE release_date = %s
                   AND status = 'PENDING'
                 ORDER BY created_at ASC
+                FOR UPDATE SKIP LOCKED
                 ''', (distribution_date,))
-    return cur.fetchall()
+    return await cur.fetchall()
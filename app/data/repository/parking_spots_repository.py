@@ -1,29 +1,22 @@
-async def get_spot_by_id(cur, spot_num):
+async def get_all_spots(cur):
     """
-        Асинхронно проверяет существование активного парковочного места по идентификатору.
-
-        Выполняет поиск парковочного места в базе данных по указанному идентификатору
-        и проверяет, что место активно (is_active = TRUE).
+        Асинхронно загружает справочник всех парковочных мест.
 
         Параметры:
             cur: курсор базы данных для выполнения SQL-запросов
-            spot_num: идентификатор парковочного места для проверки
 
         Возвращает:
-            tuple или None: кортеж с одним элементом (1), если место существует и активно,
-                           или None, если место не найдено или неактивно
+            list[tuple]: строки (spot_id, floor_number, is_active)
 
         Особенности:
-            - Возвращает только индикатор существования (1), а не полные данные о месте
-            - Проверяет как идентификатор места, так и его активность
-            - Используется для валидации существования парковочных мест
+            - Таблица небольшая (~170 строк) и меняется редко, поэтому читается целиком
+              одним запросом и держится в памяти (см. SpotCatalog)
+            - Возвращает и неактивные места, чтобы по справочнику можно было узнать этаж любого места
             - Функция асинхронная, требует await при вызове
     """
-    cur.execute('''
-                SELECT 1
+    await cur.execute('''
+                SELECT ps.spot_id, ps.floor_number, COALESCE(ps.is_active, FALSE)
                 FROM dont_touch.parking_spots ps
-                WHERE ps.spot_id = %s
-                  AND ps.is_active = TRUE
-                ''', (spot_num,))
+                ''')
 
-    return cur.fetchone()
\ No newline at end of file
+    return await cur.fetchall()
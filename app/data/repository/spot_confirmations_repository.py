@@ -1,29 +1,4 @@
-async def insert_row_of_spot_confirmation(cur, user_id, release_id, request_id):
-    """
-        Асинхронно создает новую запись о подтверждении парковочного места.
-
-        Вставляет новую запись в таблицу spot_confirmations с указанными параметрами.
-
-        Параметры:
-            cur: курсор базы данных для выполнения SQL-запросов
-            user_id: UUID идентификатор пользователя
-            release_id: UUID идентификатор записи об освобождении места
-            request_id: UUID идентификатор запроса на парковку
-
-        Возвращает:
-            None: функция выполняет INSERT запрос и не возвращает данные
-
-        Особенности:
-            - Создает новую активную запись о подтверждении места
-            - Используется для фиксации факта подтверждения парковки пользователем
-            - Функция асинхронная, требует await при вызове
-    """
-    cur.execute("""
-                INSERT INTO dont_touch.spot_confirmations (user_id, release_id, request_id)
-                VALUES (%s, %s, %s)
-                """, (user_id, release_id, request_id,))
-
-async def find_spot_confirmations_by_user(cur, user_id):
+async def find_spot_confirmations_by_user(cur, user_id, now):
     """
         Асинхронно находит активное подтверждение парковочного места для пользователя.
 
@@ -33,6 +8,7 @@ async def find_spot_confirmations_by_user(cur, user_id):
         Параметры:
             cur: курсор базы данных для выполнения SQL-запросов
             user_id: UUID идентификатор пользователя
+            now: текущее время; предложения с expires_at <= now считаются просроченными
 
         Возвращает:
             tuple или None: кортеж с данными подтверждения в формате:
@@ -42,27 +18,32 @@ async def find_spot_confirmations_by_user(cur, user_id):
                 - release_date: дата освобождения места
                 - release_id: идентификатор записи об освобождении
                 - request_id: идентификатор запроса на парковку
-            или None, если активное подтверждение не найдено
+            или None, если активное непросроченное подтверждение не найдено
 
         Особенности:
             - JOIN с таблицами users и parking_releases для получения дополнительной информации
             - Возвращает только последнюю активную запись (LIMIT 1)
             - Сортирует результаты по дате создания в порядке убывания
-            - Фильтрует только активные записи (is_active = TRUE)
+            - Фильтрует только активные записи (is_active = TRUE) с еще не наступившим expires_at
+            - FOR UPDATE OF sc: строка предложения блокируется до конца транзакции нажатия, поэтому
+              expire_overdue_spot_confirmations не может отменить его между поиском и сменой статусов.
+              Если проход уже отменил предложение, после ожидания блокировки строка не вернется
             - Функция асинхронная, требует await при вызове
     """
-    cur.execute("""
+    await cur.execute("""
                 SELECT u.user_id, u.tg_id, prl.spot_id, prl.release_date, sc.release_id, sc.request_id
                 FROM dont_touch.spot_confirmations sc
                          JOIN dont_touch.users u ON u.user_id = sc.user_id
                          JOIN dont_touch.parking_releases prl ON prl.id = sc.release_id
                 WHERE sc.user_id = %s
                   AND sc.is_active = TRUE
+                  AND sc.expires_at > %s
                 ORDER BY sc.created_at DESC
                 LIMIT 1
-                """, (user_id,))
+                FOR UPDATE OF sc
+                """, (user_id, now))
 
-    return cur.fetchone()
+    return await cur.fetchone()
 
 async def deactivate_spot_confirmations_by_user(cur, user_id):
     """
@@ -84,7 +65,7 @@ async def deactivate_spot_confirmations_by_user(cur, user_id):
             - Используется для очистки старых подтверждений после обработки
             - Функция асинхронная, требует await при вызове
     """
-    cur.execute("""
+    await cur.execute("""
                 UPDATE dont_touch.spot_confirmations
                 SET is_active  = FALSE,
                     updated_at = CURRENT_TIMESTAMP
@@ -93,3 +74,86 @@ async def deactivate_spot_confirmations_by_user(cur, user_id):
                                   WHERE user_id = %s)
                   AND is_active = TRUE
                 """, (user_id,))
+
+
+async def fill_missing_spot_confirmation_deadlines(cur, delay_minutes):
+    """
+        Асинхронно проставляет срок активным подтверждениям, созданным до появления expires_at.
+
+        Параметры:
+            cur: курсор базы данных для выполнения SQL-запросов
+            delay_minutes: время на подтверждение места в минутах (DELAY_MINUTES_CONFIRM_SPOT)
+
+        Возвращает:
+            None: функция выполняет UPDATE запрос и не возвращает данные
+
+        Особенности:
+            - Срок считается от created_at с той задержкой, которую видели пользователи
+            - Без срока запись не попадает в expire_overdue_spot_confirmations и висит бессрочно
+            - Функция асинхронная, требует await при вызове
+    """
+    await cur.execute("""
+                UPDATE dont_touch.spot_confirmations
+                SET expires_at = created_at + make_interval(mins => %s)
+                WHERE is_active = TRUE
+                  AND expires_at IS NULL
+                """, (delay_minutes,))
+
+
+async def expire_overdue_spot_confirmations(cur, now):
+    """
+        Асинхронно отменяет все просроченные неподтвержденные предложения мест одним запросом.
+
+        Параметры:
+            cur: курсор базы данных для выполнения SQL-запросов
+            now: текущее время; просроченными считаются активные записи с expires_at <= now
+
+        Возвращает:
+            list: список кортежей в формате find_spot_confirmations_by_user:
+                - user_id, tg_id, spot_id, release_date, release_id, request_id
+
+        Логика:
+            - expired: деактивирует просроченные подтверждения
+            - released: возвращает места из статуса 'WAITING' в 'PENDING'
+            - canceled: переводит запросы из 'WAITING_CONFIRMATION' в 'CANCELED'
+
+        Особенности:
+            - Повторяет process_spot_cancel для всех просроченных предложений сразу
+            - Места и запросы, успевшие сменить статус (подтверждены или отменены вручную),
+              не затрагиваются
+            - Функция асинхронная, требует await при вызове
+    """
+    await cur.execute("""
+                WITH expired AS (
+                    UPDATE dont_touch.spot_confirmations
+                        SET is_active = FALSE,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE is_active = TRUE
+                            AND expires_at <= %(now)s
+                        RETURNING user_id, release_id, request_id),
+                     released AS (
+                         UPDATE dont_touch.parking_releases prl
+                             SET status = 'PENDING',
+                                 user_id_took = NULL
+                             FROM expired
+                             WHERE prl.id = expired.release_id
+                                 AND prl.status = 'WAITING'
+                             RETURNING prl.id, prl.spot_id, prl.release_date),
+                     canceled AS (
+                         UPDATE dont_touch.parking_requests prq
+                             SET status = 'CANCELED'
+                             FROM expired
+                             WHERE prq.id = expired.request_id
+                                 AND prq.status = 'WAITING_CONFIRMATION')
+                SELECT u.user_id,
+                       u.tg_id,
+                       released.spot_id,
+                       released.release_date,
+                       expired.release_id,
+                       expired.request_id
+                FROM expired
+                         JOIN released ON released.id = expired.release_id
+                         JOIN dont_touch.users u ON u.user_id = expired.user_id
+                """, {'now': now})
+
+    return await cur.fetchall()
@@ -23,7 +23,7 @@ async def get_parking_transfers_by_date(cur, date):
         - Используется для анализа передачи парковочных мест
         - Функция асинхронная, требует await при вызове
     """
-    cur.execute('''
+    await cur.execute('''
                 SELECT pr.spot_id,
                        recipient.tg_id AS recipient_tg_id,
                        owner.tg_id     AS owner_tg_id
@@ -35,7 +35,7 @@ async def get_parking_transfers_by_date(cur, date):
                     AND pr.status = 'ACCEPTED';
                 ''', (date,))
 
-    return cur.fetchall()
+    return await cur.fetchall()
 
 
 async def get_parking_transfers_by_week(cur, monday_date, friday_date):
@@ -64,7 +64,7 @@ async def get_parking_transfers_by_week(cur, monday_date, friday_date):
         - Используется для недельной статистики передачи парковочных мест
         - Функция асинхронная, требует await при вызове
     """
-    cur.execute('''
+    await cur.execute('''
                 SELECT pr.spot_id,
                        recipient.tg_id AS recipient_tg_id,
                        owner.tg_id     AS owner_tg_id
@@ -77,4 +77,309 @@ async def get_parking_transfers_by_week(cur, monday_date, friday_date):
                   AND pr.status = 'ACCEPTED';
                 ''', (monday_date, friday_date,))
 
-    return cur.fetchall()
\ No newline at end of file
+    return await cur.fetchall()
+
+async def refresh_daily_parking_stats(cur, date_from, date_to, is_final=False):
+    """
+    Асинхронно пересчитывает сводку daily_parking_stats за диапазон дат.
+
+    Параметры:
+        cur: курсор базы данных для выполнения SQL-запросов
+        date_from: первая дата диапазона (включительно)
+        date_to: последняя дата диапазона (включительно)
+        is_final: зафиксировать пересчитанные даты - больше они не пересчитываются
+
+    Логика:
+        - Для каждой даты диапазона считает освобождения и запросы по статусам (COUNT(*) FILTER),
+          количество трансферов и занятость по этажам
+        - Результат записывается одним INSERT ... ON CONFLICT DO UPDATE
+        - Уже зафиксированные даты пропускаются
+
+    Особенности:
+        - Агрегаты считаются только по строкам затронутых дат (индекс по дате), а не по всей истории
+        - Даты без освобождений и запросов получают нулевую строку
+        - Функция асинхронная, требует await при вызове
+    """
+    await cur.execute('''
+                INSERT INTO dont_touch.daily_parking_stats
+                (stat_date, releases_pending, releases_waiting, releases_accepted, releases_canceled,
+                 releases_not_found, requests_pending, requests_waiting_confirmation, requests_accepted,
+                 requests_canceled, requests_not_found, transfers, floor_occupancy, is_final, updated_at)
+                SELECT d.stat_date,
+                       rl.pending, rl.waiting, rl.accepted, rl.canceled, rl.not_found,
+                       rq.pending, rq.waiting_confirmation, rq.accepted, rq.canceled, rq.not_found,
+                       rl.transfers,
+                       COALESCE(fl.floor_occupancy, '{}'::jsonb),
+                       %(is_final)s,
+                       now()
+                FROM (SELECT generate_series(%(date_from)s::date, %(date_to)s::date, INTERVAL '1 day')::date
+                                 AS stat_date) d
+                         CROSS JOIN LATERAL (
+                    SELECT count(*) FILTER (WHERE pr.status = 'PENDING')   AS pending,
+                           count(*) FILTER (WHERE pr.status = 'WAITING')   AS waiting,
+                           count(*) FILTER (WHERE pr.status = 'ACCEPTED')  AS accepted,
+                           count(*) FILTER (WHERE pr.status = 'CANCELED')  AS canceled,
+                           count(*) FILTER (WHERE pr.status = 'NOT_FOUND') AS not_found,
+                           count(*) FILTER (WHERE pr.status = 'ACCEPTED'
+                               AND pr.user_id_took IS NOT NULL)           AS transfers
+                    FROM dont_touch.parking_releases pr
+                    WHERE pr.release_date = d.stat_date
+                    ) rl
+                         CROSS JOIN LATERAL (
+                    SELECT count(*) FILTER (WHERE prq.status = 'PENDING')              AS pending,
+                           count(*) FILTER (WHERE prq.status = 'WAITING_CONFIRMATION') AS waiting_confirmation,
+                           count(*) FILTER (WHERE prq.status = 'ACCEPTED')             AS accepted,
+                           count(*) FILTER (WHERE prq.status = 'CANCELED')             AS canceled,
+                           count(*) FILTER (WHERE prq.status = 'NOT_FOUND')            AS not_found
+                    FROM dont_touch.parking_requests prq
+                    WHERE prq.request_date = d.stat_date
+                    ) rq
+                         LEFT JOIN LATERAL (
+                    SELECT jsonb_object_agg(f.floor_number, f.occupied) AS floor_occupancy
+                    FROM (SELECT ps.floor_number, count(*) AS occupied
+                          FROM dont_touch.parking_releases pr
+                                   JOIN dont_touch.parking_spots ps ON ps.spot_id = pr.spot_id
+                          WHERE pr.release_date = d.stat_date
+                            AND pr.status = 'ACCEPTED'
+                            AND ps.floor_number IS NOT NULL
+                          GROUP BY ps.floor_number) f
+                    ) fl ON TRUE
+                WHERE NOT EXISTS (SELECT 1
+                                  FROM dont_touch.daily_parking_stats s
+                                  WHERE s.stat_date = d.stat_date
+                                    AND s.is_final)
+                ON CONFLICT (stat_date) DO UPDATE
+                    SET releases_pending              = EXCLUDED.releases_pending,
+                        releases_waiting              = EXCLUDED.releases_waiting,
+                        releases_accepted             = EXCLUDED.releases_accepted,
+                        releases_canceled             = EXCLUDED.releases_canceled,
+                        releases_not_found            = EXCLUDED.releases_not_found,
+                        requests_pending              = EXCLUDED.requests_pending,
+                        requests_waiting_confirmation = EXCLUDED.requests_waiting_confirmation,
+                        requests_accepted             = EXCLUDED.requests_accepted,
+                        requests_canceled             = EXCLUDED.requests_canceled,
+                        requests_not_found            = EXCLUDED.requests_not_found,
+                        transfers                     = EXCLUDED.transfers,
+                        floor_occupancy               = EXCLUDED.floor_occupancy,
+                        is_final                      = EXCLUDED.is_final,
+                        updated_at                    = EXCLUDED.updated_at
+                ''', {'date_from': date_from, 'date_to': date_to, 'is_final': is_final})
+
+
+async def get_daily_stats_unfinalized_from(cur):
+    """
+    Асинхронно определяет первую дату, которую еще не зафиксировал ночной проход.
+
+    Параметры:
+        cur: курсор базы данных для выполнения SQL-запросов
+
+    Возвращает:
+        date или None: день после последней зафиксированной даты; если зафиксированных дат нет -
+                       самая ранняя дата освобождения или запроса; None, если данных нет совсем
+
+    Особенности:
+        - При первом запуске после миграции ночной проход заполняет сводку за всю историю
+        - Функция асинхронная, требует await при вызове
+    """
+    await cur.execute('''
+                SELECT COALESCE(
+                               (SELECT max(stat_date) + 1 FROM dont_touch.daily_parking_stats WHERE is_final),
+                               LEAST((SELECT min(release_date) FROM dont_touch.parking_releases),
+                                     (SELECT min(request_date) FROM dont_touch.parking_requests))
+                       )
+                ''')
+
+    return (await cur.fetchone())[0]
+
+
+async def get_first_unsettled_date(cur, before):
+    """
+    Асинхронно находит самую раннюю прошедшую дату, статусы которой еще могут измениться.
+
+    Параметры:
+        cur: курсор базы данных для выполнения SQL-запросов
+        before: граница: рассматриваются даты раньше нее (обычно сегодня)
+
+    Возвращает:
+        date или None: самая ранняя дата с освобождением в статусе 'WAITING', запросом в статусе
+                       'WAITING_CONFIRMATION' или активным подтверждением места; None, если таких нет
+
+    Особенности:
+        - Предложение, выданное незадолго до полуночи, истекает уже после ночного прохода:
+          sweep_expired_confirmations вернет место в 'PENDING' и отменит запрос. Такую дату и все
+          следующие нельзя фиксировать в сводках, пока предложение не закрыто
+        - Функция асинхронная, требует await при вызове
+    """
+    await cur.execute('''
+                SELECT LEAST((SELECT min(release_date)
+                              FROM dont_touch.parking_releases
+                              WHERE status = 'WAITING'
+                                AND release_date < %(before)s),
+                             (SELECT min(request_date)
+                              FROM dont_touch.parking_requests
+                              WHERE status = 'WAITING_CONFIRMATION'
+                                AND request_date < %(before)s),
+                             (SELECT min(prl.release_date)
+                              FROM dont_touch.spot_confirmations sc
+                                       JOIN dont_touch.parking_releases prl ON prl.id = sc.release_id
+                              WHERE sc.is_active = TRUE
+                                AND prl.release_date < %(before)s))
+                ''', {'before': before})
+
+    return (await cur.fetchone())[0]
+
+
+async def get_parking_stats_totals(cur, date_from, date_to):
+    """
+    Асинхронно суммирует сводку daily_parking_stats за диапазон дат.
+
+    Параметры:
+        cur: курсор базы данных для выполнения SQL-запросов
+        date_from: первая дата диапазона (включительно)
+        date_to: последняя дата диапазона (включительно)
+
+    Возвращает:
+        tuple: (releases_pending, releases_accepted, requests_not_found, requests_canceled, transfers)
+
+    Особенности:
+        - Читает по одной строке на дату (неделя - 5 строк) вместо сканирования исходных таблиц
+        - Для актуальных цифр изменяемые даты нужно предварительно пересчитать refresh_daily_parking_stats
+        - Функция асинхронная, требует await при вызове
+    """
+    await cur.execute('''
+                SELECT COALESCE(sum(releases_pending), 0),
+                       COALESCE(sum(releases_accepted), 0),
+                       COALESCE(sum(requests_not_found), 0),
+                       COALESCE(sum(requests_canceled), 0),
+                       COALESCE(sum(transfers), 0)
+                FROM dont_touch.daily_parking_stats
+                WHERE stat_date BETWEEN %s AND %s
+                ''', (date_from, date_to))
+
+    return await cur.fetchone()
+
+
+async def accumulate_user_parking_stats(cur, counted_through):
+    """
+    Асинхронно добавляет в user_parking_stats запросы, дата которых раньше counted_through.
+
+    Параметры:
+        cur: курсор базы данных для выполнения SQL-запросов
+        counted_through: граница: запросы с датой раньше нее считаются окончательными
+
+    Логика:
+        - Для каждого пользователя считает по статусам только запросы с датами между его прежней
+          границей и новой (COUNT(*) FILTER), и прибавляет их к накопленным счетчикам одним upsert
+        - Границу остальных пользователей сдвигает до counted_through тем же запросом
+
+    Особенности:
+        - Повторный вызов с той же границей ничего не меняет
+        - При первом запуске накапливает всю историю
+        - Функция асинхронная, требует await при вызове
+    """
+    await cur.execute('''
+                WITH since AS (SELECT COALESCE(min(counted_through), '-infinity'::date) AS since_date
+                               FROM dont_touch.user_parking_stats),
+                     delta AS (SELECT prq.user_id,
+                                      count(*) FILTER (WHERE prq.status = 'ACCEPTED')  AS accepted,
+                                      count(*) FILTER (WHERE prq.status = 'NOT_FOUND') AS not_found,
+                                      count(*) FILTER (WHERE prq.status = 'CANCELED')  AS canceled
+                               FROM dont_touch.parking_requests prq
+                                        LEFT JOIN dont_touch.user_parking_stats ups ON ups.user_id = prq.user_id
+                               WHERE prq.request_date < %(counted_through)s
+                                 AND prq.request_date >= (SELECT since_date FROM since)
+                                 AND prq.request_date >= COALESCE(ups.counted_through, '-infinity'::date)
+                               GROUP BY prq.user_id),
+                     upserted AS (
+                         INSERT INTO dont_touch.user_parking_stats
+                             (user_id, requests_accepted, requests_not_found, requests_canceled, counted_through)
+                             SELECT user_id, accepted, not_found, canceled, %(counted_through)s
+                             FROM delta
+                             ON CONFLICT (user_id) DO UPDATE
+                                 SET requests_accepted = user_parking_stats.requests_accepted
+                                                             + EXCLUDED.requests_accepted,
+                                     requests_not_found = user_parking_stats.requests_not_found
+                                                              + EXCLUDED.requests_not_found,
+                                     requests_canceled = user_parking_stats.requests_canceled
+                                                             + EXCLUDED.requests_canceled,
+                                     counted_through = EXCLUDED.counted_through,
+                                     updated_at = now()
+                             RETURNING user_id)
+                UPDATE dont_touch.user_parking_stats
+                SET counted_through = %(counted_through)s,
+                    updated_at      = now()
+                WHERE counted_through < %(counted_through)s
+                  AND user_id NOT IN (SELECT user_id FROM upserted)
+                ''', {'counted_through': counted_through})
+
+
+async def get_user_bookings_snapshot(cur, user_id, today):
+    """
+    Асинхронно получает сводку пользователя для "Моей статистики" и клавиатур отмены одним запросом.
+
+    Параметры:
+        cur: курсор базы данных для выполнения SQL-запросов
+        user_id: UUID идентификатор пользователя в базе данных
+        today: дата, начиная с которой запросы и освобождения считаются актуальными
+
+    Возвращает:
+        tuple: (accepted, not_found, canceled, requests, releases)
+            - accepted, not_found, canceled: количество запросов пользователя с этими статусами за всё время
+            - requests: список словарей {id, date, status, spot_id} актуальных запросов
+              (ACCEPTED, PENDING) по возрастанию даты; spot_id - назначенное место или None
+            - releases: список словарей {id, date, status, spot_id} актуальных освобождений
+              (ACCEPTED, PENDING, WAITING) по возрастанию даты
+
+    Логика:
+        - Счетчики: накопленные значения из user_parking_stats плюс COUNT(*) FILTER по запросам
+          начиная с границы counted_through
+        - Актуальные запросы и освобождения собираются json_agg в подзапросах того же SELECT
+
+    Особенности:
+        - Один round trip вместо отдельных запросов на счетчики, запросы и освобождения
+        - Стоимость не растет с длиной истории пользователя
+        - Функция асинхронная, требует await при вызове
+    """
+    await cur.execute('''
+                WITH ups AS (SELECT *
+                             FROM dont_touch.user_parking_stats
+                             WHERE user_id = %(user_id)s),
+                     counts AS (SELECT COALESCE((SELECT requests_accepted FROM ups), 0)
+                                           + count(*) FILTER (WHERE pr.status = 'ACCEPTED')  AS accepted,
+                                       COALESCE((SELECT requests_not_found FROM ups), 0)
+                                           + count(*) FILTER (WHERE pr.status = 'NOT_FOUND') AS not_found,
+                                       COALESCE((SELECT requests_canceled FROM ups), 0)
+                                           + count(*) FILTER (WHERE pr.status = 'CANCELED')  AS canceled
+                                FROM dont_touch.parking_requests pr
+                                WHERE pr.user_id = %(user_id)s
+                                  AND pr.request_date >= COALESCE((SELECT counted_through FROM ups),
+                                                                  '-infinity'::date))
+                SELECT counts.accepted,
+                       counts.not_found,
+                       counts.canceled,
+                       (SELECT COALESCE(json_agg(json_build_object('id', pr.id,
+                                                                   'date', pr.request_date,
+                                                                   'status', pr.status,
+                                                                   'spot_id', prel.spot_id)
+                                                 ORDER BY pr.request_date), '[]'::json)
+                        FROM dont_touch.parking_requests pr
+                                 LEFT JOIN dont_touch.parking_releases prel
+                                           ON pr.user_id = prel.user_id_took
+                                               AND pr.request_date = prel.release_date
+                                               AND prel.status = 'ACCEPTED'
+                        WHERE pr.user_id = %(user_id)s
+                          AND pr.request_date >= %(today)s
+                          AND pr.status IN ('ACCEPTED', 'PENDING')),
+                       (SELECT COALESCE(json_agg(json_build_object('id', prel.id,
+                                                                   'date', prel.release_date,
+                                                                   'status', prel.status,
+                                                                   'spot_id', prel.spot_id)
+                                                 ORDER BY prel.release_date), '[]'::json)
+                        FROM dont_touch.parking_releases prel
+                        WHERE prel.user_id = %(user_id)s
+                          AND prel.release_date >= %(today)s
+                          AND prel.status IN ('ACCEPTED', 'PENDING', 'WAITING'))
+                FROM counts
+                ''', {'user_id': user_id, 'today': today})
+
+    return await cur.fetchone()
@@ -24,11 +24,11 @@ async def get_user_id_by_tg_id(cur, tg_id):
         - Асинхронная функция, требует await при вызове
         - Является ключевой функцией для аутентификации и авторизации пользователей
     """
-    cur.execute(
+    await cur.execute(
         'SELECT user_id FROM dont_touch.users WHERE tg_id = %s',
         (tg_id,)
     )
-    return cur.fetchone()
+    return await cur.fetchone()
 
 
 async def decrement_user_rating(cur, db_user_id):
@@ -51,14 +51,14 @@ async def decrement_user_rating(cur, db_user_id):
         - Асинхронная функция, требует await при вызове
         - Система поощряет справедливость - те, кто получил больше мест, имеют меньший приоритет
     """
-    cur.execute("""
+    await cur.execute("""
                 UPDATE dont_touch.users
                 SET rating = rating - 1
                 WHERE user_id = %s
                 RETURNING user_id
                 """, (db_user_id,))
 
-    return cur.fetchone()
+    return await cur.fetchone()
 
 async def increment_user_rating(cur, user_id):
     """
@@ -80,8 +80,107 @@ async def increment_user_rating(cur, user_id):
         - Асинхронная функция, требует await при вызове
         - Система поощряет справедливость - те, кто получил больше мест, имеют меньший приоритет
     """
-    cur.execute('''
+    await cur.execute('''
                 UPDATE dont_touch.users
                 SET rating = rating + 1
                 WHERE user_id = %s
                 ''', (user_id,))
+
+
+async def get_user_names_by_tg_ids(cur, tg_ids, updated_after):
+    """
+    Возвращает сохраненные имена пользователей Telegram для списка tg_id.
+
+    Параметры:
+        cur: курсор базы данных для выполнения SQL-запросов
+        tg_ids: список идентификаторов пользователей в Telegram
+        updated_after: имена, обновленные раньше этого момента, считаются устаревшими
+
+    Возвращает:
+        list[tuple]: строки (tg_id, first_name, last_name, username)
+
+    Особенности:
+        - Пользователи без сохраненных или с устаревшими именами в результат не попадают
+        - Один запрос на весь список вместо обращения к Telegram по каждому пользователю
+    """
+    await cur.execute('''
+        SELECT tg_id, first_name, last_name, username
+        FROM dont_touch.users
+        WHERE tg_id = ANY(%(tg_ids)s::bigint[])
+          AND names_updated_at > %(updated_after)s
+        ''', {'tg_ids': list(tg_ids), 'updated_after': updated_after})
+    return await cur.fetchall()
+
+
+async def update_user_names(cur, tg_ids, first_names, last_names, usernames):
+    """
+    Сохраняет имена пользователей Telegram одним запросом.
+
+    Параметры:
+        cur: курсор базы данных для выполнения SQL-запросов
+        tg_ids: идентификаторы пользователей в Telegram
+        first_names, last_names, usernames: списки имен той же длины, что и tg_ids
+
+    Логика:
+        - Параллельные массивы разворачиваются через unnest и применяются одним UPDATE
+        - Проставляет names_updated_at = now(), чтобы имена можно было переиспользовать после рестарта
+
+    Особенности:
+        - Обновляет только существующих пользователей, новых не создает
+    """
+    await cur.execute('''
+        UPDATE dont_touch.users AS u
+        SET first_name = n.first_name,
+            last_name = n.last_name,
+            username = n.username,
+            names_updated_at = now()
+        FROM unnest(%(tg_ids)s::bigint[], %(first_names)s::varchar[], %(last_names)s::varchar[],
+                    %(usernames)s::varchar[]) AS n(tg_id, first_name, last_name, username)
+        WHERE u.tg_id = n.tg_id
+        ''', {'tg_ids': list(tg_ids), 'first_names': list(first_names), 'last_names': list(last_names),
+              'usernames': list(usernames)})
+
+
+async def get_all_user_ids(cur):
+    """
+    Возвращает соответствие Telegram ID внутренним идентификаторам всех пользователей.
+
+    Параметры:
+        cur: курсор базы данных для выполнения SQL-запросов
+
+    Возвращает:
+        list[tuple]: строки (tg_id, user_id)
+
+    Особенности:
+        - Используется для прогрева кэша идентификаторов при старте бота одним запросом
+    """
+    await cur.execute('SELECT tg_id, user_id FROM dont_touch.users')
+    return await cur.fetchall()
+
+
+async def upsert_user_by_tg_id(cur, tg_id):
+    """
+    Регистрирует пользователя по Telegram ID, если его еще нет, и возвращает его идентификатор.
+
+    Параметры:
+        cur: курсор базы данных для выполнения SQL-запросов
+        tg_id: уникальный идентификатор пользователя в Telegram
+
+    Возвращает:
+        tuple: (user_id, inserted), где inserted = True, если пользователь создан этим вызовом
+
+    Логика:
+        - INSERT ... ON CONFLICT (tg_id) вместо SELECT и последующего INSERT
+        - Холостой DO UPDATE нужен, чтобы RETURNING вернул user_id и для существующего пользователя
+        - xmax = 0 только у строки, вставленной в текущей транзакции
+
+    Особенности:
+        - Безопасна при одновременной регистрации одного пользователя из нескольких обработчиков
+    """
+    await cur.execute('''
+        INSERT INTO dont_touch.users (user_id, tg_id)
+        VALUES (gen_random_uuid(), %s)
+        ON CONFLICT (tg_id) DO UPDATE SET tg_id = EXCLUDED.tg_id
+        RETURNING user_id, (xmax = 0) AS inserted
+        ''', (tg_id,))
+    return await cur.fetchone()
@@ -1,34 +1,49 @@
 import logging
-from datetime import date
+from datetime import date, timedelta
 
 import psycopg2
 
 from app.bot.constants.log_types import LogNotification
 from app.bot.notification.log_notification import send_log_notification
+from app.bot.service.statistics_service import invalidate_weekly_reports
 from app.data.init_db import get_db_connection
 from app.data.models.releases.parking_releases import ParkingReleaseStatus
 from app.data.models.requests.parking_requests import ParkingRequestStatus
+from app.data.repository.statistics_repository import get_daily_stats_unfinalized_from, \
+    refresh_daily_parking_stats, accumulate_user_parking_stats, get_first_unsettled_date
 from app.log_text import STATUS_UPDATE_ERROR, DATABASE_ERROR
 
 
 async def update_statuses_service():
     today = date.today()
     try:
-        with get_db_connection() as conn:
+        async with get_db_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute('''
+                await cur.execute('''
                             UPDATE dont_touch.parking_releases
                             SET status = %s
                             WHERE status = %s
                                 AND release_date < %s
                             ''', (ParkingReleaseStatus.NOT_FOUND.value, ParkingReleaseStatus.PENDING.name, today))
 
-                cur.execute('''
+                await cur.execute('''
                             UPDATE dont_touch.parking_requests
                             SET status = %s
                             WHERE status = %s
                               AND request_date < %s
                             ''', (ParkingRequestStatus.NOT_FOUND.value, ParkingRequestStatus.PENDING.name, today))
+
+                # Прошедшие даты больше не меняются: фиксируем их в сводках статистики. Дата с еще
+                # открытым предложением места (и все после нее) ждет следующего прохода
+                settled_through = await get_first_unsettled_date(cur, today) or today
+                unfinalized_from = await get_daily_stats_unfinalized_from(cur)
+                if unfinalized_from is not None and unfinalized_from < settled_through:
+                    await refresh_daily_parking_stats(cur, unfinalized_from, settled_through - timedelta(days=1),
+                                                      is_final=True)
+                await accumulate_user_parking_stats(cur, settled_through)
+
+        # Вчерашние статусы закрыты - отчет за неделю с этим днем нужно собрать заново
+        invalidate_weekly_reports({today - timedelta(days=1), today})
     except psycopg2.Error as e:
         logging.error(DATABASE_ERROR.format(e))
         await send_log_notification(LogNotification.ERROR, DATABASE_ERROR.format(e))
@@ -1,7 +1,10 @@
 # PARKING SPOTS ERRORS
 PARKING_DISTRIBUTION_ERROR = "Error distributing parking spots: {}"
+DISTRIBUTION_WORKER_ERROR = "Error in distribution worker run: {}"
+DISTRIBUTION_NOTIFICATION_ERROR = "Error sending distribution notification: {}"
 SPOT_TAKING_ERROR = "Error in taking spot for user {} : {}"
 SPOT_CHECK_ERROR = "Error checking spot number {}: {}"
+SPOT_CATALOG_REFRESH_ERROR = "Error refreshing parking spot catalog: {}"
 SPOT_RELEASE_SAVE_ERROR = "Error saving release for user {}, spot {}: {}"
 SPOT_REQUEST_SAVE_ERROR = "Error saving spot request for user {}, date {}: {}"
 
@@ -9,14 +12,17 @@ SPOT_REQUEST_SAVE_ERROR = "Error saving spot request for user {}, date {}: {}"
 SPOT_CONFIRMATION_PROCESSING_ERROR = "Error processing spot confirmation: {}"
 SPOT_CANCEL_PROCESSING_ERROR = "Error processing spot cancel: {}"
 SPOT_CANCEL_ERROR = "Error cancel spot for user {}: {}"
-AUTO_CANCEL_SPOT_ERROR = "Error in auto_cancel_spot: {}"
-AUTO_CANCEL_SPOT_FAILED = "Failed to auto-cancel spot for user {}"
+CONFIRMATION_SWEEP_ERROR = "Error sweeping expired spot confirmations: {}"
 SPOT_REMINDER_ERROR = "Error in spot_reminder: {}"
+SPOT_REMINDER_SUMMARY = "Spot reminders for {}: {} sent, {} blocked, {} failed"
+SPOT_REMINDER_SEND_ERROR = "Error sending spot reminder to user {}: {}"
 
 # USER RELATED ERRORS
 USER_REGISTRATION_ERROR = "Error registering user {}: {}"
 USER_MENTION_ERROR = "Error getting user full mention for {}: {}"
 USER_NOTIFICATION_ERROR = "Error sending notification to user {}: {}"
+OUTBOUND_SEND_ERROR = "Error sending queued message: {}"
+OUTBOUND_RETRY_AFTER = "Telegram flood control for chat {}, retrying after {}s"
 USER_STATISTICS_ERROR = "Error in getting user statistics: {}"
 USER_MINUS_RATING_ERROR = "Error minus rating for user {}, tg id: {}"
 
@@ -28,9 +34,9 @@ WEEKLY_STATISTICS_SERVICE_ERROR = "Error in weekly_statistics_service: {}"
 WEEKLY_STATISTICS_SEND_ERROR = "Error sending weekly statistics: {}"
 
 # SYSTEM & SCHEDULING ERRORS
-SCHEDULED_JOB_CANCEL_ERROR = "Error cancelling scheduled job: {}"
 STATUS_UPDATE_ERROR = "Error update statuses: {}"
 CHAT_ACCESS_ERROR = "There is no access to the chat {}: {}"
+CHAT_MEMBER_CHECK_ERROR = "Error checking membership of user {} in chat {}: {}"
 
 # MESSAGE PROCESSING ERRORS
 PINNED_MESSAGE_PROCESSING_WARNING = "Failed to process previous pinned message: {}"
@@ -44,6 +50,8 @@ FEEDBACK_HANDLE_ERROR = "Error in handle_feedback: {}"
 
 # DATABASE ERRORS
 DATABASE_ERROR = "Database error: {}"
+DB_POOL_HEALTH_CHECK_FAILED = "Pooled connection failed health check: {}"
+DB_POOL_RECYCLE_ERROR = "Error recycling pooled connections: {}"
 
 # UNEXPECTED ERRORS
 UNEXPECTED_ERROR = "Unexpected error: {}"
\ No newline at end of file
@@ -3,8 +3,16 @@ import asyncio
 
 from app.bot import dp
 from app.bot.config import bot
+from app.bot.notification.log_notification import init_log_aggregator, stop_log_aggregator
+from app.bot.notification.outbound_queue import init_outbound_queue, stop_outbound_queue
+from app.bot.service.distribution_worker import init_distribution_worker, stop_distribution_worker, \
+    request_distribution
+from app.bot.service.spots.confirmation_sweeper_service import sweep_expired_confirmations
+from app.bot.service.spots.spot_catalog import init_spot_catalog
+from app.bot.service.user_service import warm_identity_cache
 from app.schedule.schedule_utils import init_scheduler
 from app.schedule.statistics_schedule import setup_scheduler
+from app.data.db_pool import init_db_pool, close_db_pool
 from app.data.init_db import init_database
 
 async def main():
@@ -16,14 +24,48 @@ async def main():
         format='%(asctime)s - %(filename)s - %(funcName)s - %(lineno)d - %(name)s - %(levelname)s - %(message)s'
     )
 
+    # Очередь исходящих сообщений Telegram
+    outbound_queue = init_outbound_queue()
+    log_aggregator = init_log_aggregator()
+
+    # Пул соединений с базой данных
+    db_pool = await init_db_pool()
+
+    # Кэш tg_id -> user_id, чтобы обработчики не ходили за ним в базу
+    await warm_identity_cache()
+
+    # Справочник парковочных мест в памяти
+    await init_spot_catalog()
+
+    # Фоновое распределение мест
+    distribution_worker = init_distribution_worker()
+
     # Запуск планировщика
     scheduler = setup_scheduler()
     init_scheduler(scheduler)
     scheduler.start()
 
+    # Отмена предложений мест, просроченных за время простоя бота
+    await sweep_expired_confirmations(fill_missing_deadlines=True)
+
+    # Догоняющий полный проход: действия перед аварийной остановкой могли остаться нераспределенными
+    request_distribution()
+
     # Запуск бота
-    await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
+    try:
+        await bot.delete_webhook(drop_pending_updates=True)
+        # chat_member не приходит по умолчанию: явно перечисляем все типы обновлений, на которые есть обработчики
+        await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+    finally:
+        scheduler.shutdown(wait=False)
+        logging.warning(f"Distribution worker stats: {distribution_worker.stats()}")
+        await stop_distribution_worker()
+        logging.warning(f"Database pool stats: {db_pool.stats()}")
+        await close_db_pool()
+        logging.warning(f"Log aggregator stats: {log_aggregator.stats()}")
+        await stop_log_aggregator()
+        logging.warning(f"Outbound queue stats: {outbound_queue.stats()}")
+        await stop_outbound_queue()
 
 if __name__ == "__main__":
     try:
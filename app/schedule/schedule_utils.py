@@ -1,9 +1,4 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-import logging
-
-from app.bot.constants.log_types import LogNotification
-from app.bot.notification.log_notification import send_log_notification
-from app.log_text import SCHEDULED_JOB_CANCEL_ERROR
 
 _scheduler = None
 
@@ -20,23 +15,3 @@ def get_scheduler() -> AsyncIOScheduler:
         raise RuntimeError("Scheduler not initialized. Call init_scheduler first.")
     return _scheduler
 
-
-async def cancel_scheduled_cancellation(confirmation_data):
-    """
-    Отменяет запланированную автоматическую отмену места
-    """
-    try:
-        scheduler = get_scheduler()
-        job_id = f"auto_cancel_{confirmation_data.tg_user_id}_{confirmation_data.assignment_date}"
-
-        job = scheduler.get_job(job_id)
-        if job:
-            scheduler.remove_job(job_id)
-            logging.debug(f"Cancelled scheduled job: {job_id}")
-            return True
-        return False
-
-    except Exception as e:
-        logging.error(SCHEDULED_JOB_CANCEL_ERROR.format(e))
-        await send_log_notification(LogNotification.ERROR, SCHEDULED_JOB_CANCEL_ERROR.format(e))
-        return False
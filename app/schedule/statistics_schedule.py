@@ -1,5 +1,10 @@
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
+from app.bot.config import CONFIRMATION_SWEEP_SECONDS, SPOT_CATALOG_REFRESH_SECONDS
+from app.bot.service.distribution_worker import full_distribution_sweep
+from app.bot.service.spots.confirmation_sweeper_service import sweep_expired_confirmations
+from app.bot.service.spots.spot_catalog import refresh_spot_catalog
 from app.bot.service.spots.spot_reminder_service import spot_reminder
 from app.bot.service.statistics_service import daily_statistics_service, weekly_statistics_service
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -64,4 +69,33 @@ def setup_scheduler():
         id='daily_updating_statuses'
     )
 
+    # Ежедневно в 9:00 ТОЛЬКО по будням - полное распределение по всем датам
+    scheduler.add_job(
+        full_distribution_sweep,
+        trigger=CronTrigger(
+            hour=9,
+            minute=0,
+            day_of_week='mon-fri'
+        ),
+        id='daily_full_distribution'
+    )
+
+    # Каждые CONFIRMATION_SWEEP_SECONDS секунд - отмена просроченных предложений мест
+    scheduler.add_job(
+        sweep_expired_confirmations,
+        trigger=IntervalTrigger(seconds=CONFIRMATION_SWEEP_SECONDS),
+        id='confirmation_sweeper',
+        max_instances=1,
+        coalesce=True
+    )
+
+    # Каждые SPOT_CATALOG_REFRESH_SECONDS секунд - перечитывание справочника парковочных мест
+    scheduler.add_job(
+        refresh_spot_catalog,
+        trigger=IntervalTrigger(seconds=SPOT_CATALOG_REFRESH_SECONDS),
+        id='spot_catalog_refresh',
+        max_instances=1,
+        coalesce=True
+    )
+
     return scheduler
\ No newline at end of file
@@ -1,25 +1,43 @@
 import asyncio
 import time
-from typing import Any, Optional
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
 
 
 class InMemoryCache:
-    """Простой кэш в памяти с поддержкой TTL (времени жизни ключей)."""
+    """
+    Простой кэш в памяти с поддержкой TTL (времени жизни ключей).
 
-    def __init__(self):
-        self._cache = {}
+    :param max_size: максимальное количество ключей; при переполнении вытесняется
+                     давно не использованный ключ (LRU). None - без ограничения
+    :param default_ttl: время жизни по умолчанию для set() без ttl (в секундах)
+    """
+
+    def __init__(self, max_size: Optional[int] = None, default_ttl: Optional[int] = None):
+        self._cache = OrderedDict()
         self._lock = asyncio.Lock()
+        self.max_size = max_size
+        self.default_ttl = default_ttl
 
     async def set(self, key: int, value: Any, ttl: Optional[int] = None):
         """
         Сохраняет значение по ключу.
         :param key: ключ (например, user_id)
         :param value: сохраняемое значение
-        :param ttl: время жизни (в секундах), по истечении удаляется
+        :param ttl: время жизни (в секундах), по истечении удаляется; по умолчанию default_ttl
         """
+        ttl = ttl or self.default_ttl
+        expire_time = time.time() + ttl if ttl else None
+        async with self._lock:
+            self._store(key, value, expire_time)
+
+    async def set_many(self, items: dict, ttl: Optional[int] = None):
+        """Сохраняет несколько значений за один захват блокировки."""
+        ttl = ttl or self.default_ttl
         expire_time = time.time() + ttl if ttl else None
         async with self._lock:
-            self._cache[key] = (value, expire_time)
+            for key, value in items.items():
+                self._store(key, value, expire_time)
 
     async def get(self, key: int) -> Optional[Any]:
         """Возвращает значение по ключу или None, если не найдено или истек TTL."""
@@ -34,8 +52,26 @@ class InMemoryCache:
                 del self._cache[key]
                 return None
 
+            self._cache.move_to_end(key)
             return value
 
+    async def get_many(self, keys: Iterable) -> dict:
+        """Возвращает словарь найденных и не истекших значений для переданных ключей."""
+        found = {}
+        async with self._lock:
+            now = time.time()
+            for key in keys:
+                item = self._cache.get(key)
+                if not item:
+                    continue
+                value, expire_time = item
+                if expire_time and now > expire_time:
+                    del self._cache[key]
+                    continue
+                self._cache.move_to_end(key)
+                found[key] = value
+        return found
+
     async def get_all(self):
         return self._cache
 
@@ -56,3 +92,10 @@ class InMemoryCache:
             expired_keys = [k for k, (_, t) in self._cache.items() if t and now > t]
             for k in expired_keys:
                 del self._cache[k]
+
+    def _store(self, key, value, expire_time):
+        self._cache[key] = (value, expire_time)
+        self._cache.move_to_end(key)
+        if self.max_size is not None:
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
@@ -0,0 +1,62 @@
+"""
+Бенчмарк движка распределения мест в отрыве от базы данных и бота.
+
+Генерирует снимок из --users кандидатов со случайными рейтингами и датами последнего
+получения места и --spots свободных мест, затем --repeat раз вызывает allocate() для каждой
+политики и печатает медиану и худшее время одного распределения.
+
+Запуск:
+    python -m benchmarks.allocation_engine --users 10000 --spots 500
+"""
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+
+from app.allocation.engine import allocate
+from app.allocation.policies import AllocationPolicyName, get_policy
+from app.allocation.records import Candidate, FreeRelease
+
+
+def build_snapshot(users, spots, rng):
+    today = date.today()
+    free_releases = [FreeRelease(uuid.UUID(int=rng.getrandbits(128)), spot_id) for spot_id in range(3, 3 + spots)]
+    candidates = []
+    for i in range(users):
+        last_assigned_date = today - timedelta(days=rng.randint(1, 60)) if rng.random() < 0.8 else None
+        candidates.append(Candidate(uuid.UUID(int=rng.getrandbits(128)), uuid.UUID(int=rng.getrandbits(128)),
+                                    rng.randint(0, 30), i + 1, last_assigned_date))
+    return free_releases, candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000, help="количество кандидатов")
+    parser.add_argument("--spots", type=int, default=500, help="количество свободных мест")
+    parser.add_argument("--repeat", type=int, default=20, help="количество повторов на политику")
+    parser.add_argument("--seed", type=int, default=42, help="seed генератора снимка")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    free_releases, candidates = build_snapshot(args.users, args.spots, rng)
+
+    print(f"{'policy':<18} | {'median, ms':>10} | {'max, ms':>8} | {'assigned':>8} | {'mean rating':>11}")
+    for policy_name in AllocationPolicyName:
+        policy = get_policy(policy_name)
+        timings = []
+        assignments = []
+        for _ in range(args.repeat):
+            started_at = time.perf_counter()
+            assignments = allocate(free_releases, candidates, policy, rng)
+            timings.append(time.perf_counter() - started_at)
+
+        ratings = {candidate.user_id: candidate.rating for candidate in candidates}
+        mean_rating = statistics.fmean(ratings[a.user_id] for a in assignments) if assignments else 0.0
+        print(f"{policy_name.value:<18} | {statistics.median(timings) * 1000:>10.2f} | "
+              f"{max(timings) * 1000:>8.2f} | {len(assignments):>8} | {mean_rating:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
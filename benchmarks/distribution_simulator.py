@@ -0,0 +1,160 @@
+"""
+Симулятор распределения парковочных мест и бенчмарк пропускной способности.
+
+Создает в базе --users синтетических пользователей, часть из них (--owners) получает
+постоянные места из dont_touch.parking_spots. Затем для каждого рабочего дня --weeks недель,
+начиная с даты в далеком будущем, проигрывает поток действий в случайном порядке:
+владельцы освобождают место с вероятностью --release-probability, остальные запрашивают место
+с вероятностью --request-probability. Каждое действие выполняется через репозитории
+(insert_spot_on_date / insert_request_on_date), после него вызывается
+distribute_parking_spots() по затронутой дате - так же, как это делают колбэки бота.
+
+Отчет:
+    - assignments/sec: выданные места к суммарному времени распределения
+    - round trips / assignment: обращения к PostgreSQL во время распределения на одно место
+    - p50/p99 латентность одного вызова распределения
+    - Gini по users.rating синтетических пользователей после симуляции (0 - идеально ровно)
+
+Отправка сообщений в Telegram подменяется заглушками, синтетические данные удаляются после
+прогона. Используется как регрессионная проверка перед изменениями distribution_service,
+distribute_parking_spots_repository и индексов.
+
+Запуск (нужен локальный PostgreSQL с примененными миграциями и переменные окружения бота):
+    python -m benchmarks.distribution_simulator --users 300 --weeks 4
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import date, timedelta
+
+from app.bot.service import distribution_service
+from app.data.db_pool import close_db_pool, get_db_pool, init_db_pool
+from app.data.repository.parking_releases_repository import insert_spot_on_date
+from app.data.repository.parking_requests_repository import insert_request_on_date
+from benchmarks.distribution_stress import mute_notifications
+from benchmarks.event_loop_lag import percentile
+
+
+def gini(values):
+    """Коэффициент Джини для неотрицательных значений"""
+    ordered = sorted(values)
+    total = sum(ordered)
+    if not ordered or total == 0:
+        return 0.0
+    n = len(ordered)
+    weighted = sum(position * value for position, value in enumerate(ordered, start=1))
+    return 2 * weighted / (n * total) - (n + 1) / n
+
+
+def simulation_dates(weeks):
+    start = date.today() + timedelta(days=3650)
+    monday = start - timedelta(days=start.weekday()) + timedelta(weeks=1)
+    return [monday + timedelta(weeks=week, days=day) for week in range(weeks) for day in range(5)]
+
+
+async def seed_users(pool, users, owners):
+    async with pool.connection() as conn:
+        with conn.cursor() as cur:
+            await cur.execute("SELECT spot_id FROM dont_touch.parking_spots ORDER BY spot_id")
+            spot_ids = [row[0] for row in await cur.fetchall()]
+            owners = min(owners, len(spot_ids))
+
+            tg_base = -random.randint(10 ** 6, 10 ** 9)
+            user_ids = [str(uuid.uuid4()) for _ in range(users)]
+            await cur.execute('''
+                INSERT INTO dont_touch.users (user_id, tg_id)
+                SELECT user_id, %s - position
+                FROM unnest(%s::uuid[]) WITH ORDINALITY AS u(user_id, position)
+                ''', (tg_base, user_ids))
+
+    owned_spots = dict(zip(user_ids[:owners], spot_ids))
+    return user_ids, owned_spots
+
+
+async def run_action(pool, action, user_id, action_date, spot_id):
+    async with pool.connection() as conn:
+        with conn.cursor() as cur:
+            if action == "release":
+                await insert_spot_on_date(cur, user_id, spot_id, action_date)
+            else:
+                await insert_request_on_date(cur, user_id, action_date)
+
+
+async def collect_results(pool, user_ids, dates):
+    async with pool.connection() as conn:
+        with conn.cursor() as cur:
+            await cur.execute('''
+                SELECT count(*)
+                FROM dont_touch.parking_releases
+                WHERE release_date = ANY(%s::date[])
+                  AND status = 'ACCEPTED'
+                ''', (dates,))
+            assigned, = await cur.fetchone()
+            await cur.execute("SELECT rating FROM dont_touch.users WHERE user_id = ANY(%s::uuid[])", (user_ids,))
+            ratings = [row[0] for row in await cur.fetchall()]
+    return assigned, ratings
+
+
+async def cleanup(pool, user_ids):
+    async with pool.connection() as conn:
+        with conn.cursor() as cur:
+            await cur.execute("DELETE FROM dont_touch.users WHERE user_id = ANY(%s::uuid[])", (user_ids,))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=300, help="количество синтетических пользователей")
+    parser.add_argument("--owners", type=int, default=100, help="сколько из них владеют местом")
+    parser.add_argument("--weeks", type=int, default=4, help="количество недель симуляции")
+    parser.add_argument("--release-probability", type=float, default=0.3,
+                        help="вероятность, что владелец освободит место в конкретный день")
+    parser.add_argument("--request-probability", type=float, default=0.4,
+                        help="вероятность, что пользователь без места запросит место в конкретный день")
+    parser.add_argument("--seed", type=int, default=42, help="seed генератора действий")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    mute_notifications()
+    await init_db_pool()
+    pool = get_db_pool()
+    user_ids, owned_spots = await seed_users(pool, args.users, args.owners)
+    dates = simulation_dates(args.weeks)
+
+    latencies = []
+    distribution_round_trips = 0
+    actions_count = 0
+    try:
+        for action_date in dates:
+            actions = [("release", user_id) for user_id in owned_spots
+                       if random.random() < args.release_probability]
+            actions += [("request", user_id) for user_id in user_ids
+                        if user_id not in owned_spots and random.random() < args.request_probability]
+            random.shuffle(actions)
+
+            for action, user_id in actions:
+                await run_action(pool, action, user_id, action_date, owned_spots.get(user_id))
+                round_trips_before = pool.stats()["round_trips"]
+                started_at = time.perf_counter()
+                await distribution_service.distribute_parking_spots({action_date})
+                latencies.append(time.perf_counter() - started_at)
+                distribution_round_trips += pool.stats()["round_trips"] - round_trips_before
+            actions_count += len(actions)
+
+        assigned, ratings = await collect_results(pool, user_ids, dates)
+    finally:
+        await cleanup(pool, user_ids)
+        await close_db_pool()
+
+    distribution_time = sum(latencies)
+    print(f"dates: {len(dates)}, actions: {actions_count}, assignments: {assigned}")
+    print(f"assignments/sec:           {assigned / distribution_time if distribution_time else 0.0:.1f}")
+    print(f"round trips / assignment:  {distribution_round_trips / assigned if assigned else 0.0:.2f}")
+    print(f"distribution latency p50:  {percentile(latencies, 50) * 1000:.1f} ms")
+    print(f"distribution latency p99:  {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"rating Gini:               {gini(ratings):.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
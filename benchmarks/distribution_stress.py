@@ -0,0 +1,139 @@
+"""
+Стресс-проверка параллельного распределения парковочных мест.
+
+Засевает в базу одну дату в далеком будущем: --spots освобожденных мест и --requests запросов
+от отдельных пользователей. Затем запускает --runs параллельных distribute_parking_spots() на эту
+дату (как если бы одновременно сработали клик освобождения, отмена и автоотмена) и проверяет
+инварианты:
+    - ни одно освобождение не выдано дважды и каждое занятое место принадлежит ровно одному запросу
+    - ни один пользователь не получил больше одного места на дату
+    - выдано ровно min(spots, requests) мест - параллельные запуски не потеряли работу
+
+Отправка сообщений в Telegram на время проверки подменяется заглушками. Засеянные данные
+удаляются после проверки.
+
+Запуск (нужен локальный PostgreSQL с примененными миграциями и переменные окружения бота):
+    python -m benchmarks.distribution_stress --spots 40 --requests 60 --runs 20
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+from app.bot.service import distribution_service
+from app.data.db_pool import close_db_pool, get_db_pool, init_db_pool
+
+FIRST_SPOT_ID = 3
+LAST_SPOT_ID = 173
+
+
+async def _silent_notification(*args, **kwargs):
+    return ""
+
+
+def mute_notifications():
+    for name in ("notify_user", "to_owner_message", "to_user_about_assigned_spot", "to_user_about_found_spot"):
+        setattr(distribution_service, name, _silent_notification)
+
+
+async def seed(pool, distribution_date, spots, requests):
+    tg_base = -random.randint(10 ** 6, 10 ** 9)
+    owners = [(str(uuid.uuid4()), tg_base - i) for i in range(spots)]
+    requesters = [(str(uuid.uuid4()), tg_base - spots - i) for i in range(requests)]
+
+    async with pool.connection() as conn:
+        with conn.cursor() as cur:
+            for user_id, tg_id in owners + requesters:
+                await cur.execute("INSERT INTO dont_touch.users (user_id, tg_id, rating) VALUES (%s, %s, %s)",
+                                  (user_id, tg_id, random.randint(0, 3)))
+            for (user_id, _), spot_id in zip(owners, range(FIRST_SPOT_ID, LAST_SPOT_ID + 1)):
+                await cur.execute('''
+                    INSERT INTO dont_touch.parking_releases (id, user_id, spot_id, release_date)
+                    VALUES (%s, %s, %s, %s)
+                    ''', (str(uuid.uuid4()), user_id, spot_id, distribution_date))
+            for user_id, _ in requesters:
+                await cur.execute('''
+                    INSERT INTO dont_touch.parking_requests (id, user_id, request_date)
+                    VALUES (%s, %s, %s)
+                    ''', (str(uuid.uuid4()), user_id, distribution_date))
+
+    return [user_id for user_id, _ in owners + requesters]
+
+
+async def check_invariants(pool, distribution_date, spots, requests):
+    async with pool.connection() as conn:
+        with conn.cursor() as cur:
+            await cur.execute('''
+                SELECT count(*) FILTER (WHERE status = 'ACCEPTED'),
+                       count(DISTINCT user_id_took) FILTER (WHERE status = 'ACCEPTED')
+                FROM dont_touch.parking_releases
+                WHERE release_date = %s
+                ''', (distribution_date,))
+            accepted_releases, distinct_takers = await cur.fetchone()
+
+            await cur.execute('''
+                SELECT count(*)
+                FROM dont_touch.parking_requests
+                WHERE request_date = %s
+                  AND status = 'ACCEPTED'
+                ''', (distribution_date,))
+            accepted_requests, = await cur.fetchone()
+
+    expected = min(spots, requests)
+    failures = []
+    if accepted_releases != distinct_takers:
+        failures.append(f"одному пользователю выдано несколько мест: {accepted_releases} мест, "
+                        f"{distinct_takers} получателей")
+    if accepted_releases != accepted_requests:
+        failures.append(f"мест выдано {accepted_releases}, запросов удовлетворено {accepted_requests}")
+    if accepted_releases != expected:
+        failures.append(f"ожидалось {expected} выданных мест, выдано {accepted_releases}")
+    return accepted_releases, failures
+
+
+async def cleanup(pool, user_ids):
+    async with pool.connection() as conn:
+        with conn.cursor() as cur:
+            await cur.execute("DELETE FROM dont_touch.users WHERE user_id = ANY(%s::uuid[])", (user_ids,))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spots", type=int, default=40, help="количество освобожденных мест")
+    parser.add_argument("--requests", type=int, default=60, help="количество запросов на место")
+    parser.add_argument("--runs", type=int, default=20, help="количество параллельных запусков распределения")
+    args = parser.parse_args()
+
+    if args.spots > LAST_SPOT_ID - FIRST_SPOT_ID + 1:
+        parser.error(f"--spots не может превышать {LAST_SPOT_ID - FIRST_SPOT_ID + 1}")
+
+    mute_notifications()
+    await init_db_pool()
+    pool = get_db_pool()
+    distribution_date = date.today() + timedelta(days=random.randint(3650, 7300))
+    user_ids = await seed(pool, distribution_date, args.spots, args.requests)
+
+    try:
+        started_at = time.perf_counter()
+        counts = await asyncio.gather(*(distribution_service.distribute_parking_spots({distribution_date})
+                                        for _ in range(args.runs)))
+        elapsed = time.perf_counter() - started_at
+
+        assigned, failures = await check_invariants(pool, distribution_date, args.spots, args.requests)
+        print(f"runs: {args.runs}, assigned: {assigned}, reported by runs: {sum(c or 0 for c in counts)}, "
+              f"elapsed: {elapsed:.2f}s")
+        print(f"pool: {pool.stats()}")
+    finally:
+        await cleanup(pool, user_ids)
+        await close_db_pool()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,91 @@
+"""
+Бенчмарк задержки event loop при параллельных колбэках, обращающихся к базе данных.
+
+Каждый "колбэк" берет соединение из пула и выполняет медленный запрос (pg_sleep), как это делает
+тяжелый запрос статистики. Параллельно корутина-зонд каждые --probe-interval секунд засыпает
+и измеряет, насколько позже запланированного она проснулась - это и есть задержка event loop,
+которую чувствуют остальные пользователи.
+
+Сравниваются режимы DbExecutionMode.INLINE (прежнее поведение: блокирующий psycopg2 прямо
+в event loop) и DbExecutionMode.THREAD (вызовы уходят в ограниченный пул потоков).
+
+Запуск (нужен локальный PostgreSQL, параметры подключения берутся из переменных DB_*):
+    python -m benchmarks.event_loop_lag --callbacks 50 --query-seconds 0.05
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.data.db_executor import DbExecutionMode
+from app.data.db_pool import AsyncConnectionPool
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def probe_loop_lag(stop_event, interval, lags):
+    while not stop_event.is_set():
+        scheduled = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - scheduled))
+
+
+async def simulated_callback(pool, query_seconds):
+    async with pool.connection() as conn:
+        with conn.cursor() as cur:
+            await cur.execute("SELECT pg_sleep(%s)", (query_seconds,))
+            await cur.fetchone()
+
+
+async def run_mode(mode, callbacks, query_seconds, pool_size, probe_interval):
+    pool = AsyncConnectionPool(min_size=pool_size, max_size=pool_size, acquire_timeout=60,
+                               execution_mode=mode)
+    await pool.open()
+    lags = []
+    stop_event = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_lag(stop_event, probe_interval, lags))
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(simulated_callback(pool, query_seconds) for _ in range(callbacks)))
+    elapsed = time.perf_counter() - started_at
+
+    stop_event.set()
+    await probe
+    stats = pool.stats()
+    await pool.close()
+
+    return {
+        "mode": mode.value,
+        "elapsed": elapsed,
+        "lag_p50_ms": percentile(lags, 50) * 1000,
+        "lag_p99_ms": percentile(lags, 99) * 1000,
+        "lag_max_ms": max(lags, default=0.0) * 1000,
+        "lag_mean_ms": statistics.fmean(lags) * 1000 if lags else 0.0,
+        "pool_wait_max_ms": stats["wait_time_max"] * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--callbacks", type=int, default=50, help="количество параллельных колбэков")
+    parser.add_argument("--query-seconds", type=float, default=0.05, help="длительность одного запроса")
+    parser.add_argument("--pool-size", type=int, default=10, help="размер пула соединений")
+    parser.add_argument("--probe-interval", type=float, default=0.01, help="период зонда задержки")
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} | {'elapsed, s':>10} | {'lag p50, ms':>11} | {'lag p99, ms':>11} | "
+          f"{'lag max, ms':>11} | {'pool wait max, ms':>17}")
+    for mode in (DbExecutionMode.INLINE, DbExecutionMode.THREAD):
+        result = await run_mode(mode, args.callbacks, args.query_seconds, args.pool_size, args.probe_interval)
+        print(f"{result['mode']:<8} | {result['elapsed']:>10.2f} | {result['lag_p50_ms']:>11.1f} | "
+              f"{result['lag_p99_ms']:>11.1f} | {result['lag_max_ms']:>11.1f} | {result['pool_wait_max_ms']:>17.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,271 @@
+"""
+Проверка планов запросов репозиториев: ни один запрос не должен читать большие таблицы целиком.
+
+В одной транзакции засевает в базу --users синтетических пользователей и их освобождения
+и запросы на --days рабочих дней в далеком будущем, выполняет ANALYZE и затем вызывает
+каждую функцию из app/data/repository с курсором, который вместо выполнения запроса
+делает EXPLAIN (FORMAT JSON). Так проверяется ровно тот SQL, который отправляет бот,
+а изменяющие запросы не выполняются. В конце транзакция откатывается - засеянные данные
+в базе не остаются.
+
+По умолчанию планировщику запрещен Seq Scan (enable_seqscan = off): если он все равно выбран,
+значит подходящего индекса нет. --natural-costs отключает запрет и показывает планы, которые
+планировщик выберет на засеянном объеме данных.
+
+Запрос считается ошибкой, если в его плане есть Seq Scan по таблице, которой нет в
+ALLOWED_SEQ_SCANS для этой функции. Код возврата 1, если ошибки есть.
+
+Запуск (нужен локальный PostgreSQL с примененными миграциями и переменные окружения бота):
+    python -m benchmarks.explain_hot_queries --users 2000 --days 60
+"""
+import argparse
+import asyncio
+import random
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+
+from app.data.db_pool import close_db_pool, get_db_pool, init_db_pool
+from app.data.models.releases.releases_enum import ParkingReleaseStatus
+from app.data.models.requests.requests_enum import ParkingRequestStatus
+from app.data.repository import distribute_parking_spots_repository as distribution_repo
+from app.data.repository import parking_releases_repository as releases_repo
+from app.data.repository import parking_requests_repository as requests_repo
+from app.data.repository import parking_spots_repository as spots_repo
+from app.data.repository import spot_confirmations_repository as confirmations_repo
+from app.data.repository import statistics_repository as statistics_repo
+from app.data.repository import users_repository as users_repo
+
+FIRST_SPOT_ID = 3
+LAST_SPOT_ID = 173
+
+# Функции, которые читают таблицу целиком намеренно
+ALLOWED_SEQ_SCANS = {
+    # прогрев кэша tg_id -> user_id при старте
+    "get_all_user_ids": {"users"},
+    # справочник мест (~170 строк) при старте и по расписанию
+    "get_all_spots": {"parking_spots"},
+    # ночной проход сдвигает границу counted_through у всех пользователей
+    "accumulate_user_parking_stats": {"user_parking_stats"},
+}
+
+
+class ExplainCursor:
+    """Курсор, который вместо выполнения запроса сохраняет его план"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.plans = []
+
+    async def execute(self, query, params=None):
+        await self._cursor.execute("EXPLAIN (FORMAT JSON) " + query, params)
+        self.plans.append((await self._cursor.fetchone())[0][0]["Plan"])
+
+    async def fetchone(self):
+        # Функции репозиториев разбирают результат: отдаем строку из NULL подходящей длины
+        return (None,) * 8
+
+    async def fetchall(self):
+        return []
+
+    @property
+    def rowcount(self):
+        return 0
+
+
+def seq_scans(plan):
+    """Возвращает таблицы, которые план читает через Seq Scan"""
+    tables = []
+    if plan.get("Node Type") == "Seq Scan":
+        tables.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        tables.extend(seq_scans(child))
+    return tables
+
+
+class Seed:
+    """Засеянные данные, на которые ссылаются вызовы функций репозиториев"""
+
+    def __init__(self, user_ids, tg_ids, dates, release_ids, request_ids):
+        self.user_id = user_ids[0]
+        self.tg_id = tg_ids[0]
+        self.tg_ids = tg_ids[:50]
+        self.date = dates[0]
+        self.monday = dates[0] - timedelta(days=dates[0].weekday())
+        self.friday = self.monday + timedelta(days=4)
+        self.dates = dates[:5]
+        self.release_ids = release_ids[:10]
+        self.request_ids = request_ids[:10]
+        self.release_id = release_ids[0]
+        self.request_id = request_ids[0]
+
+
+async def seed(cur, users, days):
+    start = date.today() + timedelta(days=3650)
+    monday = start - timedelta(days=start.weekday()) + timedelta(weeks=1)
+    dates = [monday + timedelta(weeks=week, days=day) for week in range(days // 5 + 1) for day in range(5)][:days]
+
+    tg_base = -random.randint(10 ** 6, 10 ** 9)
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    tg_ids = [tg_base - position for position in range(users)]
+    await cur.execute('''
+        INSERT INTO dont_touch.users (user_id, tg_id, rating)
+        SELECT user_id, tg_id, floor(random() * 10)
+        FROM unnest(%s::uuid[], %s::bigint[]) AS u(user_id, tg_id)
+        ''', (user_ids, tg_ids))
+
+    owners = user_ids[:LAST_SPOT_ID - FIRST_SPOT_ID + 1]
+    requesters = user_ids[len(owners):]
+    statuses = ['PENDING', 'ACCEPTED', 'NOT_FOUND', 'CANCELED']
+    await cur.execute('''
+        INSERT INTO dont_touch.parking_releases (id, user_id, spot_id, release_date, status)
+        SELECT gen_random_uuid(), o.user_id, %(first_spot)s + o.position - 1, d.release_date,
+               (%(statuses)s::varchar[])[1 + floor(random() * 4)::int]
+        FROM unnest(%(owners)s::uuid[]) WITH ORDINALITY AS o(user_id, position)
+                 CROSS JOIN unnest(%(dates)s::date[]) AS d(release_date)
+        WHERE random() < 0.3
+        RETURNING id
+        ''', {'first_spot': FIRST_SPOT_ID, 'statuses': statuses, 'owners': owners, 'dates': dates})
+    release_ids = [str(row[0]) for row in await cur.fetchall()]
+
+    await cur.execute('''
+        INSERT INTO dont_touch.parking_requests (id, user_id, request_date, status)
+        SELECT gen_random_uuid(), r.user_id, d.request_date,
+               (%(statuses)s::varchar[])[1 + floor(random() * 4)::int]
+        FROM unnest(%(requesters)s::uuid[]) AS r(user_id)
+                 CROSS JOIN unnest(%(dates)s::date[]) AS d(request_date)
+        WHERE random() < 0.4
+        RETURNING id
+        ''', {'statuses': statuses, 'requesters': requesters, 'dates': dates})
+    request_ids = [str(row[0]) for row in await cur.fetchall()]
+
+    await cur.execute('''
+        INSERT INTO dont_touch.spot_confirmations (user_id, release_id, request_id, is_active, expires_at)
+        SELECT prq.user_id, prl.id, prq.id, random() < 0.1, now() + interval '15 minutes'
+        FROM dont_touch.parking_releases prl
+                 JOIN dont_touch.parking_requests prq ON prq.request_date = prl.release_date
+        WHERE prl.id = ANY(%s::uuid[])
+          AND prq.id = ANY(%s::uuid[])
+        ''', (release_ids[:500], request_ids[:500]))
+
+    for table in ("users", "parking_releases", "parking_requests", "spot_confirmations"):
+        await cur.execute(f"ANALYZE dont_touch.{table}")
+
+    return Seed(user_ids, tg_ids, dates, release_ids, request_ids)
+
+
+def repository_calls(s: Seed):
+    """(имя функции, вызов) для каждой функции репозиториев"""
+    accepted_release, accepted_request = ParkingReleaseStatus.ACCEPTED, ParkingRequestStatus.ACCEPTED
+    return [
+        ("lock_distribution_date", lambda cur: distribution_repo.lock_distribution_date(cur, s.date)),
+        ("get_dates_with_availability", lambda cur: distribution_repo.get_dates_with_availability(cur, s.dates)),
+        ("get_dates_with_availability (all)", lambda cur: distribution_repo.get_dates_with_availability(cur)),
+        ("get_candidates", lambda cur: distribution_repo.get_candidates(cur, s.date)),
+        ("get_candidates (round_robin)", lambda cur: distribution_repo.get_candidates(cur, s.date, True)),
+        ("assign_spots_to_candidates", lambda cur: distribution_repo.assign_spots_to_candidates(
+            cur, s.date, s.release_ids, s.request_ids, ParkingReleaseStatus.WAITING,
+            ParkingRequestStatus.WAITING_CONFIRMATION, True, True, datetime.now())),
+        ("get_user_spot_by_date", lambda cur: releases_repo.get_user_spot_by_date(cur, s.date, s.user_id)),
+        ("get_spot_id_by_user_id_and_request_date",
+         lambda cur: releases_repo.get_spot_id_by_user_id_and_request_date(cur, s.user_id, s.date)),
+        ("insert_spot_on_date", lambda cur: releases_repo.insert_spot_on_date(cur, s.user_id, FIRST_SPOT_ID, s.date)),
+        ("get_user_id_took_by_date_and_spot",
+         lambda cur: releases_repo.get_user_id_took_by_date_and_spot(cur, s.user_id, FIRST_SPOT_ID, s.date)),
+        ("get_tomorrow_accepted_spot", lambda cur: releases_repo.get_tomorrow_accepted_spot(cur, s.date)),
+        ("update_revoke_parking_release",
+         lambda cur: releases_repo.update_revoke_parking_release(cur, s.release_id, ParkingReleaseStatus.CANCELED)),
+        ("find_release_for_confirm_revoke",
+         lambda cur: releases_repo.find_release_for_confirm_revoke(cur, s.user_id, s.release_id)),
+        ("update_parking_releases",
+         lambda cur: releases_repo.update_parking_releases(cur, s.user_id, s.release_id, accepted_release)),
+        ("get_release_owner", lambda cur: releases_repo.get_release_owner(cur, s.release_id)),
+        ("get_free_spots", lambda cur: releases_repo.get_free_spots(cur, s.date)),
+        ("insert_request_on_date", lambda cur: requests_repo.insert_request_on_date(cur, s.user_id, s.date)),
+        ("find_request_for_confirm_revoke",
+         lambda cur: requests_repo.find_request_for_confirm_revoke(cur, s.user_id, s.request_id)),
+        ("update_parking_request_status",
+         lambda cur: requests_repo.update_parking_request_status(cur, s.request_id, accepted_request)),
+        ("get_all_spots", lambda cur: spots_repo.get_all_spots(cur)),
+        ("find_spot_confirmations_by_user",
+         lambda cur: confirmations_repo.find_spot_confirmations_by_user(cur, s.user_id, datetime.now())),
+        ("deactivate_spot_confirmations_by_user",
+         lambda cur: confirmations_repo.deactivate_spot_confirmations_by_user(cur, s.user_id)),
+        ("fill_missing_spot_confirmation_deadlines",
+         lambda cur: confirmations_repo.fill_missing_spot_confirmation_deadlines(cur, 15)),
+        ("expire_overdue_spot_confirmations",
+         lambda cur: confirmations_repo.expire_overdue_spot_confirmations(cur, datetime.now())),
+        ("get_parking_transfers_by_date", lambda cur: statistics_repo.get_parking_transfers_by_date(cur, s.date)),
+        ("get_parking_transfers_by_week",
+         lambda cur: statistics_repo.get_parking_transfers_by_week(cur, s.monday, s.friday)),
+        ("refresh_daily_parking_stats",
+         lambda cur: statistics_repo.refresh_daily_parking_stats(cur, s.monday, s.friday)),
+        ("get_daily_stats_unfinalized_from", lambda cur: statistics_repo.get_daily_stats_unfinalized_from(cur)),
+        ("get_first_unsettled_date", lambda cur: statistics_repo.get_first_unsettled_date(cur, date.today())),
+        ("get_parking_stats_totals", lambda cur: statistics_repo.get_parking_stats_totals(cur, s.monday, s.friday)),
+        ("accumulate_user_parking_stats",
+         lambda cur: statistics_repo.accumulate_user_parking_stats(cur, date.today())),
+        ("get_user_bookings_snapshot",
+         lambda cur: statistics_repo.get_user_bookings_snapshot(cur, s.user_id, s.date)),
+        ("get_user_id_by_tg_id", lambda cur: users_repo.get_user_id_by_tg_id(cur, s.tg_id)),
+        ("decrement_user_rating", lambda cur: users_repo.decrement_user_rating(cur, s.user_id)),
+        ("increment_user_rating", lambda cur: users_repo.increment_user_rating(cur, s.user_id)),
+        ("get_user_names_by_tg_ids",
+         lambda cur: users_repo.get_user_names_by_tg_ids(cur, s.tg_ids, datetime.now() - timedelta(hours=6))),
+        ("update_user_names", lambda cur: users_repo.update_user_names(
+            cur, s.tg_ids, ["Имя"] * len(s.tg_ids), [None] * len(s.tg_ids), [None] * len(s.tg_ids))),
+        ("get_all_user_ids", lambda cur: users_repo.get_all_user_ids(cur)),
+        ("upsert_user_by_tg_id", lambda cur: users_repo.upsert_user_by_tg_id(cur, s.tg_id)),
+    ]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000, help="количество синтетических пользователей")
+    parser.add_argument("--days", type=int, default=60, help="количество рабочих дней с освобождениями и запросами")
+    parser.add_argument("--natural-costs", action="store_true",
+                        help="не запрещать Seq Scan, а показать планы, выбранные по стоимости")
+    parser.add_argument("--verbose", action="store_true", help="печатать корневой узел плана каждого запроса")
+    args = parser.parse_args()
+
+    if args.users <= LAST_SPOT_ID - FIRST_SPOT_ID + 1:
+        parser.error(f"--users должно быть больше {LAST_SPOT_ID - FIRST_SPOT_ID + 1}: часть пользователей - владельцы мест")
+
+    await init_db_pool()
+    pool = get_db_pool()
+    failures = []
+    try:
+        async with pool.connection() as conn:
+            with conn.cursor() as cur:
+                try:
+                    seeded = await seed(cur, args.users, args.days)
+                    if not args.natural_costs:
+                        await cur.execute("SET LOCAL enable_seqscan = off")
+
+                    for name, call in repository_calls(seeded):
+                        explain_cursor = ExplainCursor(cur)
+                        await call(explain_cursor)
+                        allowed = ALLOWED_SEQ_SCANS.get(name.split(" ")[0], set())
+                        for statement, plan in enumerate(explain_cursor.plans, start=1):
+                            scanned = [table for table in seq_scans(plan) if table not in allowed]
+                            status = "FAIL" if scanned else "ok"
+                            print(f"{status:4} {name} #{statement}: "
+                                  f"{plan['Node Type']}, cost {plan['Total Cost']:.1f}"
+                                  + (f", Seq Scan on {', '.join(scanned)}" if scanned else ""))
+                            if args.verbose:
+                                print(f"     {plan}")
+                            if scanned:
+                                failures.append(f"{name} #{statement}: Seq Scan on {', '.join(scanned)}")
+                finally:
+                    # Засеянные данные и ANALYZE по ним в базе не остаются
+                    await conn.rollback()
+    finally:
+        await close_db_pool()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))